@@ -1,29 +1,95 @@
 """
 Capability checker to determine if questions are answerable by Mulan Agent.
 """
-from typing import Dict
+import asyncio
+import string
+from typing import Dict, List, Optional, Set
 from uuid import UUID
 from backend.agent.mulan_client import mulan_client
 from backend.database.models import Question, AgentResponse
 from backend.database.supabase_client import db_client
 from backend.config.settings import settings
+from backend.config.markets import get_all_markets, get_market_config
 from backend.utils.logger import log
 
 
+# Common words ignored when scoring lexical overlap with a market's scope
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from",
+    "how", "i", "in", "is", "it", "me", "my", "of", "on", "or", "our", "so",
+    "that", "the", "their", "this", "to", "we", "what", "with", "you", "your"
+})
+
+_PUNCTUATION_TABLE = str.maketrans(string.punctuation, " " * len(string.punctuation))
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Split text into lowercase content words for overlap scoring.
+    
+    Punctuation and stopwords are dropped and a trailing plural 's' is
+    stripped so "trailers" matches "trailer".
+    
+    Args:
+        text: Text to tokenize
+        
+    Returns:
+        Set of tokens
+    """
+    tokens = set()
+    for word in text.translate(_PUNCTUATION_TABLE).lower().split():
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s"):
+            word = word[:-1]
+        tokens.add(word)
+    return tokens
+
+
 class CapabilityChecker:
     """Check if questions can be answered by Mulan Agent."""
     
     def __init__(self):
         """Initialize capability checker."""
         self.min_confidence = settings.min_confidence_score
+        self.prefilter_floor = settings.prefilter_floor
+        
+        # Scope vocabulary per market, used to skip clearly unrelated questions
+        self._market_vocab: Dict[str, Set[str]] = {}
+        for market_name in get_all_markets():
+            market_config = get_market_config(market_name)
+            if market_config:
+                self._market_vocab[market_name] = tokenize(
+                    f"{market_config.target_pain} {market_config.mulan_context}"
+                )
+        
         log.info(f"Capability checker initialized with min confidence: {self.min_confidence}")
     
-    async def check_question(self, question: Question) -> AgentResponse:
+    def prefilter_score(self, question: Question) -> Optional[float]:
+        """
+        Score lexical overlap between a question and its market's scope vocabulary.
+        
+        Args:
+            question: Question to score
+            
+        Returns:
+            Fraction of the market vocabulary present in the question,
+            or None if the market has no vocabulary
+        """
+        vocab = self._market_vocab.get(question.market)
+        if not vocab:
+            return None
+        
+        question_tokens = tokenize(f"{question.title} {question.content}")
+        return len(question_tokens & vocab) / len(vocab)
+    
+    async def check_question(self, question: Question, force_llm: bool = False) -> AgentResponse:
         """
         Check if a question can be answered by Mulan Agent.
         
         Args:
             question: Question to check
+            force_llm: Always ask Mulan Agent, skipping the keyword prefilter
             
         Returns:
             AgentResponse with analysis results
@@ -31,11 +97,22 @@ class CapabilityChecker:
         log.info(f"Checking capability for question: {question.id}")
         
         try:
-            # Send question to Mulan Agent
-            analysis = await mulan_client.analyze_question(
-                question_text=question.content,
-                question_title=question.title
-            )
+            overlap = None if force_llm else self.prefilter_score(question)
+            
+            if overlap is not None and overlap < self.prefilter_floor:
+                # Clearly out of scope, no need to spend a Mulan call
+                log.info(f"Question {question.id} skipped by prefilter (overlap={overlap:.2f})")
+                analysis = {
+                    "is_in_scope": False,
+                    "confidence_score": overlap,
+                    "reasoning": "No overlap with market scope"
+                }
+            else:
+                # Send question to Mulan Agent
+                analysis = await mulan_client.analyze_question(
+                    question_text=question.content,
+                    question_title=question.title
+                )
             
             is_in_scope = analysis.get("is_in_scope", False)
             confidence_score = analysis.get("confidence_score", 0.0)
@@ -85,26 +162,68 @@ class CapabilityChecker:
             
             return error_response
     
-    async def batch_check_questions(self, question_ids: list[UUID]) -> Dict[UUID, AgentResponse]:
+    async def check_questions(self, questions: List[Question], force_llm: bool = False) -> Dict[UUID, AgentResponse]:
+        """
+        Check several already-loaded questions concurrently.
+        
+        Args:
+            questions: Questions to check
+            force_llm: Always ask Mulan Agent, skipping the keyword prefilter
+            
+        Returns:
+            Dictionary mapping question IDs to AgentResponse objects
+        """
+        semaphore = asyncio.Semaphore(settings.mulan_concurrency)
+        
+        async def check_one(question: Question) -> AgentResponse:
+            async with semaphore:
+                return await self.check_question(question, force_llm=force_llm)
+        
+        # check_question records failures as error responses instead of raising
+        responses = await asyncio.gather(*(check_one(question) for question in questions))
+        return {question.id: response for question, response in zip(questions, responses)}
+    
+    async def batch_check_questions(
+        self,
+        question_ids: list[UUID],
+        force_llm: bool = True
+    ) -> Dict[UUID, AgentResponse]:
         """
         Check multiple questions in batch.
         
         Args:
             question_ids: List of question IDs to check
+            force_llm: Always ask Mulan Agent, skipping the keyword prefilter
             
         Returns:
             Dictionary mapping question IDs to AgentResponse objects
         """
-        results = {}
+        semaphore = asyncio.Semaphore(settings.mulan_concurrency)
+        
+        async def check_one(question_id: UUID):
+            async with semaphore:
+                question = await db_client.get_question(question_id)
+                
+                if not question:
+                    log.warning(f"Question {question_id} not found")
+                    return question_id, None
+                
+                return question_id, await self.check_question(question, force_llm=force_llm)
         
-        for question_id in question_ids:
-            question = await db_client.get_question(question_id)
+        pairs = await asyncio.gather(
+            *(check_one(question_id) for question_id in question_ids),
+            return_exceptions=True
+        )
+        
+        results = {}
+        for pair in pairs:
+            if isinstance(pair, Exception):
+                log.error(f"Error in batch capability check: {pair}")
+                continue
             
-            if question:
-                response = await self.check_question(question)
+            question_id, response = pair
+            if response:
                 results[question_id] = response
-            else:
-                log.warning(f"Question {question_id} not found")
         
         return results
     
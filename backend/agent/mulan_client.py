@@ -1,11 +1,16 @@
 """
 Client for communicating with Mulan Agent API with multi-market support.
 """
+import asyncio
 from typing import Dict, Optional
 import httpx
+import orjson
 from backend.config.settings import settings
-from backend.config.markets import get_market_config, get_workflow_link_for_context
+from backend.config.markets import get_market_config
+from backend.agent.semantic_cache import SemanticCache
 from backend.utils.logger import log
+from backend.utils.loop_clients import close_on_loop
+from backend.utils.rate_limiter import AsyncTokenBucket
 
 
 class MulanClient:
@@ -16,9 +21,99 @@ class MulanClient:
         self.base_url = settings.mulan_agent_url.rstrip('/')
         self.api_key = settings.mulan_agent_api_key
         self.timeout = 30.0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.cache = SemanticCache()
+        self._bucket = AsyncTokenBucket(
+            rate=settings.mulan_requests_per_second,
+            capacity=settings.mulan_burst
+        )
         
         log.info(f"Mulan Agent client initialized: {self.base_url}")
     
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client, creating it on first use.
+        
+        The client keeps connections to the Mulan Agent alive between calls.
+        It is rebuilt if the event loop changed (e.g. successive asyncio.run calls),
+        since pooled connections cannot be shared across loops; the replaced
+        client is closed on its own loop.
+        
+        Returns:
+            Shared httpx.AsyncClient instance
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                close_on_loop(self._client_loop, self._client.aclose)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0
+                ),
+                http2=True  # Multiplex concurrent calls over one connection
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client and release pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+    
+    @staticmethod
+    def _parse_retry_after(response: httpx.Response, default: float = 1.0) -> float:
+        """Read the Retry-After header (in seconds) from a 429 response."""
+        try:
+            return max(0.0, float(response.headers.get("Retry-After", default)))
+        except ValueError:
+            return default
+    
+    async def _request(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        """
+        Send a paced request to the Mulan Agent and decode the JSON reply.
+        
+        Waits on the local token bucket before sending. On HTTP 429 the bucket
+        is drained for the Retry-After period and the request is retried once.
+        
+        Args:
+            method: HTTP method
+            path: Path relative to the Mulan Agent base URL
+            payload: Optional JSON body
+            
+        Returns:
+            Decoded response body
+            
+        Raises:
+            httpx.HTTPStatusError: If the final response is an error status
+        """
+        client = await self._get_client()
+        content = orjson.dumps(payload) if payload is not None else None
+        
+        await self._bucket.acquire()
+        response = await client.request(method, path, content=content)
+        
+        if response.status_code == 429:
+            retry_after = self._parse_retry_after(response)
+            log.warning(f"Mulan Agent rate limited {path}, retrying in {retry_after:.1f}s")
+            self._bucket.penalize(retry_after)
+            
+            await self._bucket.acquire()
+            response = await client.request(method, path, content=content)
+        
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
     async def analyze_question(
         self, 
         question_text: str, 
@@ -55,33 +150,31 @@ class MulanClient:
                         "mulan_context": market_config.mulan_context
                     }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                payload = {
-                    "question": question_text,
-                    "title": question_title,
-                    "task": "analyze_capability",
-                    "market_context": market_context  # Send market context to AI
-                }
-                
-                log.info(f"Sending question to Mulan Agent (market: {market}): {question_title[:50]}...")
-                
-                response = await client.post(
-                    f"{self.base_url}/api/analyze",
-                    headers=headers,
-                    json=payload
-                )
-                
-                response.raise_for_status()
-                result = response.json()
-                
-                log.info(f"Received response from Mulan Agent: in_scope={result.get('is_in_scope')}, confidence={result.get('confidence_score')}")
-                
-                return result
+            cache_text = f"{question_title}\n{question_text}"
+            cached = await self.cache.get("analyze_capability", market, cache_text)
+            if cached is not None:
+                log.info(f"Using cached Mulan analysis (market: {market}): {question_title[:50]}...")
+                return cached
+            
+            payload = {
+                "question": question_text,
+                "title": question_title,
+                "task": "analyze_capability",
+                "market_context": market_context  # Send market context to AI
+            }
+            
+            log.info(f"Sending question to Mulan Agent (market: {market}): {question_title[:50]}...")
+            
+            result = await self._request("POST", "/api/analyze", payload)
+            
+            log.info(
+                f"Received response from Mulan Agent: in_scope={result.get('is_in_scope')}, "
+                f"confidence={result.get('confidence_score')}"
+            )
+            
+            await self.cache.put("analyze_capability", market, cache_text, result)
+            
+            return result
                 
         except httpx.HTTPStatusError as e:
             log.error(f"HTTP error from Mulan Agent: {e.response.status_code} - {e.response.text}")
@@ -138,34 +231,29 @@ class MulanClient:
                         "mulan_context": market_config.mulan_context
                     }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                payload = {
-                    "question": question_text,
-                    "workflow_id": workflow_id,
-                    "task": "generate_response",
-                    "market_context": market_context,
-                    "tone": tone  # Market-specific tone
-                }
-                
-                log.info(f"Generating response from Mulan Agent (market: {market}, tone: {tone})...")
-                
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    headers=headers,
-                    json=payload
-                )
-                
-                response.raise_for_status()
-                result = response.json()
-                
-                log.info("Response generated successfully")
-                
-                return result
+            cache_text = f"{workflow_id or ''}\n{question_text}"
+            cached = await self.cache.get("generate_response", market, cache_text)
+            if cached is not None:
+                log.info(f"Using cached Mulan response (market: {market})")
+                return cached
+            
+            payload = {
+                "question": question_text,
+                "workflow_id": workflow_id,
+                "task": "generate_response",
+                "market_context": market_context,
+                "tone": tone  # Market-specific tone
+            }
+            
+            log.info(f"Generating response from Mulan Agent (market: {market}, tone: {tone})...")
+            
+            result = await self._request("POST", "/api/generate", payload)
+            
+            log.info("Response generated successfully")
+            
+            await self.cache.put("generate_response", market, cache_text, result)
+            
+            return result
                 
         except Exception as e:
             log.error(f"Error generating response: {e}")
@@ -187,20 +275,9 @@ class MulanClient:
             Workflow URL or None
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}"
-                }
-                
-                response = await client.get(
-                    f"{self.base_url}/api/workflows/{workflow_id}",
-                    headers=headers
-                )
-                
-                response.raise_for_status()
-                result = response.json()
-                
-                return result.get("public_url")
+            result = await self._request("GET", f"/api/workflows/{workflow_id}")
+            
+            return result.get("public_url")
                 
         except Exception as e:
             log.error(f"Error getting workflow link: {e}")
@@ -214,10 +291,15 @@ class MulanClient:
             True if API is healthy, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/health")
-                return response.status_code == 200
-                
+            client = await self._get_client()
+            response = await client.head("/health", timeout=2.0)
+            
+            # Some servers only route GET for /health
+            if response.status_code == 405:
+                response = await client.get("/health", timeout=2.0)
+            
+            return response.status_code == 200
+            
         except Exception as e:
             log.error(f"Mulan Agent health check failed: {e}")
             return False
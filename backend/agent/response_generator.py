@@ -1,42 +1,67 @@
 """
 Response generator for creating and posting market-aware responses to questions.
 """
+import asyncio
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from backend.agent.mulan_client import mulan_client
-from backend.database.models import Question, AgentResponse, QuestionStatus
+from backend.database.models import Question, AgentResponse, QuestionStatus, utc_now
 from backend.database.supabase_client import db_client
 from backend.crawler.crawler_manager import crawler_manager
 from backend.config.settings import settings
-from backend.config.markets import get_market_config, get_workflow_link_for_context
+from backend.config.markets import (
+    DEFAULT_DISCLOSURE, MarketConfig, get_all_markets, get_market_config, get_workflow_link_for_context
+)
 from backend.utils.logger import log
 
 
 class ResponseGenerator:
     """Generate and post market-aware responses to questions."""
     
+    # Pending questions fetched per database page
+    PENDING_PAGE_SIZE = 50
+    
     def __init__(self):
         """Initialize response generator."""
         self.auto_post_enabled = settings.auto_post_enabled
-        log.info(f"Response generator initialized (auto_post: {self.auto_post_enabled})")
+        
+        # Precompile (with_link, without_link) response templates and
+        # confidence thresholds per market
+        self._default_templates = self._build_templates(DEFAULT_DISCLOSURE)
+        self._templates = {}
+        self._min_confidence_by_market = {}
+        for market_name in get_all_markets():
+            market_config = get_market_config(market_name)
+            if market_config:
+                self._templates[market_name] = self._build_templates(market_config.disclosure)
+                self._min_confidence_by_market[market_name] = market_config.min_confidence_score
+        
+        log.info("Response generator initialized (auto_post: {})", self.auto_post_enabled)
     
-    async def generate_response(self, question: Question, agent_response: AgentResponse) -> Optional[str]:
+    async def generate_response(
+        self,
+        question: Question,
+        agent_response: AgentResponse,
+        market_config: Optional[MarketConfig] = None
+    ) -> Optional[str]:
         """
         Generate a market-aware response for a question.
         
         Args:
             question: Question to answer
             agent_response: Agent response with analysis
+            market_config: Already-resolved market configuration (looked up if omitted)
             
         Returns:
             Generated response text or None
         """
         try:
-            log.info(f"Generating response for question: {question.id} (market: {question.market})")
+            log.info("Generating response for question: {} (market: {})", question.id, question.market)
             
             # Get market configuration
-            market_config = get_market_config(question.market)
+            if market_config is None:
+                market_config = get_market_config(question.market)
             
             # Select appropriate workflow link based on question content
             workflow_link = agent_response.workflow_link
@@ -68,14 +93,32 @@ class ResponseGenerator:
             # Update agent response with generated text
             agent_response.response_text = formatted_response
             
-            log.info(f"Response generated successfully for question {question.id}")
+            log.info("Response generated successfully for question {}", question.id)
             
             return formatted_response
             
         except Exception as e:
-            log.error(f"Error generating response: {e}")
+            log.error("Error generating response: {}", e)
             return None
     
+    @staticmethod
+    def _build_templates(disclosure: str) -> tuple:
+        """
+        Build response templates for a disclosure text.
+        
+        Args:
+            disclosure: Disclosure appended to every response
+            
+        Returns:
+            Tuple of (template with workflow link, template without link)
+        """
+        # Escape braces so the disclosure is treated literally by str.format
+        suffix = "\n\n" + disclosure.replace("{", "{{").replace("}", "}}")
+        return (
+            "{response}\n\nYou might find this helpful: {link}" + suffix,
+            "{response}" + suffix
+        )
+    
     def _format_response(
         self, 
         response_text: str, 
@@ -93,31 +136,27 @@ class ResponseGenerator:
         Returns:
             Formatted response string
         """
-        # Start with the AI-generated response
-        formatted = response_text
+        with_link, without_link = self._templates.get(market, self._default_templates)
         
-        # Add workflow link if available
         if workflow_link:
-            formatted += f"\n\nYou might find this helpful: {workflow_link}"
-        
-        # Add disclosure (important for transparency and platform compliance)
-        formatted += "\n\n*Disclosure: I work with Mulan AI, which offers tools for creating videos easily.*"
-        
-        return formatted
+            return with_link.format(response=response_text, link=workflow_link)
+        return without_link.format(response=response_text)
     
-    async def post_response(self, question: Question, response_text: str) -> bool:
+    async def post_response(self, question: Question, response_text: str, update_status: bool = True) -> bool:
         """
         Post a response to a platform.
         
         Args:
             question: Question to respond to
             response_text: Response text to post
+            update_status: Mark the question answered on success (callers that
+                finalize the question themselves pass False)
             
         Returns:
             True if posted successfully, False otherwise
         """
         try:
-            log.info(f"Posting response to {question.platform} question: {question.id}")
+            log.info("Posting response to {} question: {}", question.platform, question.id)
             
             # Get appropriate crawler for the platform and market
             crawler = crawler_manager.get_crawler(
@@ -126,103 +165,257 @@ class ResponseGenerator:
             )
             
             if not crawler:
-                log.error(f"No crawler found for platform: {question.platform}")
+                log.error("No crawler found for platform: {}", question.platform)
                 return False
             
             # Post response
             success = await crawler.post_response(question.url, response_text)
             
             if success:
-                log.info(f"Response posted successfully to question {question.id}")
+                log.info("Response posted successfully to question {}", question.id)
                 
                 # Update question status
-                await db_client.update_question_status(question.id, QuestionStatus.ANSWERED)
+                if update_status:
+                    await db_client.update_question_status(question.id, QuestionStatus.ANSWERED)
             else:
-                log.error(f"Failed to post response to question {question.id}")
+                log.error("Failed to post response to question {}", question.id)
             
             return success
             
         except Exception as e:
-            log.error(f"Error posting response: {e}")
+            log.error("Error posting response: {}", e)
             return False
     
-    async def process_question(self, question_id: UUID) -> bool:
+    async def post_responses(self, items: List[Tuple[Question, str]]) -> List[bool]:
         """
-        Complete workflow: generate and optionally post response.
+        Post several responses, one crawler session per platform.
+        
+        Args:
+            items: List of (question, response_text) tuples
+            
+        Returns:
+            Success flag for each item, in order
+        """
+        results = [False] * len(items)
+        by_platform: Dict[str, List[int]] = {}
+        for index, (question, _) in enumerate(items):
+            by_platform.setdefault(question.platform.value, []).append(index)
+        
+        for platform, indexes in by_platform.items():
+            try:
+                posted = await crawler_manager.post_responses(
+                    platform,
+                    [(items[i][0].url, items[i][1]) for i in indexes]
+                )
+            except Exception as e:
+                log.error("Error posting responses to {}: {}", platform, e)
+                continue
+            
+            for i, success in zip(indexes, posted):
+                results[i] = success
+        
+        return results
+    
+    async def _prepare_question(
+        self,
+        question_id: UUID,
+        question: Optional[Question] = None,
+        agent_response: Optional[AgentResponse] = None
+    ) -> Optional[Tuple[Question, AgentResponse, str]]:
+        """
+        Check a question against scope and confidence rules and generate its response.
+        
+        A response already stored on the agent response (from an earlier
+        attempt) is reused instead of calling Mulan again. Questions that are
+        skipped or fail are given their final status here.
         
         Args:
             question_id: Question ID to process
+            question: Already-loaded question (fetched if omitted)
+            agent_response: Already-loaded agent response (fetched if omitted)
             
         Returns:
-            True if processed successfully, False otherwise
+            Tuple of (question, agent_response, response_text), or None if not answerable
         """
         try:
-            # Get question and agent response
-            question = await db_client.get_question(question_id)
+            # Get question and agent response unless the caller already has them
+            if question is None:
+                question, fetched_response = await db_client.get_question_with_response(question_id)
+                if agent_response is None:
+                    agent_response = fetched_response
             if not question:
-                log.error(f"Question {question_id} not found")
-                return False
+                log.error("Question {} not found", question_id)
+                return None
             
-            agent_response = await db_client.get_agent_response(question_id)
+            if agent_response is None:
+                agent_response = await db_client.get_agent_response(question_id)
             if not agent_response:
-                log.error(f"Agent response not found for question {question_id}")
-                return False
+                log.error("Agent response not found for question {}", question_id)
+                return None
             
             # Check if question is answerable
             if not agent_response.is_in_scope:
-                log.info(f"Question {question_id} is not in scope, marking as ignored")
+                log.info("Question {} is not in scope, marking as ignored", question_id)
                 await db_client.update_question_status(question_id, QuestionStatus.IGNORED)
-                return False
+                return None
             
             # Check confidence threshold (market-specific)
-            market_config = get_market_config(question.market)
-            min_confidence = market_config.min_confidence_score if market_config else settings.min_confidence_score
+            min_confidence = self._min_confidence_by_market.get(question.market, settings.min_confidence_score)
             
             if agent_response.confidence_score < min_confidence:
-                log.info(f"Question {question_id} confidence {agent_response.confidence_score} below threshold {min_confidence}, marking as ignored")
+                log.info(
+                    "Question {} confidence {} below threshold {}, marking as ignored",
+                    question_id, agent_response.confidence_score, min_confidence
+                )
                 await db_client.update_question_status(question_id, QuestionStatus.IGNORED)
-                return False
+                return None
             
-            # Update status to processing
-            await db_client.update_question_status(question_id, QuestionStatus.PROCESSING)
+            # Reuse a response generated on an earlier attempt (e.g. a failed post)
+            if agent_response.response_text:
+                log.info("Reusing stored response for question {}", question_id)
+                return question, agent_response, agent_response.response_text
             
-            # Generate response
-            response_text = await self.generate_response(question, agent_response)
+            # Generate response (the question stays pending until it is finalized)
+            response_text = await self.generate_response(
+                question,
+                agent_response,
+                market_config=get_market_config(question.market)
+            )
             
             if not response_text:
-                log.error(f"Failed to generate response for question {question_id}")
+                log.error("Failed to generate response for question {}", question_id)
                 await db_client.update_question_status(question_id, QuestionStatus.ERROR)
-                return False
+                return None
             
-            # Update agent response in database
             agent_response.response_text = response_text
+            return question, agent_response, response_text
+            
+        except Exception as e:
+            log.error("Error processing question {}: {}", question_id, e)
+            await db_client.update_question_status(question_id, QuestionStatus.ERROR)
+            return None
+    
+    async def _finalize_question(
+        self,
+        question: Question,
+        agent_response: AgentResponse,
+        response_text: str,
+        posted: Optional[bool],
+        now: Optional[datetime] = None
+    ) -> bool:
+        """
+        Persist the outcome (status, response text, posted flag) in one round trip.
+        
+        Args:
+            question: Processed question
+            agent_response: Agent response the text belongs to
+            response_text: Generated response text
+            posted: Whether the response was posted (None if posting wasn't attempted)
+            now: Timestamp to record as posted_at (shared across a batch; defaults to now)
+        
+        Returns:
+            True if the outcome was recorded, False otherwise
+        """
+        # Mark as answered once the response is ready (and posted, if auto-post is enabled);
+        # a failed post stays pending for a retry until its attempts run out
+        if posted is False:
+            status = QuestionStatus.ERROR if question.attempts >= settings.max_post_attempts else None
+        else:
+            status = QuestionStatus.ANSWERED
+        
+        finalized = await db_client.finalize_processing(
+            question.id,
+            status=status,
+            response_id=agent_response.id,
+            response_text=response_text,
+            posted=posted,
+            posted_at=(now or utc_now()) if posted else None
+        )
+        if finalized or not posted:
+            return finalized
+        
+        # The response is already on the platform: make sure the question
+        # leaves the pending state so it is never posted twice
+        log.error("Failed to finalize posted question {}, marking it answered", question.id)
+        return await db_client.update_question_status(question.id, QuestionStatus.ANSWERED)
+    
+    async def process_question(
+        self,
+        question_id: UUID,
+        question: Optional[Question] = None,
+        agent_response: Optional[AgentResponse] = None,
+        now: Optional[datetime] = None
+    ) -> bool:
+        """
+        Complete workflow: generate and optionally post response.
+        
+        Args:
+            question_id: Question ID to process
+            question: Already-loaded question (fetched if omitted)
+            agent_response: Already-loaded agent response (fetched if omitted)
+            now: Timestamp to record for the post (defaults to the current time)
             
-            # Post response if auto-post is enabled
-            posted = False
+        Returns:
+            True if processed successfully, False otherwise
+        """
+        prepared = await self._prepare_question(question_id, question, agent_response)
+        if prepared is None:
+            return False
+        
+        question, agent_response, response_text = prepared
+        try:
+            posted = None
             if self.auto_post_enabled:
-                posted = await self.post_response(question, response_text)
-                
-                # Update agent response
-                await db_client.update_response_posted(
-                    agent_response.id,
-                    posted=posted,
-                    posted_at=datetime.utcnow() if posted else None
-                )
+                posted = await self.post_response(question, response_text, update_status=False)
             else:
-                log.info(f"Auto-post disabled, response generated but not posted for question {question_id}")
-                # Still mark as answered since response is ready
-                await db_client.update_question_status(question_id, QuestionStatus.ANSWERED)
+                log.info("Auto-post disabled, response generated but not posted for question {}", question_id)
             
-            return True
+            return await self._finalize_question(question, agent_response, response_text, posted, now=now)
             
         except Exception as e:
-            log.error(f"Error processing question {question_id}: {e}")
+            log.error("Error processing question {}: {}", question_id, e)
             await db_client.update_question_status(question_id, QuestionStatus.ERROR)
             return False
     
+    async def _post_and_finalize(self, ready: List[Tuple[Question, AgentResponse, str]]) -> int:
+        """
+        Post generated responses in per-platform batches and finalize each question.
+        
+        Args:
+            ready: List of (question, agent_response, response_text) tuples
+            
+        Returns:
+            Number of questions finalized successfully
+        """
+        posted_flags = await self.post_responses([(question, text) for question, _, text in ready])
+        # One timestamp for the whole batch
+        posted_now = utc_now()
+        
+        finalized_count = 0
+        for (question, agent_response, response_text), posted in zip(ready, posted_flags):
+            if posted:
+                log.info("Response posted successfully to question {}", question.id)
+            else:
+                log.error("Failed to post response to question {}", question.id)
+            
+            try:
+                if await self._finalize_question(question, agent_response, response_text, posted, now=posted_now):
+                    finalized_count += 1
+            except Exception as e:
+                log.error("Error processing question {}: {}", question.id, e)
+                await db_client.update_question_status(question.id, QuestionStatus.ERROR)
+        
+        return finalized_count
+    
     async def process_pending_questions(self, limit: int = 10, market: Optional[str] = None) -> int:
         """
-        Process pending questions that have agent responses.
+        Process pending questions that have in-scope agent responses.
+        
+        A producer claims pending questions page by page and feeds a bounded
+        queue while worker tasks process them, so database fetches overlap with
+        Mulan Agent calls. Claimed questions are skipped by overlapping runs
+        until they are finalized. With auto-post enabled, responses are posted after
+        generation in one batch per platform so each platform login is reused.
         
         Args:
             limit: Maximum number of questions to process
@@ -232,35 +425,100 @@ class ResponseGenerator:
             Number of questions processed successfully
         """
         try:
-            # Get pending questions (optionally filtered by market)
-            pending_questions = await db_client.get_questions_by_status(
-                QuestionStatus.PENDING,
-                limit=limit,
-                market=market
+            log.info(
+                "Processing up to {} pending questions{}",
+                limit, f" for market '{market}'" if market else ""
             )
             
-            log.info(f"Processing {len(pending_questions)} pending questions" + 
-                    (f" for market '{market}'" if market else ""))
-            
+            concurrency = max(1, settings.mulan_concurrency)
+            page_size = min(limit, self.PENDING_PAGE_SIZE)
+            queue: asyncio.Queue = asyncio.Queue(maxsize=2 * concurrency)
+            fetched_count = 0
             processed_count = 0
+            ready = []
             
-            for question in pending_questions:
-                # Check if agent response exists
-                agent_response = await db_client.get_agent_response(question.id)
+            async def produce():
+                nonlocal fetched_count
                 
-                if agent_response and agent_response.is_in_scope:
-                    success = await self.process_question(question.id)
-                    if success:
-                        processed_count += 1
-            
-            log.info(f"Processed {processed_count} questions successfully")
+                try:
+                    while fetched_count < limit:
+                        # Claimed rows drop out of the next claim, so no cursor is needed
+                        page = await db_client.claim_pending_questions(
+                            limit=min(page_size, limit - fetched_count),
+                            market=market
+                        )
+                        if not page:
+                            break
+                        
+                        fetched_count += len(page)
+                        
+                        for pair in page:
+                            await queue.put(pair)
+                        
+                        if len(page) < page_size:
+                            break
+                finally:
+                    # One stop marker per worker
+                    for _ in range(concurrency):
+                        await queue.put(None)
+            
+            async def consume():
+                nonlocal processed_count
+                
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    
+                    question, agent_response = item
+                    try:
+                        prepared = await self._prepare_question(
+                            question.id,
+                            question=question,
+                            agent_response=agent_response
+                        )
+                        if prepared is None:
+                            continue
+                        
+                        if self.auto_post_enabled:
+                            # Posted in per-platform batches once generation is done
+                            ready.append(prepared)
+                            continue
+                        
+                        if not await self._finalize_question(*prepared, posted=None):
+                            continue
+                    except Exception as e:
+                        # Keep the worker alive so one bad item doesn't cancel the batch
+                        log.error("Error processing question {}: {}", question.id, e)
+                        await db_client.update_question_status(question.id, QuestionStatus.ERROR)
+                        continue
+                    
+                    processed_count += 1
+            
+            async with asyncio.TaskGroup() as group:
+                group.create_task(produce())
+                for _ in range(concurrency):
+                    group.create_task(consume())
+            
+            if ready:
+                processed_count += await self._post_and_finalize(ready)
+            
+            log.info("Processed {} of {} pending questions successfully", processed_count, fetched_count)
             
             return processed_count
             
         except Exception as e:
-            log.error(f"Error processing pending questions: {e}")
+            log.error("Error processing pending questions: {}", e)
             return 0
 
 
-# Global instance
-response_generator = ResponseGenerator()
+# Global instance, created on first use so importing this module stays cheap
+_response_generator: Optional[ResponseGenerator] = None
+
+
+def get_response_generator() -> ResponseGenerator:
+    """Get the shared response generator, creating it on first call."""
+    global _response_generator
+    if _response_generator is None:
+        _response_generator = ResponseGenerator()
+    return _response_generator
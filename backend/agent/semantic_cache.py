@@ -0,0 +1,233 @@
+"""
+Cache for Mulan Agent results keyed by task, market, and question text.
+"""
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+import orjson
+import redis.asyncio as aioredis
+from backend.config.settings import settings
+from backend.utils.logger import log
+from backend.utils.loop_clients import LoopBoundRedis
+
+
+# Tasks whose results are side-effect free and safe to reuse
+CACHEABLE_TASKS = frozenset({"analyze_capability", "generate_response"})
+# Tasks that may reuse a near-duplicate question's result; generated responses
+# get posted publicly, so they are only reused for the exact same question
+SIMILAR_MATCH_TASKS = frozenset({"analyze_capability"})
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class SemanticCache:
+    """
+    Cache Mulan Agent responses with an exact-match fast path and a near-duplicate fallback.
+    
+    Exact lookups use a SHA256 key of the task, market, and normalized question,
+    checked in process first and then in Redis so results are shared between
+    API and worker processes. On a miss, tasks in SIMILAR_MATCH_TASKS compare
+    cached questions for the same task and market by token-set overlap so
+    rephrasings reuse one analysis.
+    """
+    
+    REDIS_KEY_PREFIX = "mulan_cache:"
+    # Seconds to stop trying Redis after an error
+    REDIS_RETRY_AFTER = 60.0
+    
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        similarity_threshold: Optional[float] = None,
+        redis_ttl_seconds: Optional[int] = None
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl_seconds: Seconds before an in-process entry expires
+            max_entries: Maximum in-process entries kept (least recently used are evicted)
+            similarity_threshold: Minimum token overlap (0-1) for a near-duplicate hit
+            redis_ttl_seconds: Seconds before a Redis entry expires (0 disables Redis)
+        """
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.mulan_cache_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.mulan_cache_max_entries
+        self.similarity_threshold = (
+            similarity_threshold if similarity_threshold is not None
+            else settings.mulan_cache_similarity_threshold
+        )
+        self.redis_ttl_seconds = (
+            redis_ttl_seconds if redis_ttl_seconds is not None
+            else settings.mulan_cache_redis_ttl_seconds
+        )
+        self._redis = LoopBoundRedis(socket_connect_timeout=0.5, socket_timeout=0.5)
+        self._redis_disabled_until = 0.0
+        # key -> (task, market, tokens, result, stored_at)
+        self._entries: "OrderedDict[str, Tuple[str, str, FrozenSet[str], Dict, float]]" = OrderedDict()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Lowercase and collapse whitespace."""
+        return ' '.join(text.lower().split())
+    
+    @staticmethod
+    def _make_key(task: str, market: str, normalized: str) -> str:
+        """Build the exact-match key."""
+        return hashlib.sha256(f"{task}|{market}|{normalized}".encode()).hexdigest()
+    
+    @staticmethod
+    def _tokenize(normalized: str) -> FrozenSet[str]:
+        """Split normalized text into a set of word tokens, ignoring punctuation."""
+        return frozenset(_TOKEN_PATTERN.findall(normalized))
+    
+    def _get_redis(self) -> Optional[aioredis.Redis]:
+        """Get the Redis client for the running loop, or None if Redis is disabled or backing off."""
+        if self.redis_ttl_seconds <= 0 or time.monotonic() < self._redis_disabled_until:
+            return None
+        return self._redis.get()
+    
+    def _redis_failed(self, error: Exception):
+        """Stop using Redis for a while after an error."""
+        log.warning(f"Mulan cache Redis unavailable, using in-process cache only: {error}")
+        self._redis_disabled_until = time.monotonic() + self.REDIS_RETRY_AFTER
+    
+    def _store_local(self, key: str, task: str, market: str, normalized: str, result: Dict):
+        """Store an entry in the in-process cache."""
+        self._entries[key] = (task, market, self._tokenize(normalized), result, time.monotonic())
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def _find_similar(self, task: str, market: str, normalized: str, now: float) -> Optional[Dict]:
+        """Return the closest cached result for the same task and market above the threshold."""
+        tokens = self._tokenize(normalized)
+        if not tokens or self.similarity_threshold >= 1.0:
+            return None
+        
+        best_key = None
+        best_score = 0.0
+        token_count = len(tokens)
+        for cached_key, (c_task, c_market, c_tokens, _, stored_at) in self._entries.items():
+            if c_task != task or c_market != market or now - stored_at > self.ttl_seconds:
+                continue
+            intersection = len(tokens & c_tokens)
+            if not intersection:
+                continue
+            score = intersection / (token_count + len(c_tokens) - intersection)
+            if score > best_score:
+                best_key, best_score = cached_key, score
+        
+        if best_key is None or best_score < self.similarity_threshold:
+            return None
+        
+        self._entries.move_to_end(best_key)
+        log.debug(f"Mulan cache near-duplicate hit for task '{task}' (similarity {best_score:.2f})")
+        return self._entries[best_key][3]
+    
+    async def get(self, task: str, market: Optional[str], question: str) -> Optional[Dict]:
+        """
+        Look up a cached result.
+        
+        Args:
+            task: Mulan task name
+            market: Market segment (None for no market context)
+            question: Question text sent to Mulan
+        
+        Returns:
+            Cached result dictionary or None
+        """
+        if task not in CACHEABLE_TASKS:
+            return None
+        
+        market = market or ""
+        normalized = self._normalize(question)
+        key = self._make_key(task, market, normalized)
+        now = time.monotonic()
+        
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now - entry[4] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[3]
+            del self._entries[key]
+        
+        redis_client = self._get_redis()
+        if redis_client is not None:
+            try:
+                raw = await redis_client.get(self.REDIS_KEY_PREFIX + key)
+                if raw is not None:
+                    result = orjson.loads(raw)
+                    self._store_local(key, task, market, normalized, result)
+                    self.hits += 1
+                    return result
+            except Exception as e:
+                self._redis_failed(e)
+        
+        if task in SIMILAR_MATCH_TASKS:
+            result = self._find_similar(task, market, normalized, now)
+            if result is not None:
+                self.similar_hits += 1
+                return result
+        
+        self.misses += 1
+        return None
+    
+    async def put(self, task: str, market: Optional[str], question: str, result: Dict):
+        """
+        Store a result.
+        
+        Args:
+            task: Mulan task name
+            market: Market segment (None for no market context)
+            question: Question text sent to Mulan
+            result: Result dictionary returned by Mulan
+        """
+        if task not in CACHEABLE_TASKS or result.get("error"):
+            return
+        
+        market = market or ""
+        normalized = self._normalize(question)
+        key = self._make_key(task, market, normalized)
+        self._store_local(key, task, market, normalized, result)
+        
+        redis_client = self._get_redis()
+        if redis_client is not None:
+            try:
+                await redis_client.set(
+                    self.REDIS_KEY_PREFIX + key,
+                    orjson.dumps(result),
+                    ex=self.redis_ttl_seconds
+                )
+            except Exception as e:
+                self._redis_failed(e)
+    
+    def clear(self):
+        """Remove all entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+    
+    def stats(self) -> Dict:
+        """
+        Get cache hit-rate metrics.
+        
+        Returns:
+            Dictionary with size, hits, similar_hits, misses and hit_rate
+        """
+        lookups = self.hits + self.similar_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.similar_hits) / lookups if lookups > 0 else 0.0
+        }
@@ -1,42 +1,42 @@
 """
 Shared dependencies for FastAPI routes.
 """
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from backend.database.supabase_client import db_client, SupabaseClient
-from backend.crawler.crawler_manager import crawler_manager, CrawlerManager
-from backend.agent.mulan_client import mulan_client, MulanClient
-from backend.agent.capability_checker import capability_checker, CapabilityChecker
-from backend.agent.response_generator import response_generator, ResponseGenerator
+from backend.database.supabase_client import SupabaseClient
+from backend.crawler.crawler_manager import CrawlerManager
+from backend.agent.mulan_client import MulanClient
+from backend.agent.capability_checker import CapabilityChecker
+from backend.agent.response_generator import ResponseGenerator
 from backend.utils.logger import log
 
 
 security = HTTPBearer(auto_error=False)
 
 
-def get_db_client() -> SupabaseClient:
+def get_db_client(request: Request) -> SupabaseClient:
     """Dependency to get database client."""
-    return db_client
+    return request.app.state.db_client
 
 
-def get_crawler_manager() -> CrawlerManager:
+def get_crawler_manager(request: Request) -> CrawlerManager:
     """Dependency to get crawler manager."""
-    return crawler_manager
+    return request.app.state.crawler_manager
 
 
-def get_mulan_client() -> MulanClient:
+def get_mulan_client(request: Request) -> MulanClient:
     """Dependency to get Mulan client."""
-    return mulan_client
+    return request.app.state.mulan_client
 
 
-def get_capability_checker() -> CapabilityChecker:
+def get_capability_checker(request: Request) -> CapabilityChecker:
     """Dependency to get capability checker."""
-    return capability_checker
+    return request.app.state.capability_checker
 
 
-def get_response_generator() -> ResponseGenerator:
+def get_response_generator(request: Request) -> ResponseGenerator:
     """Dependency to get response generator."""
-    return response_generator
+    return request.app.state.response_generator
 
 
 async def verify_api_key(
@@ -2,16 +2,51 @@
 Main FastAPI application entry point.
 """
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from backend.api.routes import questions, responses, analytics, crawl
+from backend.agent.mulan_client import mulan_client
+from backend.agent.capability_checker import capability_checker
+from backend.agent.response_generator import get_response_generator
+from backend.crawler.crawler_manager import crawler_manager
+from backend.database.supabase_client import db_client
 from backend.config.settings import settings
 from backend.utils.logger import log
+from backend.utils.loop_monitor import loop_monitor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up shared services on startup and release them on shutdown."""
+    log.info("Starting Mulan Marketing Agent API")
+    log.info(f"Environment: {settings.environment}")
+    log.info(f"Auto-post enabled: {settings.auto_post_enabled}")
+    
+    # Shared services used by route dependencies; the response generator is
+    # built here rather than at import time
+    app.state.db_client = db_client
+    app.state.crawler_manager = crawler_manager
+    app.state.mulan_client = mulan_client
+    app.state.capability_checker = capability_checker
+    app.state.response_generator = get_response_generator()
+    
+    if settings.environment != "production":
+        loop_monitor.start()
+    
+    yield
+    
+    log.info("Shutting down Mulan Marketing Agent API")
+    await loop_monitor.stop()
+    await mulan_client.aclose()
+    await crawler_manager.aclose()
+    db_client.close()
 
 
 # Initialize FastAPI app
@@ -20,7 +55,9 @@ app = FastAPI(
     description="API for automated social media marketing with AI agent integration",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -32,6 +69,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Warn about blocking calls on the event loop outside production
+if settings.environment != "production":
+    @app.middleware("http")
+    async def track_request_for_loop_monitor(request: Request, call_next):
+        """Record in-flight requests so event loop stalls can be attributed."""
+        key = loop_monitor.track(f"{request.method} {request.url.path}")
+        try:
+            return await call_next(request)
+        finally:
+            loop_monitor.untrack(key)
+
 # Include routers
 app.include_router(questions.router, prefix="/api")
 app.include_router(responses.router, prefix="/api")
@@ -39,20 +87,6 @@ app.include_router(analytics.router, prefix="/api")
 app.include_router(crawl.router, prefix="/api")
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup."""
-    log.info("Starting Mulan Marketing Agent API")
-    log.info(f"Environment: {settings.environment}")
-    log.info(f"Auto-post enabled: {settings.auto_post_enabled}")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown."""
-    log.info("Shutting down Mulan Marketing Agent API")
-
-
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -1,15 +1,50 @@
 """
 Analytics and statistics API routes.
 """
+import asyncio
+import time
+from typing import Optional, Tuple
 from fastapi import APIRouter, Depends
 from backend.database.models import AnalyticsResponse
 from backend.database.supabase_client import SupabaseClient
 from backend.api.dependencies import get_db_client
+from backend.config.settings import settings
 from backend.utils.logger import log
 
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+# (stored_at, response) for the last successful analytics summary
+_analytics_cache: Optional[Tuple[float, AnalyticsResponse]] = None
+_analytics_lock: Optional[asyncio.Lock] = None
+_analytics_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_analytics_lock() -> asyncio.Lock:
+    """Get the analytics cache lock for the running event loop."""
+    global _analytics_lock, _analytics_lock_loop
+    loop = asyncio.get_running_loop()
+    if _analytics_lock is None or _analytics_lock_loop is not loop:
+        _analytics_lock = asyncio.Lock()
+        _analytics_lock_loop = loop
+    return _analytics_lock
+
+
+def _cached_analytics() -> Optional[AnalyticsResponse]:
+    """Return the cached analytics summary if it is still fresh."""
+    if _analytics_cache is None:
+        return None
+    stored_at, response = _analytics_cache
+    if time.monotonic() - stored_at > settings.analytics_cache_ttl_seconds:
+        return None
+    return response
+
+
+def clear_analytics_cache():
+    """Drop the cached analytics summary."""
+    global _analytics_cache
+    _analytics_cache = None
+
 
 @router.get("/", response_model=AnalyticsResponse)
 async def get_analytics(
@@ -18,42 +53,75 @@ async def get_analytics(
     """
     Get overall analytics and statistics.
     
+    Results are cached for a few seconds so polling dashboards share one
+    set of aggregation queries.
+    
     Args:
         db: Database client
         
     Returns:
         Analytics summary
     """
-    try:
-        # Get question counts
-        questions_by_status = await db.get_question_count_by_status()
-        questions_by_platform = await db.get_question_count_by_platform()
-        
-        # Get response stats
-        response_stats = await db.get_response_stats()
+    global _analytics_cache
+    
+    cached = _cached_analytics()
+    if cached is not None:
+        return cached
+    
+    async with _get_analytics_lock():
+        # Another request may have refreshed the cache while we waited
+        cached = _cached_analytics()
+        if cached is not None:
+            return cached
         
-        # Calculate totals
-        total_questions = sum(questions_by_status.values())
+        try:
+            response = await _compute_analytics(db)
+        except Exception as e:
+            log.error("Error fetching analytics: {}", e)
+            return AnalyticsResponse(
+                total_questions=0,
+                questions_by_status={},
+                questions_by_platform={},
+                questions_by_market={},
+                total_responses=0,
+                response_success_rate=0.0,
+                avg_confidence_score=0.0
+            )
         
-        return AnalyticsResponse(
-            total_questions=total_questions,
-            questions_by_status=questions_by_status,
-            questions_by_platform=questions_by_platform,
-            total_responses=response_stats['total'],
-            response_success_rate=response_stats['success_rate'],
-            avg_confidence_score=response_stats['avg_confidence']
-        )
+        _analytics_cache = (time.monotonic(), response)
+        return response
+
+
+async def _compute_analytics(db: SupabaseClient) -> AnalyticsResponse:
+    """
+    Run the aggregation queries behind the analytics summary.
+    
+    Args:
+        db: Database client
         
-    except Exception as e:
-        log.error(f"Error fetching analytics: {e}")
-        return AnalyticsResponse(
-            total_questions=0,
-            questions_by_status={},
-            questions_by_platform={},
-            total_responses=0,
-            response_success_rate=0.0,
-            avg_confidence_score=0.0
-        )
+    Returns:
+        Analytics summary
+    """
+    # Get question counts and response stats concurrently
+    questions_by_status, questions_by_platform, questions_by_market, response_stats = await asyncio.gather(
+        db.get_question_count_by_status(),
+        db.get_question_count_by_platform(),
+        db.get_question_count_by_market(),
+        db.get_response_stats()
+    )
+    
+    # Calculate totals
+    total_questions = sum(questions_by_status.values())
+    
+    return AnalyticsResponse(
+        total_questions=total_questions,
+        questions_by_status=questions_by_status,
+        questions_by_platform=questions_by_platform,
+        questions_by_market=questions_by_market,
+        total_responses=response_stats['total'],
+        response_success_rate=response_stats['success_rate'],
+        avg_confidence_score=response_stats['avg_confidence']
+    )
 
 
 @router.get("/crawl-logs")
@@ -76,6 +144,6 @@ async def get_crawl_logs(
         return logs
         
     except Exception as e:
-        log.error(f"Error fetching crawl logs: {e}")
+        log.error("Error fetching crawl logs: {}", e)
         return []
 
@@ -30,8 +30,10 @@ async def trigger_crawl(
         Crawl results
     """
     try:
-        log.info(f"Manual crawl triggered for {request.platform}" + 
-                (f" (market: {market})" if market else ""))
+        log.info(
+            "Manual crawl triggered for {}{}",
+            request.platform, f" (market: {market})" if market else ""
+        )
         
         result = await manager.crawl_platform(
             request.platform.value,
@@ -42,7 +44,7 @@ async def trigger_crawl(
         return result
         
     except Exception as e:
-        log.error(f"Error triggering crawl: {e}")
+        log.error("Error triggering crawl: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -64,14 +66,14 @@ async def trigger_market_crawl(
         Market crawl results
     """
     try:
-        log.info(f"Manual market crawl triggered for '{market_name}'")
+        log.info("Manual market crawl triggered for '{}'", market_name)
         
         result = await manager.crawl_market(market_name, limit)
         
         return result
         
     except Exception as e:
-        log.error(f"Error triggering market crawl: {e}")
+        log.error("Error triggering market crawl: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -98,7 +100,7 @@ async def trigger_all_crawls(
         return results
         
     except Exception as e:
-        log.error(f"Error triggering crawls: {e}")
+        log.error("Error triggering crawls: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -125,7 +127,7 @@ async def trigger_all_markets_crawl(
         return results
         
     except Exception as e:
-        log.error(f"Error triggering market crawls: {e}")
+        log.error("Error triggering market crawls: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -151,7 +153,7 @@ async def trigger_reddit_crawl(
         return result
         
     except Exception as e:
-        log.error(f"Error crawling Reddit: {e}")
+        log.error("Error crawling Reddit: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -177,5 +179,5 @@ async def trigger_quora_crawl(
         return result
         
     except Exception as e:
-        log.error(f"Error crawling Quora: {e}")
+        log.error("Error crawling Quora: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
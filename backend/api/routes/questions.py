@@ -3,7 +3,9 @@ Question management API routes with multi-market support.
 """
 from typing import List, Optional
 from uuid import UUID
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, Response
 from backend.database.models import Question, QuestionStatus, QuestionUpdate
 from backend.database.supabase_client import SupabaseClient
 from backend.api.dependencies import get_db_client
@@ -14,7 +16,7 @@ from backend.utils.logger import log
 router = APIRouter(prefix="/questions", tags=["questions"])
 
 
-@router.get("/", response_model=List[Question])
+@router.get("/", response_class=ORJSONResponse)
 async def get_questions(
     status: Optional[QuestionStatus] = None,
     market: Optional[str] = Query(default=None, description="Filter by market segment"),
@@ -22,11 +24,18 @@ async def get_questions(
     min_score: Optional[float] = Query(default=None, description="Minimum confidence score"),
     limit: int = Query(default=100, le=1000),
     offset: int = Query(default=0, ge=0),
+    after_id: Optional[UUID] = Query(default=None, description="Return questions after this ID (keyset pagination)"),
+    summary: bool = Query(default=False, description="Omit post content, tags and content hash"),
     db: SupabaseClient = Depends(get_db_client)
 ):
     """
     Get questions with optional filtering by market, status, platform, etc.
     
+    Rows come straight from the database and are serialized without
+    re-validating each one through the Question model. With `summary`,
+    only the listing columns are selected so post bodies are not
+    transferred.
+    
     Args:
         status: Filter by status
         market: Filter by market segment (indie_authors, course_creators, etc.)
@@ -34,25 +43,29 @@ async def get_questions(
         min_score: Minimum confidence score filter
         limit: Maximum number of questions to return
         offset: Offset for pagination
+        after_id: Last question ID of the previous page
+        summary: Return only the listing columns
         db: Database client
         
     Returns:
         List of questions
     """
     try:
-        questions = await db.get_questions(
+        questions = await db.get_question_rows(
             status=status,
             market=market,
             platform=platform,
             min_score=min_score,
             limit=limit,
-            offset=offset
+            offset=offset,
+            after_id=after_id,
+            columns=SupabaseClient.QUESTION_SUMMARY_COLUMNS if summary else '*'
         )
         
-        return questions
+        return ORJSONResponse(questions)
         
     except Exception as e:
-        log.error(f"Error fetching questions: {e}")
+        log.error("Error fetching questions: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -82,7 +95,7 @@ async def get_question(
     except HTTPException:
         raise
     except Exception as e:
-        log.error(f"Error fetching question {question_id}: {e}")
+        log.error("Error fetching question {}: {}", question_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -120,7 +133,7 @@ async def update_question(
     except HTTPException:
         raise
     except Exception as e:
-        log.error(f"Error updating question {question_id}: {e}")
+        log.error("Error updating question {}: {}", question_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -144,10 +157,30 @@ async def get_question_comments(
         return comments
         
     except Exception as e:
-        log.error(f"Error fetching comments for question {question_id}: {e}")
+        log.error("Error fetching comments for question {}: {}", question_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _build_market_details() -> List[dict]:
+    """Summarize the configured markets for the markets endpoint."""
+    market_details = []
+    for market_name in get_all_markets():
+        config = get_market_config(market_name)
+        if config:
+            market_details.append({
+                "name": config.name,
+                "description": config.description,
+                "platforms": config.platforms,
+                "crawl_interval_hours": config.crawl_interval_hours
+            })
+    return market_details
+
+
+# Market configuration is static per deploy, so serialize it once
+MARKET_DETAILS = _build_market_details()
+MARKET_DETAILS_JSON = orjson.dumps(MARKET_DETAILS)
+
+
 @router.get("/markets/list")
 async def get_markets():
     """
@@ -156,23 +189,4 @@ async def get_markets():
     Returns:
         List of market configurations
     """
-    try:
-        markets = get_all_markets()
-        market_details = []
-        
-        for market_name in markets:
-            config = get_market_config(market_name)
-            if config:
-                market_details.append({
-                    "name": config.name,
-                    "description": config.description,
-                    "platforms": config.platforms,
-                    "crawl_interval_hours": config.crawl_interval_hours
-                })
-        
-        return market_details
-        
-    except Exception as e:
-        log.error(f"Error fetching markets: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
+    return Response(content=MARKET_DETAILS_JSON, media_type="application/json")
@@ -1,45 +1,88 @@
 """
 Response management API routes.
 """
+import hashlib
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
 from backend.database.models import AgentResponse
 from backend.database.supabase_client import SupabaseClient
 from backend.agent.response_generator import ResponseGenerator
+from backend.config.settings import settings
 from backend.api.dependencies import get_db_client, get_response_generator
 from backend.utils.logger import log
+from backend.utils.response_cache import agent_response_cache
 
 
-router = APIRouter(prefix="/responses", tags=["responses"])
+router = APIRouter(prefix="/responses", tags=["responses"], default_response_class=ORJSONResponse)
+
+
+def _conditional_response(request: Request, payload: bytes) -> Response:
+    """
+    Build a JSON response with an ETag, or a 304 if the client already has it.
+    
+    Args:
+        request: Incoming request (checked for If-None-Match)
+        payload: Serialized response body
+        
+    Returns:
+        Full response, or an empty 304 Not Modified
+    """
+    # Content hash, so every worker computes the same tag for the same body
+    etag = f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.response_http_max_age_seconds}, must-revalidate"
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in client_tags or "*" in client_tags:
+            return Response(status_code=304, headers=headers)
+    
+    return Response(content=payload, media_type="application/json", headers=headers)
 
 
 @router.get("/{question_id}", response_model=AgentResponse)
 async def get_response(
     question_id: UUID,
+    request: Request,
     db: SupabaseClient = Depends(get_db_client)
 ):
     """
     Get agent response for a question.
     
+    Responses are cached by question ID; database writes to the agent
+    response invalidate the entry. Responses carry an ETag and honor
+    If-None-Match with a 304.
+    
     Args:
         question_id: Question UUID
+        request: Incoming request
         db: Database client
         
     Returns:
         Agent response
     """
     try:
+        cached = await agent_response_cache.get(str(question_id))
+        if cached is not None:
+            return _conditional_response(request, cached)
+        
         response = await db.get_agent_response(question_id)
         
         if not response:
             raise HTTPException(status_code=404, detail="Response not found")
         
-        return response
+        payload = response.model_dump_json().encode()
+        await agent_response_cache.set(str(question_id), payload)
+        return _conditional_response(request, payload)
         
     except HTTPException:
         raise
     except Exception as e:
-        log.error(f"Error fetching response for question {question_id}: {e}")
+        log.error("Error fetching response for question {}: {}", question_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -61,13 +104,11 @@ async def generate_response(
         Generated response
     """
     try:
-        # Get question
-        question = await db.get_question(question_id)
+        # Get question and agent response in one query
+        question, agent_response = await db.get_question_with_response(question_id)
         if not question:
             raise HTTPException(status_code=404, detail="Question not found")
         
-        # Get agent response
-        agent_response = await db.get_agent_response(question_id)
         if not agent_response:
             raise HTTPException(status_code=404, detail="Agent response not found. Run capability check first.")
         
@@ -85,7 +126,7 @@ async def generate_response(
     except HTTPException:
         raise
     except Exception as e:
-        log.error(f"Error generating response for question {question_id}: {e}")
+        log.error("Error generating response for question {}: {}", question_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -107,8 +148,12 @@ async def post_response(
         Success message
     """
     try:
+        question, agent_response = await db.get_question_with_response(question_id)
+        if not question:
+            raise HTTPException(status_code=404, detail="Question not found")
+        
         # Process question (generate and post)
-        success = await generator.process_question(question_id)
+        success = await generator.process_question(question_id, question, agent_response)
         
         if not success:
             raise HTTPException(status_code=500, detail="Failed to process question")
@@ -121,6 +166,6 @@ async def post_response(
     except HTTPException:
         raise
     except Exception as e:
-        log.error(f"Error posting response for question {question_id}: {e}")
+        log.error("Error posting response for question {}: {}", question_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -4,72 +4,101 @@ Provides tools for managing leads, responses, and crawls.
 """
 import click
 import asyncio
-from tabulate import tabulate
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
 from backend.database.supabase_client import db_client
-from backend.config.markets import get_all_markets, get_market_config
+from backend.database.models import utc_now
+from backend.config.markets import get_market_descriptions
 from backend.crawler.crawler_manager import crawler_manager
-from backend.agent.response_generator import response_generator
+from backend.agent.response_generator import get_response_generator
 from backend.utils.logger import log
 
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
+
+# Largest page `leads` will fetch, however large --page-size is
+MAX_LEADS_PAGE_SIZE = 100
+
+# Fixed column layout so lead rows can be printed as they are formatted
+_LEAD_ROW_FORMAT = "{:<11}  {:<43}  {:<8}  {:>5}  {:>7}  {:<10}"
+
+
+def _format_lead_rows(leads):
+    """Yield one formatted table line per lead."""
+    for lead in leads:
+        title = lead['title']
+        yield _LEAD_ROW_FORMAT.format(
+            str(lead['id'])[:8] + '...',
+            title[:40] + ('...' if len(title) > 40 else ''),
+            lead['platform'],
+            f"{lead['confidence_score'] or 0.0:.2f}",
+            lead['upvotes'],
+            str(lead['created_at'])[:10]
+        )
+
 
 @click.group()
-def cli():
+@click.pass_context
+def cli(ctx):
     """Mulan Marketing Agent CLI - Multi-market lead generation tool."""
-    pass
+    # Commands are I/O-bound; run their event loops on uvloop when installed
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    # Drain the shared database connection pool once the command finishes
+    ctx.call_on_close(db_client.close)
+    ctx.call_on_close(crawler_manager.close)
 
 
 @cli.command()
 @click.option('--market', required=True, help='Market segment (indie_authors, course_creators, etc.)')
 @click.option('--status', default='pending', help='Question status filter')
-@click.option('--limit', default=10, help='Number of results')
+@click.option('--page', default=1, type=click.IntRange(min=1), help='Page number (starting at 1)')
+@click.option('--page-size', '--limit', 'page_size', default=10, type=click.IntRange(min=1),
+              help=f'Results per page (at most {MAX_LEADS_PAGE_SIZE})')
 @click.option('--min-score', type=float, default=None, help='Minimum confidence score')
-def leads(market, status, limit, min_score):
+def leads(market, status, page, page_size, min_score):
     """
-    List top leads for a specific market.
+    List top leads for a specific market, one page at a time.
     
     Example:
-        python -m backend.cli.main leads --market indie_authors --limit 10
+        python -m backend.cli.main leads --market indie_authors --page 2 --page-size 20
     """
-    try:
-        questions = asyncio.run(db_client.get_questions(
+    page_size = min(page_size, MAX_LEADS_PAGE_SIZE)
+    
+    async def _run():
+        # Questions and scores come joined from the questions_with_scores view
+        leads = await db_client.get_leads(
             market=market,
             status=status,
             min_score=min_score,
-            limit=limit
-        ))
+            limit=page_size,
+            offset=(page - 1) * page_size
+        )
         
-        if not questions:
-            click.echo(f"No {status} leads found for market '{market}'")
+        if not leads:
+            click.echo(f"No {status} leads found for market '{market}' on page {page}")
             return
         
-        table_data = []
-        for q in questions:
-            # Get agent response for score
-            response = asyncio.run(db_client.get_agent_response(q.id))
-            score = response.confidence_score if response else 0.0
-            
-            table_data.append([
-                str(q.id)[:8] + '...',
-                q.title[:40] + ('...' if len(q.title) > 40 else ''),
-                q.platform.value,
-                f"{score:.2f}",
-                q.upvotes,
-                q.created_at.strftime('%Y-%m-%d')
-            ])
-        
         click.echo(f"\n{'='*80}")
-        click.echo(f"Top Leads for Market: {market.upper()}")
+        click.echo(f"Top Leads for Market: {market.upper()} (page {page})")
         click.echo(f"{'='*80}\n")
         
-        click.echo(tabulate(
-            table_data,
-            headers=['ID', 'Title', 'Platform', 'Score', 'Upvotes', 'Date'],
-            tablefmt='grid'
-        ))
+        header = _LEAD_ROW_FORMAT.format('ID', 'Title', 'Platform', 'Score', 'Upvotes', 'Date')
+        click.echo(header)
+        click.echo('-' * len(header))
+        for line in _format_lead_rows(leads):
+            click.echo(line)
         
-        click.echo(f"\nTotal: {len(questions)} leads\n")
+        click.echo(f"\nShowing {len(leads)} leads")
+        if len(leads) == page_size:
+            click.echo(f"More may be available: --page {page + 1}")
+        click.echo()
+    
+    try:
+        asyncio.run(_run())
         
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
@@ -84,16 +113,13 @@ def show(question_id):
     Example:
         python -m backend.cli.main show abc123...
     """
-    try:
-        # Get question
-        question = asyncio.run(db_client.get_question(question_id))
+    async def _run():
+        # Get question and response in one query
+        question, response = await db_client.get_question_with_response(question_id)
         if not question:
             click.echo(f"Question {question_id} not found", err=True)
             return
         
-        # Get response
-        response = asyncio.run(db_client.get_agent_response(question_id))
-        
         click.echo(f"\n{'='*80}")
         click.echo(f"QUESTION DETAILS")
         click.echo(f"{'='*80}")
@@ -125,6 +151,9 @@ def show(question_id):
             click.echo(f"\n(No response generated yet)")
         
         click.echo(f"\n{'='*80}\n")
+    
+    try:
+        asyncio.run(_run())
         
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
@@ -144,14 +173,13 @@ def post(question_id, approve):
         click.echo("Use --approve flag to confirm posting")
         return
     
-    try:
-        # Get question and response
-        question = asyncio.run(db_client.get_question(question_id))
+    async def _run():
+        # Get question and response in one query
+        question, response = await db_client.get_question_with_response(question_id)
         if not question:
             click.echo(f"Question {question_id} not found", err=True)
             return
         
-        response = asyncio.run(db_client.get_agent_response(question_id))
         if not response or not response.response_text:
             click.echo(f"No response generated for this question", err=True)
             return
@@ -170,20 +198,23 @@ def post(question_id, approve):
         click.echo(f"{'='*80}\n")
         
         if click.confirm('Proceed with posting?'):
-            success = asyncio.run(response_generator.post_response(question, response.response_text))
+            success = await get_response_generator().post_response(question, response.response_text)
             
             if success:
                 # Update response as posted
-                asyncio.run(db_client.update_response_posted(
+                await db_client.update_response_posted(
                     response.id,
                     posted=True,
-                    posted_at=datetime.utcnow()
-                ))
+                    posted_at=utc_now()
+                )
                 click.echo(f"✅ Posted successfully!")
             else:
                 click.echo(f"❌ Failed to post response", err=True)
         else:
             click.echo("Cancelled")
+    
+    try:
+        asyncio.run(_run())
         
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
@@ -193,21 +224,22 @@ def post(question_id, approve):
 @click.option('--market', required=True, help='Market segment')
 @click.option('--min-score', type=float, default=0.85, help='Minimum confidence score')
 @click.option('--limit', default=5, help='Maximum number to post')
-def batch_post(market, min_score, limit):
+@click.option('--concurrency', default=3, help='Maximum posts in flight at once')
+def batch_post(market, min_score, limit, concurrency):
     """
     Batch approve and post top-scoring leads for a market.
     
     Example:
         python -m backend.cli.main batch-post --market indie_authors --min-score 0.85 --limit 5
     """
-    try:
+    async def _run():
         # Get high-scoring pending questions
-        questions = asyncio.run(db_client.get_questions(
+        questions = await db_client.get_questions(
             market=market,
             status='pending',
             min_score=min_score,
             limit=limit
-        ))
+        )
         
         if not questions:
             click.echo(f"No leads found matching criteria")
@@ -220,26 +252,35 @@ def batch_post(market, min_score, limit):
             click.echo("Cancelled")
             return
         
-        success_count = 0
-        for question in questions:
-            response = asyncio.run(db_client.get_agent_response(question.id))
+        responses = await db_client.get_agent_responses_bulk([q.id for q in questions])
+        
+        response_generator = get_response_generator()
+        # Bound concurrent posts to stay within platform rate limits
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _post_one(question):
+            response = responses.get(question.id)
+            if not response or not response.response_text or response.posted:
+                return None
+            
+            async with semaphore:
+                success = await response_generator.post_response(question, response.response_text)
             
-            if response and response.response_text and not response.posted:
-                click.echo(f"Posting: {question.title[:50]}...")
-                success = asyncio.run(response_generator.post_response(question, response.response_text))
-                
-                if success:
-                    asyncio.run(db_client.update_response_posted(
-                        response.id,
-                        posted=True,
-                        posted_at=datetime.utcnow()
-                    ))
-                    success_count += 1
-                    click.echo(f"  ✅ Posted")
-                else:
-                    click.echo(f"  ❌ Failed")
+            status = "✅ Posted" if success else "❌ Failed"
+            click.echo(f"{status}: {question.title[:50]}...")
+            return response.id if success else None
+        
+        results = await asyncio.gather(*[_post_one(q) for q in questions])
+        posted_ids = [response_id for response_id in results if response_id is not None]
+        
+        # Record every successful post in one update
+        await db_client.bulk_mark_posted(posted_ids, posted_at=utc_now())
+        success_count = len(posted_ids)
         
         click.echo(f"\nCompleted: {success_count}/{len(questions)} posted successfully\n")
+    
+    try:
+        asyncio.run(_run())
         
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
@@ -255,10 +296,14 @@ def crawl(market, limit):
     Example:
         python -m backend.cli.main crawl --market course_creators
     """
-    try:
+    async def _run():
         click.echo(f"Starting crawl for market '{market}'...")
         
-        result = asyncio.run(crawler_manager.crawl_market(market, limit))
+        try:
+            result = await crawler_manager.crawl_market(market, limit)
+        finally:
+            # Close the crawlers' HTTP clients while their event loop is still running
+            await crawler_manager.aclose()
         
         click.echo(f"\n{'='*80}")
         click.echo(f"CRAWL RESULTS FOR: {market.upper()}")
@@ -279,6 +324,9 @@ def crawl(market, limit):
                     click.echo(f"  {platform}: {stored} stored from {found} found")
         
         click.echo(f"{'='*80}\n")
+    
+    try:
+        asyncio.run(_run())
         
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
@@ -294,11 +342,11 @@ def stats(market, days):
     Example:
         python -m backend.cli.main stats --market indie_authors --days 7
     """
-    try:
-        since = datetime.utcnow() - timedelta(days=days)
+    async def _run():
+        since = utc_now() - timedelta(days=days)
         
         # Get analytics
-        analytics = asyncio.run(db_client.get_analytics(since_date=since, market=market))
+        analytics = await db_client.get_analytics(since_date=since, market=market)
         
         click.echo(f"\n{'='*80}")
         click.echo(f"ANALYTICS" + (f" FOR: {market.upper()}" if market else " (ALL MARKETS)"))
@@ -326,6 +374,9 @@ def stats(market, days):
                 click.echo(f"  {mkt}: {count}")
         
         click.echo(f"\n{'='*80}\n")
+    
+    try:
+        asyncio.run(_run())
         
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
@@ -340,23 +391,16 @@ def markets():
         python -m backend.cli.main markets
     """
     try:
-        all_markets = get_all_markets()
+        descriptions = get_market_descriptions()
         
         click.echo(f"\n{'='*80}")
         click.echo(f"CONFIGURED MARKETS")
         click.echo(f"{'='*80}\n")
         
-        for market_name in all_markets:
-            config = get_market_config(market_name)
-            if config:
-                click.echo(f"📊 {market_name}")
-                click.echo(f"   Description: {config.description}")
-                click.echo(f"   Platforms:   {', '.join(config.platforms)}")
-                click.echo(f"   Crawl Interval: Every {config.crawl_interval_hours} hours")
-                click.echo(f"   Min Confidence: {config.min_confidence_score}")
-                click.echo()
-        
-        click.echo(f"Total: {len(all_markets)} markets configured\n")
+        for description in descriptions:
+            click.echo(description)
+        
+        click.echo(f"Total: {len(descriptions)} markets configured\n")
         
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
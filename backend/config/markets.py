@@ -2,21 +2,43 @@
 Market configuration system for multi-market lead generation.
 Each market defines target platforms, keywords, tone, and context.
 """
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from dataclasses import dataclass, field
 
 
-@dataclass
+# Disclosure appended to every posted response (transparency and platform compliance)
+DEFAULT_DISCLOSURE = "*Disclosure: I work with Mulan AI, which offers tools for creating videos easily.*"
+
+
+@dataclass(slots=True, frozen=True)
 class PlatformConfig:
     """Configuration for a platform within a market."""
-    subreddits: List[str] = None
-    topics: List[str] = None
-    keywords: List[str] = None
+    subreddits: List[str] = field(default_factory=list)
+    topics: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
     min_upvotes: int = 3
-    search_queries: List[str] = None
+    search_queries: List[str] = field(default_factory=list)
+    # Lowercased keywords for O(1) membership tests, built from `keywords`
+    keyword_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Build the keyword set."""
+        object.__setattr__(self, 'keyword_set', frozenset(k.lower() for k in self.keywords))
+    
+    def has_keyword(self, keyword: str) -> bool:
+        """
+        Check whether a keyword is configured for this platform (case-insensitive).
+        
+        Args:
+            keyword: Keyword or phrase to look up
+            
+        Returns:
+            True if the keyword is configured
+        """
+        return keyword.lower() in self.keyword_set
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketConfig:
     """Configuration for a target market segment."""
     name: str
@@ -28,18 +50,15 @@ class MarketConfig:
     tone: str = "helpful, professional"
     target_pain: str = ""
     mulan_context: str = ""
-    workflow_examples: Dict[str, str] = None
+    workflow_examples: Dict[str, str] = field(default_factory=dict)
     min_confidence_score: float = 0.7
     crawl_interval_hours: int = 6
     max_posts_per_day: int = 20
-    
-    def __post_init__(self):
-        """Initialize default values."""
-        if self.workflow_examples is None:
-            self.workflow_examples = {}
+    disclosure: str = DEFAULT_DISCLOSURE
 
 
 # Market Definitions
+# Treated as immutable at runtime: the lookup indices below are built from it once at import
 MARKETS = {
     "indie_authors": MarketConfig(
         name="indie_authors",
@@ -251,6 +270,58 @@ MARKETS = {
     )
 }
 
+# Platform-specific config attributes on MarketConfig
+PLATFORM_ATTRIBUTES = ("reddit", "quora", "twitter")
+
+
+def _build_indices():
+    """
+    Build lookup tables over MARKETS once at import.
+    
+    Returns:
+        Tuple of (platform -> market names, (market, platform) -> keywords,
+        market -> (workflow phrase/URL pairs in priority order, default URL))
+    """
+    platform_to_markets: Dict[str, List[str]] = {}
+    market_platform_keywords: Dict[Tuple[str, str], List[str]] = {}
+    workflow_matchers: Dict[str, Tuple[Tuple[Tuple[str, str], ...], str]] = {}
+    
+    for name, config in MARKETS.items():
+        for platform in config.platforms:
+            platform_to_markets.setdefault(platform, []).append(name)
+        for platform in PLATFORM_ATTRIBUTES:
+            platform_config = getattr(config, platform)
+            if platform_config:
+                market_platform_keywords[(name, platform)] = platform_config.keywords
+        if config.workflow_examples:
+            phrases = tuple(
+                (workflow_key.replace("_", " ").lower(), workflow_url)
+                for workflow_key, workflow_url in config.workflow_examples.items()
+            )
+            workflow_matchers[name] = (phrases, phrases[0][1])
+    
+    return platform_to_markets, market_platform_keywords, workflow_matchers
+
+
+_PLATFORM_TO_MARKETS, _MARKET_PLATFORM_KEYWORDS, _WORKFLOW_MATCHERS = _build_indices()
+
+
+def _format_market_description(name: str, config: MarketConfig) -> str:
+    """Format the summary block shown when listing markets."""
+    return (
+        f"📊 {name}\n"
+        f"   Description: {config.description}\n"
+        f"   Platforms:   {', '.join(config.platforms)}\n"
+        f"   Crawl Interval: Every {config.crawl_interval_hours} hours\n"
+        f"   Min Confidence: {config.min_confidence_score}\n"
+    )
+
+
+# Market summaries never change at runtime, so format them once
+_MARKET_DESCRIPTIONS: Dict[str, str] = {
+    name: _format_market_description(name, config) for name, config in MARKETS.items()
+}
+
 
 def get_market_config(market_name: str) -> Optional[MarketConfig]:
     """
@@ -275,6 +346,29 @@ def get_all_markets() -> List[str]:
     return list(MARKETS.keys())
 
 
+def get_market_description(market_name: str) -> Optional[str]:
+    """
+    Get the preformatted summary block for a market.
+    
+    Args:
+        market_name: Name of the market
+        
+    Returns:
+        Multi-line description or None if not found
+    """
+    return _MARKET_DESCRIPTIONS.get(market_name)
+
+
+def get_market_descriptions() -> List[str]:
+    """
+    Get the preformatted summary blocks for all markets.
+    
+    Returns:
+        List of multi-line descriptions in configuration order
+    """
+    return list(_MARKET_DESCRIPTIONS.values())
+
+
 def get_markets_for_platform(platform: str) -> List[str]:
     """
     Get all markets that use a specific platform.
@@ -285,10 +379,7 @@ def get_markets_for_platform(platform: str) -> List[str]:
     Returns:
         List of market names
     """
-    return [
-        name for name, config in MARKETS.items()
-        if platform in config.platforms
-    ]
+    return list(_PLATFORM_TO_MARKETS.get(platform, []))
 
 
 def get_keywords_for_market(market_name: str, platform: str) -> List[str]:
@@ -302,15 +393,7 @@ def get_keywords_for_market(market_name: str, platform: str) -> List[str]:
     Returns:
         List of keywords or empty list
     """
-    market = get_market_config(market_name)
-    if not market:
-        return []
-    
-    platform_config = getattr(market, platform, None)
-    if not platform_config:
-        return []
-    
-    return platform_config.keywords or []
+    return _MARKET_PLATFORM_KEYWORDS.get((market_name, platform), [])
 
 
 def get_workflow_link_for_context(market_name: str, question_text: str) -> str:
@@ -324,18 +407,20 @@ def get_workflow_link_for_context(market_name: str, question_text: str) -> str:
     Returns:
         Workflow URL
     """
-    market = get_market_config(market_name)
-    if not market or not market.workflow_examples:
+    matcher = _WORKFLOW_MATCHERS.get(market_name)
+    if not matcher:
         return "https://app.mulan.ai"
     
+    phrases, default_url = matcher
     question_lower = question_text.lower()
     
-    # Simple keyword matching for workflow selection
+    # Simple keyword matching for workflow selection; the first configured
+    # workflow whose phrase appears wins
     # Could be enhanced with AI/NLP in the future
-    for workflow_key, workflow_url in market.workflow_examples.items():
-        if workflow_key.replace("_", " ") in question_lower:
+    for phrase, workflow_url in phrases:
+        if phrase in question_lower:
             return workflow_url
     
     # Return first workflow as default
-    return list(market.workflow_examples.values())[0]
+    return default_url
 
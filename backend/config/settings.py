@@ -3,6 +3,7 @@ Configuration settings for the Mulan Marketing Agent system.
 Loads environment variables and provides centralized configuration.
 """
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -18,6 +19,8 @@ class Settings(BaseSettings):
     # Database
     supabase_url: str = Field(..., env="SUPABASE_URL")
     supabase_key: str = Field(..., env="SUPABASE_KEY")
+    supabase_max_connections: int = Field(default=20, env="SUPABASE_MAX_CONNECTIONS")
+    supabase_keepalive_expiry: float = Field(default=60.0, env="SUPABASE_KEEPALIVE_EXPIRY")
     redis_url: str = Field(default="redis://localhost:6379", env="REDIS_URL")
     
     # Reddit API
@@ -34,6 +37,14 @@ class Settings(BaseSettings):
     # Mulan Agent
     mulan_agent_url: str = Field(..., env="MULAN_AGENT_URL")
     mulan_agent_api_key: str = Field(..., env="MULAN_AGENT_API_KEY")
+    mulan_requests_per_second: float = Field(default=5.0, gt=0, env="MULAN_REQUESTS_PER_SECOND")
+    mulan_burst: int = Field(default=10, env="MULAN_BURST")
+    mulan_concurrency: int = Field(default=8, env="MULAN_CONCURRENCY")
+    capability_batch_chunk_size: int = Field(default=25, env="CAPABILITY_BATCH_CHUNK_SIZE")
+    mulan_cache_ttl_seconds: int = Field(default=3600, env="MULAN_CACHE_TTL_SECONDS")
+    mulan_cache_max_entries: int = Field(default=2000, env="MULAN_CACHE_MAX_ENTRIES")
+    mulan_cache_redis_ttl_seconds: int = Field(default=86400, env="MULAN_CACHE_REDIS_TTL_SECONDS")
+    mulan_cache_similarity_threshold: float = Field(default=0.9, env="MULAN_CACHE_SIMILARITY_THRESHOLD")
     
     # Celery
     celery_broker_url: str = Field(default="redis://localhost:6379/0", env="CELERY_BROKER_URL")
@@ -56,20 +67,41 @@ class Settings(BaseSettings):
         env="QUORA_TOPICS"
     )
     max_posts_per_crawl: int = Field(default=100, env="MAX_POSTS_PER_CRAWL")
+    crawl_concurrency_per_platform: int = Field(default=2, env="CRAWL_CONCURRENCY_PER_PLATFORM")
+    reddit_max_concurrency: int = Field(default=4, env="REDDIT_MAX_CONCURRENCY")
+    seen_posts_capacity: int = Field(default=10_000_000, env="SEEN_POSTS_CAPACITY")
+    seen_posts_error_rate: float = Field(default=0.001, env="SEEN_POSTS_ERROR_RATE")
     
     # Response Settings
     auto_post_enabled: bool = Field(default=False, env="AUTO_POST_ENABLED")
     min_confidence_score: float = Field(default=0.7, env="MIN_CONFIDENCE_SCORE")
+    prefilter_floor: float = Field(default=0.01, env="PREFILTER_FLOOR")
+    question_claim_timeout_seconds: int = Field(default=1800, env="QUESTION_CLAIM_TIMEOUT_SECONDS")
+    max_post_attempts: int = Field(default=3, env="MAX_POST_ATTEMPTS")
     
     # Application
     environment: str = Field(default="development", env="ENVIRONMENT")
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
+    analytics_cache_ttl_seconds: float = Field(default=10.0, env="ANALYTICS_CACHE_TTL_SECONDS")
+    response_cache_ttl_seconds: int = Field(default=300, env="RESPONSE_CACHE_TTL_SECONDS")
+    response_http_max_age_seconds: int = Field(default=60, env="RESPONSE_HTTP_MAX_AGE_SECONDS")
     
     class Config:
         env_file = str(PROJECT_ROOT / ".env")
         case_sensitive = False
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the process-wide settings, parsing the environment on first call.
+    
+    Returns:
+        Cached Settings instance
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
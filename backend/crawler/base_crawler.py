@@ -1,8 +1,9 @@
 """
 Abstract base crawler class for platform-specific implementations.
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Tuple
 from datetime import datetime
 from backend.database.models import QuestionCreate, Comment
 from backend.utils.logger import log
@@ -65,9 +66,54 @@ class BaseCrawler(ABC):
         """
         pass
     
-    def _wait_for_rate_limit(self):
-        """Wait if rate limit is reached."""
-        self.rate_limiter.wait_if_needed(self.platform_name)
+    async def post_responses(self, items: List[Tuple[str, str]]) -> List[bool]:
+        """
+        Post several responses through this crawler's authenticated session.
+        
+        Platforms with a batch API can override this; the default posts each
+        item in turn while reusing the same client and login.
+        
+        Args:
+            items: List of (question_url, response_text) tuples
+            
+        Returns:
+            Success flag for each item, in order
+        """
+        results = []
+        for question_url, response_text in items:
+            try:
+                results.append(await self.post_response(question_url, response_text))
+            except Exception as e:
+                log.error(f"Error posting response to {question_url}: {e}")
+                results.append(False)
+        return results
+    
+    async def fetch_comments_batch(self, question_urls: List[str], concurrency: int = 4) -> List[List[Comment]]:
+        """
+        Fetch comments for several questions concurrently.
+        
+        Args:
+            question_urls: URLs of the questions
+            concurrency: Maximum number of fetches in flight at once
+            
+        Returns:
+            Comments for each URL, in order (empty on failure)
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def fetch_one(question_url: str) -> List[Comment]:
+            async with semaphore:
+                try:
+                    return await self.fetch_comments(question_url)
+                except Exception as e:
+                    log.error(f"Error fetching comments from {question_url}: {e}")
+                    return []
+        
+        return await asyncio.gather(*(fetch_one(question_url) for question_url in question_urls))
+    
+    async def _wait_for_rate_limit(self):
+        """Wait if rate limit is reached, without blocking the event loop."""
+        await self.rate_limiter.acquire(self.platform_name)
     
     def _normalize_question_data(self, raw_data: Dict[str, Any]) -> QuestionCreate:
         """
@@ -82,6 +128,24 @@ class BaseCrawler(ABC):
         # This should be implemented by subclasses with platform-specific logic
         raise NotImplementedError("Subclass must implement _normalize_question_data")
     
+    async def iter_question_batches(self, limit: int = 100) -> AsyncIterator[List[QuestionCreate]]:
+        """
+        Fetch questions in batches as they become available.
+        
+        Platforms that fetch in independent steps (subreddits, topics) override
+        this so callers can store one batch while the next is fetched; the
+        default yields the whole crawl as a single batch.
+        
+        Args:
+            limit: Maximum number of questions to fetch
+            
+        Yields:
+            Lists of QuestionCreate objects
+        """
+        questions = await self.crawl(limit)
+        if questions:
+            yield questions
+    
     async def crawl(self, limit: int = 100) -> List[QuestionCreate]:
         """
         Main crawl method with error handling and logging.
@@ -1,29 +1,80 @@
 """
 Crawler manager to orchestrate all platform crawlers with multi-market support.
 """
-from typing import List, Dict, Optional
-from datetime import datetime
+import asyncio
+import time
+from typing import List, Dict, Optional, Tuple
+from backend.crawler.base_crawler import BaseCrawler
 from backend.crawler.reddit_crawler import RedditCrawler
 from backend.crawler.quora_crawler import QuoraCrawler
-from backend.database.models import QuestionCreate, CrawlLog, CrawlStatus, PlatformEnum
+from backend.database.models import QuestionCreate, CrawlLog, CrawlStatus, PlatformEnum, utc_now
 from backend.database.supabase_client import db_client
 from backend.config.markets import get_market_config, get_all_markets
+from backend.config.settings import settings
 from backend.utils.logger import log
 from backend.utils.deduplicator import Deduplicator
+from backend.utils.seen_posts import seen_post_filter
 
 
 class CrawlerManager:
     """Manage and coordinate all platform crawlers with market segmentation."""
     
+    # Platforms crawled when no market is given
+    PLATFORMS = ("reddit", "quora")
+    # Content hashes remembered as already stored, oldest evicted first
+    MAX_KNOWN_HASHES = 10_000
+    
     def __init__(self):
         """Initialize crawler manager."""
         self.deduplicator = Deduplicator()
+        self.concurrency_per_platform = max(1, settings.crawl_concurrency_per_platform)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        # (platform, market) -> crawler, reused across crawls and posts
+        self._crawlers: Dict[Tuple[str, Optional[str]], BaseCrawler] = {}
+        # Insertion-ordered set of content hashes known to be stored
+        self._known_hashes: Dict[str, None] = {}
         log.info("Crawler manager initialized")
     
+    def _get_platform_semaphore(self, platform: str) -> asyncio.Semaphore:
+        """Get the crawl semaphore for a platform on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphores = {}
+            self._semaphore_loop = loop
+        if platform not in self._semaphores:
+            self._semaphores[platform] = asyncio.Semaphore(self.concurrency_per_platform)
+        return self._semaphores[platform]
+    
+    async def _crawl_with_semaphore(self, platform: str, market: Optional[str], limit: int) -> Dict[str, any]:
+        """
+        Crawl a platform while holding its concurrency slot.
+        
+        Errors are returned as a result so one failed crawl doesn't cancel
+        the others running alongside it.
+        """
+        async with self._get_platform_semaphore(platform):
+            try:
+                return await self.crawl_platform(platform, market, limit)
+            except Exception as e:
+                log.error(f"Error crawling {platform}" + (f" (market: {market})" if market else "") + f": {e}")
+                return {"platform": platform, "market": market, "error": str(e)}
+    
+    def _remember_hashes(self, content_hashes):
+        """Record content hashes as stored, evicting the oldest beyond the cap."""
+        for content_hash in content_hashes:
+            self._known_hashes.pop(content_hash, None)
+            self._known_hashes[content_hash] = None
+        while len(self._known_hashes) > self.MAX_KNOWN_HASHES:
+            del self._known_hashes[next(iter(self._known_hashes))]
+    
     def get_crawler(self, platform: str, market: Optional[str] = None):
         """
         Get crawler instance for specific platform and market.
         
+        Crawlers are created once per (platform, market) and reused, so API
+        clients and configuration are not rebuilt for every crawl or post.
+        
         Args:
             platform: Platform name (reddit, quora, etc.)
             market: Market segment name
@@ -31,13 +82,54 @@ class CrawlerManager:
         Returns:
             Crawler instance or None
         """
+        key = (platform, market)
+        crawler = self._crawlers.get(key)
+        if crawler is not None:
+            return crawler
+        
         if platform == "reddit":
-            return RedditCrawler(market_name=market)
+            crawler = RedditCrawler(market_name=market)
         elif platform == "quora":
-            return QuoraCrawler(market_name=market)
+            crawler = QuoraCrawler(market_name=market)
         else:
             log.error(f"Unknown platform: {platform}")
             return None
+        
+        self._crawlers[key] = crawler
+        return crawler
+    
+    async def aclose(self):
+        """Close the crawlers' HTTP clients and Selenium drivers and drop the cached crawlers."""
+        for crawler in self._crawlers.values():
+            if isinstance(crawler, QuoraCrawler):
+                await crawler.aclose()
+        self._crawlers.clear()
+    
+    def close(self):
+        """Run aclose() from synchronous code with no running event loop (e.g. CLI teardown)."""
+        if self._crawlers:
+            asyncio.run(self.aclose())
+    
+    async def post_responses(self, platform: str, items: List[Tuple[str, str]]) -> List[bool]:
+        """
+        Post a batch of responses to one platform using a single crawler session.
+        
+        Args:
+            platform: Platform name (reddit, quora)
+            items: List of (question_url, response_text) tuples
+            
+        Returns:
+            Success flag for each item, in order
+        """
+        if not items:
+            return []
+        
+        crawler = self.get_crawler(platform)
+        if not crawler:
+            return [False] * len(items)
+        
+        log.info(f"Posting {len(items)} responses to {platform}")
+        return await crawler.post_responses(items)
     
     async def crawl_market(self, market: str, limit: int = 100) -> Dict[str, any]:
         """
@@ -57,14 +149,17 @@ class CrawlerManager:
         
         log.info(f"Starting market crawl for '{market}' across {len(market_config.platforms)} platforms")
         
-        results = []
+        # Crawl the market's platforms concurrently
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(self._crawl_with_semaphore(platform, market, limit))
+                for platform in market_config.platforms
+            ]
+        results = [task.result() for task in tasks]
+        
         total_stored = 0
         total_found = 0
-        
-        for platform in market_config.platforms:
-            result = await self.crawl_platform(platform, market, limit)
-            results.append(result)
-            
+        for result in results:
             if 'items_stored' in result:
                 total_stored += result['items_stored']
             if 'items_found' in result:
@@ -79,6 +174,73 @@ class CrawlerManager:
             "platforms": results
         }
     
+    async def _store_questions(self, platform: str, questions: List[QuestionCreate]) -> Tuple[int, int]:
+        """
+        Store a batch of crawled questions, skipping duplicates.
+        
+        Args:
+            platform: Platform name
+            questions: Crawled questions
+            
+        Returns:
+            Tuple of (stored count, duplicate count)
+        """
+        # Check the whole batch for duplicates by post_id and content hash
+        content_hashes = [self.deduplicator.generate_content_hash(q.content) for q in questions]
+        # Repeated cards on a page are only sent to the database once
+        post_ids = list(dict.fromkeys(q.post_id for q in questions))
+        # Posts recorded by earlier crawls (in any process) skip the database lookup
+        existing_post_ids = await asyncio.to_thread(seen_post_filter.seen, platform, post_ids)
+        existing_post_ids |= await db_client.get_existing_post_ids(
+            platform, [post_id for post_id in post_ids if post_id not in existing_post_ids]
+        )
+        known_post_ids = set(existing_post_ids)
+        # Only hashes not already known to be stored need a database lookup
+        unknown_hashes = [h for h in set(content_hashes) if h not in self._known_hashes]
+        seen_hashes = await asyncio.to_thread(seen_post_filter.seen, seen_post_filter.CONTENT_HASHES, unknown_hashes)
+        stored_hashes = await db_client.get_existing_content_hashes(
+            [h for h in unknown_hashes if h not in seen_hashes]
+        )
+        existing_hashes = stored_hashes | seen_hashes
+        self._remember_hashes(existing_hashes)
+        existing_hashes.update(h for h in content_hashes if h in self._known_hashes)
+        
+        new_questions = []
+        new_hashes = []
+        for question, content_hash in zip(questions, content_hashes):
+            if question.post_id in existing_post_ids:
+                log.debug(f"Duplicate question found: {question.post_id}")
+                continue
+            if content_hash in existing_hashes:
+                log.debug(f"Duplicate content found: {question.title[:50]}")
+                continue
+            
+            # Also skip repeats within this batch
+            existing_post_ids.add(question.post_id)
+            existing_hashes.add(content_hash)
+            new_questions.append(question)
+            new_hashes.append(content_hash)
+        
+        duplicate_count = len(questions) - len(new_questions)
+        
+        # Store new questions in one insert
+        stored_count = await db_client.create_questions(new_questions, new_hashes)
+        if stored_count:
+            self._remember_hashes(new_hashes)
+        
+        # Every post in the batch is now stored or a known duplicate, unless the
+        # insert failed: then only posts known to be stored are recorded
+        insert_failed = bool(new_questions) and not stored_count
+        await asyncio.to_thread(
+            seen_post_filter.add, platform, list(known_post_ids) if insert_failed else post_ids
+        )
+        await asyncio.to_thread(
+            seen_post_filter.add, seen_post_filter.CONTENT_HASHES,
+            [*stored_hashes, *(new_hashes if stored_count else [])]
+        )
+        
+        return stored_count, duplicate_count
+    
     async def crawl_platform(self, platform: str, market: Optional[str] = None, limit: int = 100) -> Dict[str, any]:
         """
         Crawl a specific platform for a specific market.
@@ -95,7 +257,9 @@ class CrawlerManager:
         if not crawler:
             return {"error": f"Unknown platform: {platform}"}
         
-        started_at = datetime.utcnow()
+        started_at = utc_now()
+        # Duration comes from the monotonic clock, unaffected by wall-clock adjustments
+        started = time.monotonic()
         
         # Create crawl log
         log_entry = CrawlLog(
@@ -108,44 +272,37 @@ class CrawlerManager:
         )
         
         try:
-            # Fetch questions
             log.info(f"Starting crawl for {platform}" + (f" (market: {market})" if market else ""))
-            questions = await crawler.crawl(limit)
             
-            log_entry.items_found = len(questions)
+            # Store each batch while the crawler keeps fetching the next one
+            batches: asyncio.Queue = asyncio.Queue(maxsize=2)
+            
+            async def produce():
+                try:
+                    async for batch in crawler.iter_question_batches(limit):
+                        await batches.put(batch)
+                finally:
+                    await batches.put(None)
             
-            # Store questions in database
+            found_count = 0
             stored_count = 0
             duplicate_count = 0
+            producer = asyncio.create_task(produce())
+            try:
+                while (questions := await batches.get()) is not None:
+                    found_count += len(questions)
+                    stored, duplicates = await self._store_questions(platform, questions)
+                    stored_count += stored
+                    duplicate_count += duplicates
+            except BaseException:
+                producer.cancel()
+                raise
+            # Surface any crawler error
+            await producer
             
-            for question in questions:
-                # Check for duplicates by post_id
-                exists = await db_client.check_question_exists(
-                    question.platform.value,
-                    question.post_id
-                )
-                
-                if exists:
-                    duplicate_count += 1
-                    log.debug(f"Duplicate question found: {question.post_id}")
-                    continue
-                
-                # Generate and check content hash
-                content_hash = self.deduplicator.generate_content_hash(question.content)
-                hash_exists = await db_client.check_content_hash_exists(content_hash)
-                
-                if hash_exists:
-                    duplicate_count += 1
-                    log.debug(f"Duplicate content found: {question.title[:50]}")
-                    continue
-                
-                # Store question
-                stored_question = await db_client.create_question(question)
-                if stored_question:
-                    stored_count += 1
-            
+            log_entry.items_found = found_count
             log_entry.items_stored = stored_count
-            log_entry.completed_at = datetime.utcnow()
+            log_entry.completed_at = utc_now()
             
             # Save crawl log
             await db_client.create_crawl_log(log_entry)
@@ -156,10 +313,10 @@ class CrawlerManager:
             return {
                 "platform": platform,
                 "market": market,
-                "items_found": len(questions),
+                "items_found": found_count,
                 "items_stored": stored_count,
                 "duplicates": duplicate_count,
-                "duration_seconds": (log_entry.completed_at - started_at).total_seconds()
+                "duration_seconds": time.monotonic() - started
             }
             
         except Exception as e:
@@ -167,7 +324,7 @@ class CrawlerManager:
             
             log_entry.status = CrawlStatus.FAILURE
             log_entry.error_message = str(e)
-            log_entry.completed_at = datetime.utcnow()
+            log_entry.completed_at = utc_now()
             
             await db_client.create_crawl_log(log_entry)
             
@@ -187,14 +344,11 @@ class CrawlerManager:
         Returns:
             List of crawl results per market
         """
-        markets = get_all_markets()
-        results = []
+        # Markets run concurrently; per-platform semaphores bound the load on each platform
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(self.crawl_market(market, limit)) for market in get_all_markets()]
         
-        for market in markets:
-            result = await self.crawl_market(market, limit)
-            results.append(result)
-        
-        return results
+        return [task.result() for task in tasks]
     
     async def crawl_all_platforms(self, limit: int = 100) -> List[Dict[str, any]]:
         """
@@ -206,14 +360,13 @@ class CrawlerManager:
         Returns:
             List of crawl results
         """
-        results = []
-        platforms = ["reddit", "quora"]
-        
-        for platform in platforms:
-            result = await self.crawl_platform(platform, market=None, limit=limit)
-            results.append(result)
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(self._crawl_with_semaphore(platform, None, limit))
+                for platform in self.PLATFORMS
+            ]
         
-        return results
+        return [task.result() for task in tasks]
 
 
 # Global instance
@@ -1,27 +1,50 @@
 """
-Quora-specific crawler implementation using Selenium with multi-market support.
-Note: Quora doesn't have an official API, so we use web scraping with Selenium.
+Quora-specific crawler implementation with multi-market support.
+Note: Quora doesn't have an official API, so topic pages are scraped over HTTP
+and answers are posted through Selenium.
 """
-from typing import List, Optional
-from datetime import datetime
-import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+import asyncio
+import re
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Tuple
+from urllib.parse import urljoin
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
 from backend.crawler.base_crawler import BaseCrawler
-from backend.database.models import QuestionCreate, Comment, PlatformEnum
+from backend.database.models import QuestionCreate, Comment, PlatformEnum, utc_now
 from backend.config.settings import settings
 from backend.config.markets import get_market_config
 from backend.utils.logger import log
 from backend.utils.deduplicator import Deduplicator
+from backend.utils.loop_clients import close_on_loop
+
+
+# Anchors with an href, the only elements question extraction looks at
+_LINK_STRAINER = SoupStrainer("a", href=True)
+
+
+@lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """Resolve (and download if needed) the ChromeDriver binary once per process."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+# Topics relevant to AI video generation, matched at word starts ("ai" only as a whole word)
+_RELEVANT_QUESTION_PATTERN = re.compile(
+    r"\b(?:ai\b|artificial intelligence|video|generate|create|machine learning"
+    r"|deep learning|animation|editing)",
+    re.IGNORECASE
+)
 
 
 class QuoraCrawler(BaseCrawler):
-    """Crawler for Quora platform using Selenium with market-specific configuration."""
+    """Crawler for Quora platform with market-specific configuration (Selenium is used for posting)."""
+    
+    BASE_URL = "https://www.quora.com"
+    USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    # Topic pages fetched at once
+    TOPIC_CONCURRENCY = 4
     
     def __init__(self, market_name: Optional[str] = None):
         """
@@ -35,29 +58,49 @@ class QuoraCrawler(BaseCrawler):
         self.market_name = market_name
         self.market_config = None
         self.driver = None
+        self._driver_lock: Optional[asyncio.Lock] = None
+        self._driver_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_client_loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Load market configuration if specified
         if market_name:
             self.market_config = get_market_config(market_name)
             if self.market_config and self.market_config.quora:
-                self.topics = self.market_config.quora.topics or []
-                self.keywords = self.market_config.quora.keywords or []
+                self.topics = self.market_config.quora.topics
+                self.keywords = self.market_config.quora.keyword_set
                 log.info(f"Quora crawler initialized for market '{market_name}' with topics: {self.topics}")
             else:
                 log.warning(f"No Quora config found for market '{market_name}', using defaults")
                 self._use_defaults()
         else:
             self._use_defaults()
+        
+        # Topic page paths, built once for the crawler's lifetime
+        self.topic_paths = [f"/topic/{topic.replace(' ', '-')}" for topic in self.topics]
     
     def _use_defaults(self):
         """Use default configuration from settings."""
         self.topics = [t.strip() for t in settings.quora_topics.split(',')]
-        self.keywords = []
+        self.keywords = frozenset()
         log.info(f"Quora crawler initialized with default topics: {self.topics}")
     
+    def _get_driver_lock(self) -> asyncio.Lock:
+        """Get the lock serializing WebDriver sessions on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._driver_lock is None or self._driver_lock_loop is not loop:
+            self._driver_lock = asyncio.Lock()
+            self._driver_lock_loop = loop
+        return self._driver_lock
+    
     def _init_driver(self):
         """Initialize Selenium WebDriver."""
         if self.driver is None:
+            # Selenium is only needed for posting; import it on first use
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            from selenium.webdriver.chrome.service import Service
+            
             chrome_options = Options()
             chrome_options.add_argument("--headless")  # Run in background
             chrome_options.add_argument("--no-sandbox")
@@ -66,7 +109,7 @@ class QuoraCrawler(BaseCrawler):
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
-            service = Service(ChromeDriverManager().install())
+            service = Service(_chromedriver_path())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             
             log.info("Selenium WebDriver initialized")
@@ -77,10 +120,47 @@ class QuoraCrawler(BaseCrawler):
             self.driver.quit()
             self.driver = None
     
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get the HTTP client for topic pages, rebuilt if the event loop changed.
+        
+        A client replaced after a loop change is closed on its own loop.
+        
+        Returns:
+            Shared httpx.AsyncClient instance
+        """
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_client.is_closed or self._http_client_loop is not loop:
+            if self._http_client is not None and not self._http_client.is_closed:
+                close_on_loop(self._http_client_loop, self._http_client.aclose)
+            self._http_client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                headers={"User-Agent": self.USER_AGENT},
+                timeout=15.0,
+                follow_redirects=True,
+                http2=True
+            )
+            self._http_client_loop = loop
+        return self._http_client
+    
+    async def aclose(self):
+        """Close the topic-page HTTP client and the Selenium WebDriver."""
+        if self._http_client is not None and not self._http_client.is_closed:
+            if self._http_client_loop is asyncio.get_running_loop():
+                await self._http_client.aclose()
+            else:
+                close_on_loop(self._http_client_loop, self._http_client.aclose)
+        self._http_client = None
+        self._http_client_loop = None
+        self._close_driver()
+    
     async def fetch_questions(self, limit: int = 100) -> List[QuestionCreate]:
         """
         Fetch questions from Quora topics.
         
+        Topic pages are fetched concurrently over HTTP and parsed without a
+        browser; Selenium is only used for posting.
+        
         Note: This is a simplified implementation. Quora's structure changes frequently,
         and you may need to update selectors.
         
@@ -90,72 +170,88 @@ class QuoraCrawler(BaseCrawler):
         Returns:
             List of QuestionCreate objects
         """
-        all_questions = []
+        return [
+            question
+            async for batch in self.iter_question_batches(limit)
+            for question in batch
+        ]
+    
+    async def iter_question_batches(self, limit: int = 100) -> AsyncIterator[List[QuestionCreate]]:
+        """
+        Fetch topic pages concurrently and yield each topic's questions as it completes.
         
-        try:
-            self._init_driver()
+        Args:
+            limit: Maximum number of questions to fetch per topic
             
-            for topic in self.topics:
+        Yields:
+            List of QuestionCreate objects for each topic
+        """
+        client = await self._get_http_client()
+        semaphore = asyncio.Semaphore(self.TOPIC_CONCURRENCY)
+        
+        async def fetch_topic(topic: str, path: str) -> List[QuestionCreate]:
+            async with semaphore:
                 try:
-                    self._wait_for_rate_limit()
+                    await self._wait_for_rate_limit()
                     
-                    # Navigate to topic page
-                    topic_url = f"https://www.quora.com/topic/{topic.replace(' ', '-')}"
                     log.info(f"Fetching from Quora topic: {topic}")
+                    response = await client.get(path)
+                    response.raise_for_status()
                     
-                    self.driver.get(topic_url)
-                    time.sleep(3)  # Wait for page load
-                    
-                    # Scroll to load more questions
-                    for _ in range(3):
-                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(2)
-                    
-                    # Find question elements (selectors may need updating)
-                    # This is a simplified version - Quora's actual structure is more complex
-                    questions = self._extract_questions_from_page()
-                    
-                    all_questions.extend(questions[:limit])
+                    # Parse off the event loop; topic pages are large
+                    questions = await asyncio.to_thread(
+                        self._extract_questions_from_html, response.text, str(response.url)
+                    )
                     log.info(f"Fetched {len(questions)} questions from topic: {topic}")
+                    return questions[:limit]
                     
                 except Exception as e:
                     log.error(f"Error fetching from Quora topic {topic}: {e}")
-                    continue
-            
-        finally:
-            self._close_driver()
+                    return []
         
-        return all_questions
+        tasks = [
+            asyncio.ensure_future(fetch_topic(topic, path))
+            for topic, path in zip(self.topics, self.topic_paths)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                questions = await next_done
+                if questions:
+                    yield questions
+        finally:
+            # Stop outstanding fetches if the consumer gives up early
+            for task in tasks:
+                task.cancel()
     
-    def _extract_questions_from_page(self) -> List[QuestionCreate]:
+    def _extract_questions_from_html(self, html: str, page_url: str) -> List[QuestionCreate]:
         """
-        Extract questions from current Quora page.
+        Extract questions from a Quora topic page.
         
         Note: Quora's HTML structure changes frequently. This is a template implementation.
         You'll need to inspect the actual page and update selectors.
         
+        Args:
+            html: Page HTML
+            page_url: URL the page was served from (for resolving relative links)
+        
         Returns:
             List of QuestionCreate objects
         """
         questions = []
         
         try:
-            # Wait for questions to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "a"))
-            )
+            # Only build tree nodes for links; the rest of the page is skipped
+            soup = BeautifulSoup(html, "html.parser", parse_only=_LINK_STRAINER)
             
             # Find question links (selector needs to be updated based on actual Quora structure)
             # This is a placeholder - actual implementation requires inspecting Quora's DOM
-            question_elements = self.driver.find_elements(By.XPATH, "//a[contains(@href, '/')]")
-            
-            for elem in question_elements:
+            for elem in soup.find_all("a"):
                 try:
-                    question_text = elem.text.strip()
-                    question_url = elem.get_attribute('href')
+                    question_text = elem.get_text(" ", strip=True)
+                    question_url = urljoin(page_url, elem["href"])
                     
                     # Filter for actual questions
-                    if not question_text or not question_url or '?' not in question_text:
+                    if not question_text or '?' not in question_text:
                         continue
                     
                     # Filter for relevant content
@@ -165,9 +261,6 @@ class QuoraCrawler(BaseCrawler):
                     # Extract question ID from URL
                     post_id = self.deduplicator.extract_platform_id(question_url, "quora") or question_url.split('/')[-1]
                     
-                    # Generate content hash
-                    content_hash = self.deduplicator.generate_content_hash(question_text)
-                    
                     question = QuestionCreate(
                         platform=PlatformEnum.QUORA,
                         post_id=post_id,
@@ -178,7 +271,7 @@ class QuoraCrawler(BaseCrawler):
                         market=self.market_name or "general_video",  # Default market if not specified
                         tags=[],
                         upvotes=0,  # Requires additional scraping
-                        created_at=datetime.utcnow()  # Actual date requires additional scraping
+                        created_at=utc_now()  # Actual date requires additional scraping
                     )
                     
                     questions.append(question)
@@ -202,13 +295,7 @@ class QuoraCrawler(BaseCrawler):
         Returns:
             True if relevant
         """
-        relevant_keywords = [
-            'ai', 'artificial intelligence', 'video', 'generate', 'create',
-            'machine learning', 'deep learning', 'animation', 'editing'
-        ]
-        
-        text_lower = question_text.lower()
-        return any(keyword in text_lower for keyword in relevant_keywords)
+        return _RELEVANT_QUESTION_PATTERN.search(question_text) is not None
     
     async def fetch_comments(self, question_url: str) -> List[Comment]:
         """
@@ -224,11 +311,9 @@ class QuoraCrawler(BaseCrawler):
         log.warning("Quora comment fetching not fully implemented")
         return []
     
-    async def post_response(self, question_url: str, response_text: str) -> bool:
+    async def _post_answer(self, question_url: str, response_text: str) -> bool:
         """
-        Post an answer to a Quora question.
-        
-        Note: Requires authentication and careful implementation to avoid bot detection.
+        Post an answer using the already-started WebDriver.
         
         Args:
             question_url: URL of the Quora question
@@ -238,12 +323,11 @@ class QuoraCrawler(BaseCrawler):
             True if successful, False otherwise
         """
         try:
-            self._init_driver()
-            self._wait_for_rate_limit()
+            await self._wait_for_rate_limit()
             
             # Navigate to question
-            self.driver.get(question_url)
-            time.sleep(2)
+            await asyncio.to_thread(self.driver.get, question_url)
+            await asyncio.sleep(2)
             
             # This requires authentication and finding the answer box
             # Placeholder implementation
@@ -254,6 +338,49 @@ class QuoraCrawler(BaseCrawler):
         except Exception as e:
             log.error(f"Error posting to Quora: {e}")
             return False
-        finally:
-            self._close_driver()
+    
+    async def post_response(self, question_url: str, response_text: str) -> bool:
+        """
+        Post an answer to a Quora question.
+        
+        Note: Requires authentication and careful implementation to avoid bot detection.
+        
+        Args:
+            question_url: URL of the Quora question
+            response_text: Answer text to post
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        results = await self.post_responses([(question_url, response_text)])
+        return results[0]
+    
+    async def post_responses(self, items: List[Tuple[str, str]]) -> List[bool]:
+        """
+        Post several answers in one WebDriver session.
+        
+        Chrome is started once for the batch rather than once per answer.
+        
+        Args:
+            items: List of (question_url, response_text) tuples
+            
+        Returns:
+            Success flag for each item, in order
+        """
+        async with self._get_driver_lock():
+            try:
+                # Driver startup and shutdown block for seconds; keep them off the loop
+                await asyncio.to_thread(self._init_driver)
+            except Exception as e:
+                log.error(f"Error starting WebDriver for Quora posting: {e}")
+                await asyncio.to_thread(self._close_driver)
+                return [False] * len(items)
+            
+            try:
+                return [
+                    await self._post_answer(question_url, response_text)
+                    for question_url, response_text in items
+                ]
+            finally:
+                await asyncio.to_thread(self._close_driver)
 
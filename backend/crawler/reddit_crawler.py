@@ -1,8 +1,11 @@
 """
 Reddit-specific crawler implementation using PRAW with multi-market support.
 """
-from typing import List, Optional
-from datetime import datetime, timedelta
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Iterator, List, Optional
+from datetime import datetime, timedelta, timezone
 import praw
 from praw.models import Submission
 from backend.crawler.base_crawler import BaseCrawler
@@ -11,11 +14,34 @@ from backend.config.settings import settings
 from backend.config.markets import get_market_config, MarketConfig
 from backend.utils.logger import log
 from backend.utils.deduplicator import Deduplicator
+from backend.utils.seen_posts import seen_post_filter
+
+
+# PRAW clients aren't thread-safe, so each thread gets its own
+_local = threading.local()
+
+
+def _reddit_client() -> praw.Reddit:
+    """Get this thread's PRAW client, creating it once so every market's crawler reuses its session."""
+    reddit = getattr(_local, "reddit", None)
+    if reddit is None:
+        reddit = praw.Reddit(
+            client_id=settings.reddit_client_id,
+            client_secret=settings.reddit_client_secret,
+            user_agent=settings.reddit_user_agent,
+            username=settings.reddit_username,
+            password=settings.reddit_password
+        )
+        _local.reddit = reddit
+    return reddit
 
 
 class RedditCrawler(BaseCrawler):
     """Crawler for Reddit platform with market-specific configuration."""
     
+    # Posts this many whole days old or older are skipped
+    MAX_POST_AGE_DAYS = 7
+    
     def __init__(self, market_name: Optional[str] = None):
         """
         Initialize Reddit crawler with PRAW.
@@ -25,15 +51,6 @@ class RedditCrawler(BaseCrawler):
         """
         super().__init__("reddit")
         
-        # Initialize Reddit client
-        self.reddit = praw.Reddit(
-            client_id=settings.reddit_client_id,
-            client_secret=settings.reddit_client_secret,
-            user_agent=settings.reddit_user_agent,
-            username=settings.reddit_username,
-            password=settings.reddit_password
-        )
-        
         self.market_name = market_name
         self.market_config = None
         
@@ -41,10 +58,10 @@ class RedditCrawler(BaseCrawler):
         if market_name:
             self.market_config = get_market_config(market_name)
             if self.market_config and self.market_config.reddit:
-                self.subreddits = self.market_config.reddit.subreddits or []
-                self.keywords = self.market_config.reddit.keywords or []
+                self.subreddits = self.market_config.reddit.subreddits
+                self.keywords = self.market_config.reddit.keyword_set
                 self.min_upvotes = self.market_config.reddit.min_upvotes
-                self.search_queries = self.market_config.reddit.search_queries or []
+                self.search_queries = self.market_config.reddit.search_queries
                 log.info(f"Reddit crawler initialized for market '{market_name}' with {len(self.subreddits)} subreddits")
             else:
                 log.warning(f"No Reddit config found for market '{market_name}', using defaults")
@@ -54,10 +71,15 @@ class RedditCrawler(BaseCrawler):
         
         self.deduplicator = Deduplicator()
     
+    @property
+    def reddit(self) -> praw.Reddit:
+        """Reddit client for the calling thread (fetches run on worker threads)."""
+        return _reddit_client()
+    
     def _use_defaults(self):
         """Use default configuration from settings."""
         self.subreddits = [s.strip() for s in settings.reddit_subreddits.split(',')]
-        self.keywords = ['ai', 'video', 'create', 'generate']
+        self.keywords = frozenset({'ai', 'video', 'create', 'generate'})
         self.min_upvotes = 1
         self.search_queries = []
         log.info(f"Reddit crawler initialized with default subreddits: {self.subreddits}")
@@ -72,61 +94,131 @@ class RedditCrawler(BaseCrawler):
         Returns:
             List of QuestionCreate objects
         """
-        all_questions = []
+        return [
+            question
+            async for batch in self.iter_question_batches(limit)
+            for question in batch
+        ]
+    
+    async def iter_question_batches(self, limit: int = 100) -> AsyncIterator[List[QuestionCreate]]:
+        """
+        Fetch subreddits concurrently and yield each subreddit's questions as it completes.
+        
+        Args:
+            limit: Maximum number of questions to fetch
+            
+        Yields:
+            List of QuestionCreate objects for each subreddit
+        """
+        total = 0
         posts_per_subreddit = limit // max(len(self.subreddits), 1)
+        semaphore = asyncio.Semaphore(max(1, settings.reddit_max_concurrency))
+        
+        async def fetch_subreddit(subreddit_name: str) -> List[QuestionCreate]:
+            async with semaphore:
+                try:
+                    # PRAW is blocking, keep it off the event loop
+                    return await asyncio.to_thread(
+                        self._fetch_one_subreddit, subreddit_name, posts_per_subreddit
+                    )
+                except Exception as e:
+                    log.error(f"Error fetching from r/{subreddit_name}: {e}")
+                    return []
+        
+        tasks = [
+            asyncio.ensure_future(fetch_subreddit(subreddit_name))
+            for subreddit_name in self.subreddits
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                batch = await next_done
+                if batch:
+                    total += len(batch)
+                    yield batch
+        finally:
+            # Stop outstanding fetches if the consumer gives up early
+            for task in tasks:
+                task.cancel()
         
-        for subreddit_name in self.subreddits:
+        log.info(f"Total questions fetched for market '{self.market_name}': {total}")
+    
+    def _iter_listings(self, subreddit, posts_per_subreddit: int) -> Iterator[List[Submission]]:
+        """
+        Fetch a subreddit's listings one request at a time (blocking PRAW calls).
+        
+        Args:
+            subreddit: PRAW Subreddit object
+            posts_per_subreddit: Maximum number of questions wanted
+            
+        Yields:
+            List of submissions from each listing
+        """
+        # Strategy 1: Get new posts and filter
+        self.rate_limiter.wait_if_needed(self.platform_name)
+        yield list(subreddit.new(limit=posts_per_subreddit * 2))
+        
+        # Strategy 2: Search with keywords if available
+        for query in self.search_queries:
             try:
-                self._wait_for_rate_limit()
-                
-                subreddit = self.reddit.subreddit(subreddit_name)
-                log.info(f"Fetching from r/{subreddit_name} for market '{self.market_name}'")
-                
-                # Strategy 1: Get new posts and filter
-                new_posts = list(subreddit.new(limit=posts_per_subreddit * 2))
-                
-                # Strategy 2: Search with keywords if available
-                if self.search_queries:
-                    for query in self.search_queries:
-                        try:
-                            self._wait_for_rate_limit()
-                            search_results = list(subreddit.search(
-                                query, 
-                                time_filter='week',
-                                limit=min(20, posts_per_subreddit)
-                            ))
-                            new_posts.extend(search_results)
-                        except Exception as e:
-                            log.error(f"Error searching '{query}' in r/{subreddit_name}: {e}")
-                
+                self.rate_limiter.wait_if_needed(self.platform_name)
+                results = list(subreddit.search(
+                    query, 
+                    time_filter='week',
+                    limit=min(20, posts_per_subreddit)
+                ))
+            except Exception as e:
+                log.error(f"Error searching '{query}' in r/{subreddit.display_name}: {e}")
+                continue
+            yield results
+    
+    def _fetch_one_subreddit(self, subreddit_name: str, posts_per_subreddit: int) -> List[QuestionCreate]:
+        """
+        Fetch and filter questions from one subreddit (blocking PRAW calls).
+        
+        Listings are filtered as they arrive, and remaining searches are
+        skipped once enough relevant questions have been found.
+        
+        Args:
+            subreddit_name: Subreddit to fetch from
+            posts_per_subreddit: Maximum number of questions to return
+            
+        Returns:
+            List of QuestionCreate objects
+        """
+        if posts_per_subreddit <= 0:
+            return []
+        
+        subreddit = self.reddit.subreddit(subreddit_name)
+        log.info(f"Fetching from r/{subreddit_name} for market '{self.market_name}'")
+        
+        age_cutoff = self._age_cutoff()
+        seen_ids = set()
+        batch = []
+        for posts in self._iter_listings(subreddit, posts_per_subreddit):
+            # Skip posts stored by earlier crawls
+            seen_ids.update(seen_post_filter.seen(self.platform_name, (post.id for post in posts)))
+            
+            for submission in posts:
                 # Deduplicate by post ID
-                seen_ids = set()
-                unique_posts = []
-                for post in new_posts:
-                    if post.id not in seen_ids:
-                        seen_ids.add(post.id)
-                        unique_posts.append(post)
+                if submission.id in seen_ids:
+                    continue
+                seen_ids.add(submission.id)
                 
-                # Filter and convert posts
-                for submission in unique_posts[:posts_per_subreddit]:
-                    try:
-                        # Filter for relevant posts
-                        if self._is_relevant(submission):
-                            question = self._submission_to_question(submission)
-                            all_questions.append(question)
-                    
-                    except Exception as e:
-                        log.error(f"Error processing submission {submission.id}: {e}")
-                        continue
+                try:
+                    # Filter for relevant posts
+                    if self._is_relevant(submission, age_cutoff):
+                        batch.append(self._submission_to_question(submission))
                 
-                log.info(f"Fetched {len([q for q in all_questions if q.url.startswith('https://reddit.com')])} questions from r/{subreddit_name}")
+                except Exception as e:
+                    log.error(f"Error processing submission {submission.id}: {e}")
+                    continue
                 
-            except Exception as e:
-                log.error(f"Error fetching from r/{subreddit_name}: {e}")
-                continue
+                if len(batch) >= posts_per_subreddit:
+                    log.info(f"Fetched {len(batch)} questions from r/{subreddit_name}")
+                    return batch
         
-        log.info(f"Total questions fetched for market '{self.market_name}': {len(all_questions)}")
-        return all_questions
+        log.info(f"Fetched {len(batch)} questions from r/{subreddit_name}")
+        return batch
     
     async def fetch_comments(self, question_url: str) -> List[Comment]:
         """
@@ -139,27 +231,10 @@ class RedditCrawler(BaseCrawler):
             List of Comment objects
         """
         try:
-            self._wait_for_rate_limit()
-            
-            submission = self.reddit.submission(url=question_url)
-            submission.comments.replace_more(limit=0)  # Flatten comment tree
-            
-            comments = []
-            for comment in submission.comments.list():
-                try:
-                    comments.append(Comment(
-                        question_id=None,  # Will be set when storing
-                        comment_id=comment.id,
-                        content=comment.body,
-                        author=str(comment.author) if comment.author else '[deleted]',
-                        upvotes=comment.score,
-                        created_at=datetime.fromtimestamp(comment.created_utc)
-                    ))
-                except Exception as e:
-                    log.error(f"Error processing comment: {e}")
-                    continue
+            await self._wait_for_rate_limit()
             
-            return comments
+            # Loading and converting large comment trees both stay off the event loop
+            return await asyncio.to_thread(self._load_comments, question_url)
             
         except Exception as e:
             log.error(f"Error fetching comments from {question_url}: {e}")
@@ -177,10 +252,9 @@ class RedditCrawler(BaseCrawler):
             True if successful, False otherwise
         """
         try:
-            self._wait_for_rate_limit()
+            await self._wait_for_rate_limit()
             
-            submission = self.reddit.submission(url=question_url)
-            comment = submission.reply(response_text)
+            comment = await asyncio.to_thread(self._reply, question_url, response_text)
             
             log.info(f"Posted response to {question_url}: comment ID {comment.id}")
             return True
@@ -189,43 +263,63 @@ class RedditCrawler(BaseCrawler):
             log.error(f"Error posting response to {question_url}: {e}")
             return False
     
-    def _is_relevant(self, submission: Submission) -> bool:
+    def _load_comments(self, question_url: str) -> List[Comment]:
+        """Fetch, flatten and convert a post's comment tree (blocking PRAW call)."""
+        submission = self.reddit.submission(url=question_url)
+        submission.comments.replace_more(limit=0)  # Flatten comment tree
+        
+        comments = []
+        for comment in submission.comments.list():
+            try:
+                comments.append(Comment(
+                    question_id=None,  # Will be set when storing
+                    comment_id=comment.id,
+                    content=comment.body,
+                    author=str(comment.author) if comment.author else '[deleted]',
+                    upvotes=comment.score,
+                    created_at=datetime.fromtimestamp(comment.created_utc, tz=timezone.utc)
+                ))
+            except Exception as e:
+                log.error(f"Error processing comment: {e}")
+                continue
+        
+        return comments
+    
+    def _reply(self, question_url: str, response_text: str):
+        """Reply to a post (blocking PRAW call)."""
+        submission = self.reddit.submission(url=question_url)
+        return submission.reply(response_text)
+    
+    def _age_cutoff(self) -> float:
+        """Epoch timestamp at or before which a post is too old."""
+        return time.time() - (self.MAX_POST_AGE_DAYS + 1) * 86400
+    
+    def _is_relevant(self, submission: Submission, age_cutoff: Optional[float] = None) -> bool:
         """
         Determine if a submission is relevant based on market keywords.
         
         Args:
             submission: PRAW Submission object
+            age_cutoff: Precomputed _age_cutoff() to reuse across a listing
             
         Returns:
             True if submission is relevant to the market
         """
         # Check age - only recent posts (last 7 days)
-        post_age_days = (datetime.utcnow() - datetime.fromtimestamp(submission.created_utc)).days
-        if post_age_days > 7:
+        if submission.created_utc <= (age_cutoff if age_cutoff is not None else self._age_cutoff()):
             return False
         
         # Check minimum upvotes
         if submission.score < self.min_upvotes:
             return False
         
-        # Check for question markers (optional but preferred)
-        title_lower = submission.title.lower()
-        content = (submission.title + ' ' + submission.selftext).lower()
-        
-        # Must contain at least one market keyword
+        # Must contain at least one market keyword. Question markers are not
+        # required, so statements of pain/need that aren't explicitly
+        # questions are kept too.
         if self.keywords:
-            has_keyword = any(keyword.lower() in content for keyword in self.keywords)
-            if not has_keyword:
-                return False
+            content = (submission.title + ' ' + submission.selftext).lower()
+            return any(keyword in content for keyword in self.keywords)
         
-        # Bonus: contains question marker
-        question_markers = ['?', 'how ', 'what ', 'why ', 'when ', 'where ', 'who ', 
-                           'can i', 'can you', 'should i', 'is it', 'are there',
-                           'looking for', 'need help', 'recommendations', 'suggestions']
-        has_question = any(marker in content for marker in question_markers)
-        
-        # Posts with questions get priority but not required
-        # This allows for statements of pain/need that aren't explicitly questions
         return True
     
     def _submission_to_question(self, submission: Submission) -> QuestionCreate:
@@ -249,9 +343,6 @@ class RedditCrawler(BaseCrawler):
         # Get content
         content = submission.selftext if submission.selftext else submission.title
         
-        # Generate content hash for deduplication
-        content_hash = self.deduplicator.generate_content_hash(content)
-        
         return QuestionCreate(
             platform=PlatformEnum.REDDIT,
             post_id=submission.id,
@@ -262,5 +353,5 @@ class RedditCrawler(BaseCrawler):
             market=self.market_name or "general_video",  # Default market if not specified
             tags=tags,
             upvotes=submission.score,
-            created_at=datetime.fromtimestamp(submission.created_utc)
+            created_at=datetime.fromtimestamp(submission.created_utc, tz=timezone.utc)
         )
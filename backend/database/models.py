@@ -1,13 +1,18 @@
 """
 Pydantic models for database entities.
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID, uuid4
 from enum import Enum
 from pydantic import BaseModel, Field
 
 
+def utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
 class PlatformEnum(str, Enum):
     """Supported platforms."""
     REDDIT = "reddit"
@@ -48,8 +53,9 @@ class Question(BaseModel):
     upvotes: int = 0
     status: QuestionStatus = QuestionStatus.PENDING
     content_hash: Optional[str] = None
+    attempts: int = 0  # Processing claims taken so far (see claim_pending_questions)
     created_at: datetime
-    crawled_at: datetime = Field(default_factory=datetime.utcnow)
+    crawled_at: datetime = Field(default_factory=utc_now)
     
     class Config:
         json_schema_extra = {
@@ -100,7 +106,7 @@ class AgentResponse(BaseModel):
     response_text: Optional[str] = None
     posted: bool = False
     posted_at: Optional[datetime] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
     error_message: Optional[str] = None
     
     class Config:
@@ -1,38 +1,118 @@
 """
 Supabase client for database operations.
 """
+import asyncio
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from uuid import UUID
+import httpx
 from supabase import create_client, Client
 from backend.config.settings import settings
 from backend.database.models import (
     Question, Comment, AgentResponse, CrawlLog,
-    QuestionCreate, QuestionStatus, CrawlStatus
+    QuestionCreate, QuestionStatus, CrawlStatus, utc_now
 )
 from backend.utils.logger import log
+from backend.utils.response_cache import agent_response_cache
 
 
 class SupabaseClient:
     """Handle all Supabase database operations."""
     
+    # Question columns for listings that don't show the post body
+    QUESTION_SUMMARY_COLUMNS = (
+        'id, platform, post_id, title, author, url, market, upvotes, status, created_at, crawled_at'
+    )
+    
     def __init__(self):
         """Initialize Supabase client."""
         self.client: Client = create_client(
             settings.supabase_url,
             settings.supabase_key
         )
+        self._configure_connection_pool()
+    
+    def _configure_connection_pool(self):
+        """
+        Give the PostgREST session an explicit keep-alive pool.
+        
+        supabase-py creates one sync httpx session per client and reuses it
+        for every table call; this replaces it with an identical HTTP/2 session
+        whose pool limits come from settings, so connections (and their TLS
+        handshakes) are reused for the whole process. Idle connections are
+        kept for SUPABASE_KEEPALIVE_EXPIRY seconds so they survive the gaps
+        between Celery tasks instead of httpx's 5 second default.
+        """
+        postgrest = self.client.postgrest
+        session = postgrest.session
+        postgrest.session = type(session)(
+            base_url=session.base_url,
+            headers=session.headers,
+            timeout=session.timeout,
+            limits=httpx.Limits(
+                max_connections=settings.supabase_max_connections,
+                max_keepalive_connections=settings.supabase_max_connections,
+                keepalive_expiry=settings.supabase_keepalive_expiry
+            ),
+            http2=True  # Falls back to HTTP/1.1 if the server does not negotiate h2
+        )
+        session.close()
+    
+    def close(self):
+        """Close pooled database connections."""
+        self.client.postgrest.session.close()
+    
+    async def _execute(self, query):
+        """
+        Run a PostgREST query in a worker thread.
+        
+        supabase-py's client is synchronous, so calling execute() directly
+        would block the event loop for the whole round trip; off the loop,
+        concurrent queries (e.g. asyncio.gather) overlap on the shared pool.
+        
+        Args:
+            query: Query or RPC builder to execute
+            
+        Returns:
+            PostgREST API response
+        """
+        return await asyncio.to_thread(query.execute)
+    
+    @staticmethod
+    def _returning(query, columns: str):
+        """
+        Limit the rows a write sends back to the given columns.
+        
+        postgrest-py's update builder always asks for the full row and has no
+        select(); PostgREST honours a select param on writes, so callers that
+        only count or key on the result don't download whole rows.
+        
+        Args:
+            query: Insert or update builder
+            columns: Columns to return
+            
+        Returns:
+            The same builder
+        """
+        query.params = query.params.add('select', columns)
+        return query
     
     # Question Operations
     
     async def create_question(self, question: QuestionCreate) -> Optional[Question]:
-        """Create a new question in the database."""
+        """
+        Create a new question in the database.
+        
+        The existence check and insert are one request: a question whose
+        (platform, post_id) is already stored is skipped and None is returned.
+        """
         try:
-            data = question.model_dump()
-            data['created_at'] = data['created_at'].isoformat()
-            data['crawled_at'] = datetime.utcnow().isoformat()
+            data = question.model_dump(mode='json')
+            data['crawled_at'] = utc_now().isoformat()
             
-            result = self.client.table('questions').insert(data).execute()
+            result = await self._execute(self.client.table('questions').upsert(
+                data, on_conflict='platform,post_id', ignore_duplicates=True
+            ))
             
             if result.data:
                 return Question(**result.data[0])
@@ -42,10 +122,46 @@ class SupabaseClient:
             log.error(f"Error creating question: {e}")
             return None
     
+    async def create_questions(self, questions: List[QuestionCreate], content_hashes: List[str]) -> int:
+        """
+        Insert several questions in one request.
+        
+        Rows whose (platform, post_id) is already stored are skipped by the
+        database, so a concurrent crawl storing the same post doesn't fail the
+        whole batch.
+        
+        Args:
+            questions: Questions to insert
+            content_hashes: Content hash for each question, in the same order
+            
+        Returns:
+            Number of questions inserted
+        """
+        if not questions:
+            return 0
+        
+        try:
+            crawled_at = utc_now().isoformat()
+            rows = []
+            for question, content_hash in zip(questions, content_hashes):
+                data = question.model_dump(mode='json')
+                data['crawled_at'] = crawled_at
+                data['content_hash'] = content_hash
+                rows.append(data)
+            
+            result = await self._execute(self.client.table('questions').upsert(
+                rows, on_conflict='platform,post_id', ignore_duplicates=True
+            ))
+            return len(result.data)
+            
+        except Exception as e:
+            log.error(f"Error creating questions: {e}")
+            return 0
+    
     async def get_question(self, question_id: UUID) -> Optional[Question]:
         """Get a question by ID."""
         try:
-            result = self.client.table('questions').select('*').eq('id', str(question_id)).execute()
+            result = await self._execute(self.client.table('questions').select('*').eq('id', str(question_id)))
             
             if result.data:
                 return Question(**result.data[0])
@@ -55,10 +171,59 @@ class SupabaseClient:
             log.error(f"Error getting question: {e}")
             return None
     
-    async def get_questions_by_status(self, status: QuestionStatus, limit: int = 100) -> List[Question]:
-        """Get questions by status."""
+    async def get_question_with_response(
+        self,
+        question_id: UUID
+    ) -> Tuple[Optional[Question], Optional[AgentResponse]]:
+        """
+        Get a question and its agent response in one query.
+        
+        Uses a left-joined `agent_responses` embed, so the question is returned
+        even when no agent response exists yet.
+        
+        Returns:
+            Tuple of (question, agent_response); either may be None
+        """
         try:
-            result = self.client.table('questions').select('*').eq('status', status.value).limit(limit).execute()
+            result = await self._execute(self.client.table('questions').select(
+                '*, agent_responses(*)'
+            ).eq('id', str(question_id)))
+            
+            if not result.data:
+                return None, None
+            
+            row = result.data[0]
+            embedded = row.pop('agent_responses', None)
+            # One-to-one embeds come back as an object, older PostgREST returns a list
+            if isinstance(embedded, list):
+                embedded = embedded[0] if embedded else None
+            agent_response = AgentResponse(**embedded) if embedded else None
+            return Question(**row), agent_response
+            
+        except Exception as e:
+            log.error(f"Error getting question with response: {e}")
+            return None, None
+    
+    async def get_questions_by_status(
+        self,
+        status: QuestionStatus,
+        limit: int = 100,
+        market: Optional[str] = None,
+        after_id: Optional[UUID] = None
+    ) -> List[Question]:
+        """
+        Get questions by status, optionally filtered by market.
+        
+        Results are ordered by ID; pass the last ID of a page as `after_id`
+        to fetch the next one (stable even while statuses change).
+        """
+        try:
+            query = self.client.table('questions').select('*').eq('status', status.value)
+            if market:
+                query = query.eq('market', market)
+            if after_id:
+                query = query.gt('id', str(after_id))
+            result = await self._execute(query.order('id').limit(limit))
             
             return [Question(**q) for q in result.data]
             
@@ -66,10 +231,154 @@ class SupabaseClient:
             log.error(f"Error getting questions by status: {e}")
             return []
     
+    async def get_question_rows(
+        self,
+        status: Optional[QuestionStatus] = None,
+        market: Optional[str] = None,
+        platform: Optional[str] = None,
+        min_score: Optional[float] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after_id: Optional[UUID] = None,
+        columns: str = '*'
+    ) -> List[Dict]:
+        """
+        Get questions as raw rows with optional filters.
+        
+        Rows are returned as stored (no model validation) so list endpoints
+        can serialize them directly. `min_score` filters on the agent
+        response confidence through an inner-joined embed. Results are
+        ordered by ID; pass the last ID of a page as `after_id` to fetch the
+        next one, or use `offset` for simple paging. Pass `columns` (e.g.
+        QUESTION_SUMMARY_COLUMNS) to fetch only part of each row.
+        """
+        try:
+            if min_score is not None:
+                columns = f'{columns}, agent_responses!inner(confidence_score)'
+            query = self.client.table('questions').select(columns)
+            if status:
+                query = query.eq('status', QuestionStatus(status).value)
+            if market:
+                query = query.eq('market', market)
+            if platform:
+                query = query.eq('platform', platform)
+            if min_score is not None:
+                query = query.gte('agent_responses.confidence_score', min_score)
+            if after_id:
+                query = query.gt('id', str(after_id))
+            result = await self._execute(query.order('id').limit(limit).offset(offset))
+            
+            rows = result.data
+            if min_score is not None:
+                for row in rows:
+                    row.pop('agent_responses', None)
+            return rows
+            
+        except Exception as e:
+            log.error(f"Error getting questions: {e}")
+            return []
+    
+    async def get_questions(
+        self,
+        status: Optional[QuestionStatus] = None,
+        market: Optional[str] = None,
+        platform: Optional[str] = None,
+        min_score: Optional[float] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after_id: Optional[UUID] = None
+    ) -> List[Question]:
+        """Get questions with optional filters (see get_question_rows)."""
+        rows = await self.get_question_rows(
+            status=status,
+            market=market,
+            platform=platform,
+            min_score=min_score,
+            limit=limit,
+            offset=offset,
+            after_id=after_id
+        )
+        return [Question(**q) for q in rows]
+    
+    async def get_leads(
+        self,
+        market: str,
+        status: Optional[QuestionStatus] = None,
+        min_score: Optional[float] = None,
+        limit: int = 10,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Get the top-scoring questions for a market from the `questions_with_scores` view.
+        
+        Returns only the columns needed for lead listings (id, title,
+        platform, upvotes, created_at, confidence_score), highest score first.
+        Use `offset` to page through the results.
+        """
+        try:
+            query = self.client.table('questions_with_scores').select(
+                'id, title, platform, upvotes, created_at, confidence_score'
+            ).eq('market', market)
+            if status:
+                query = query.eq('status', QuestionStatus(status).value)
+            if min_score is not None:
+                query = query.gte('confidence_score', min_score)
+            result = await self._execute(query.order('confidence_score.desc,id').limit(limit).offset(offset))
+            
+            return result.data
+            
+        except Exception as e:
+            log.error(f"Error getting leads: {e}")
+            return []
+    
+    async def claim_pending_questions(
+        self,
+        limit: int = 100,
+        market: Optional[str] = None
+    ) -> List[Tuple[Question, AgentResponse]]:
+        """
+        Atomically claim pending questions that have an in-scope agent response.
+        
+        Uses the `claim_pending_questions` function, which marks the rows as
+        claimed in the same statement that selects them, so overlapping runs
+        never pick up the same question. A claim is released when the question
+        is finalized and expires after `question_claim_timeout_seconds`; each
+        claim counts towards `max_post_attempts`.
+        """
+        try:
+            result = await self._execute(self.client.rpc('claim_pending_questions', {
+                'p_limit': limit,
+                'p_market': market,
+                'p_claim_timeout_seconds': settings.question_claim_timeout_seconds,
+                'p_max_attempts': settings.max_post_attempts
+            }))
+            
+            return [
+                (Question(**row['question']), AgentResponse(**row['agent_response']))
+                for row in result.data or []
+            ]
+            
+        except Exception as e:
+            log.error(f"Error claiming pending questions: {e}")
+            return []
+    
+    async def get_untriaged_questions(self, limit: int = 100) -> List[Question]:
+        """Get pending questions that don't have an agent response yet, ordered by ID."""
+        try:
+            result = await self._execute(self.client.rpc('get_untriaged_questions', {'p_limit': limit}))
+            
+            return [Question(**q) for q in result.data or []]
+        
+        except Exception as e:
+            log.error(f"Error getting untriaged questions: {e}")
+            return []
+    
     async def check_question_exists(self, platform: str, post_id: str) -> bool:
         """Check if a question already exists."""
         try:
-            result = self.client.table('questions').select('id').eq('platform', platform).eq('post_id', post_id).execute()
+            result = await self._execute(
+                self.client.table('questions').select('id').eq('platform', platform).eq('post_id', post_id).limit(1)
+            )
             
             return len(result.data) > 0
             
@@ -80,7 +389,9 @@ class SupabaseClient:
     async def check_content_hash_exists(self, content_hash: str) -> bool:
         """Check if content hash exists (for deduplication)."""
         try:
-            result = self.client.table('questions').select('id').eq('content_hash', content_hash).execute()
+            result = await self._execute(
+                self.client.table('questions').select('id').eq('content_hash', content_hash).limit(1)
+            )
             
             return len(result.data) > 0
             
@@ -88,10 +399,61 @@ class SupabaseClient:
             log.error(f"Error checking content hash: {e}")
             return False
     
+    async def get_existing_post_ids(self, platform: str, post_ids: List[str]) -> Set[str]:
+        """
+        Get which of the given post IDs are already stored for a platform.
+        
+        Args:
+            platform: Platform name
+            post_ids: Platform post IDs to check
+            
+        Returns:
+            Set of post IDs that already exist
+        """
+        if not post_ids:
+            return set()
+        
+        try:
+            result = await self._execute(self.client.table('questions').select('post_id').eq(
+                'platform', platform
+            ).in_('post_id', post_ids))
+            
+            return {row['post_id'] for row in result.data}
+            
+        except Exception as e:
+            log.error(f"Error checking existing post IDs: {e}")
+            return set()
+    
+    async def get_existing_content_hashes(self, content_hashes: List[str]) -> Set[str]:
+        """
+        Get which of the given content hashes are already stored.
+        
+        Args:
+            content_hashes: Content hashes to check
+            
+        Returns:
+            Set of content hashes that already exist
+        """
+        if not content_hashes:
+            return set()
+        
+        try:
+            result = await self._execute(self.client.table('questions').select('content_hash').in_(
+                'content_hash', content_hashes
+            ))
+            
+            return {row['content_hash'] for row in result.data}
+            
+        except Exception as e:
+            log.error(f"Error checking existing content hashes: {e}")
+            return set()
+    
     async def update_question_status(self, question_id: UUID, status: QuestionStatus) -> bool:
         """Update question status."""
         try:
-            result = self.client.table('questions').update({'status': status.value}).eq('id', str(question_id)).execute()
+            result = await self._execute(self._returning(
+                self.client.table('questions').update({'status': status.value}).eq('id', str(question_id)), 'id'
+            ))
             
             return len(result.data) > 0
             
@@ -99,10 +461,98 @@ class SupabaseClient:
             log.error(f"Error updating question status: {e}")
             return False
     
-    async def get_all_questions(self, limit: int = 1000, offset: int = 0) -> List[Question]:
-        """Get all questions with pagination."""
+    async def update_question_status_bulk(self, question_ids: List[UUID], status: QuestionStatus) -> int:
+        """
+        Set the same status on several questions in one update.
+        
+        Args:
+            question_ids: Question IDs
+            status: New status
+            
+        Returns:
+            Number of questions updated
+        """
+        if not question_ids:
+            return 0
+        
         try:
-            result = self.client.table('questions').select('*').range(offset, offset + limit - 1).order('crawled_at', desc=True).execute()
+            result = await self._execute(self._returning(
+                self.client.table('questions').update({'status': status.value}).in_(
+                    'id', [str(qid) for qid in question_ids]
+                ),
+                'id'
+            ))
+            
+            return len(result.data)
+            
+        except Exception as e:
+            log.error(f"Error updating question statuses: {e}")
+            return 0
+    
+    async def finalize_processing(
+        self,
+        question_id: UUID,
+        status: Optional[QuestionStatus] = None,
+        response_id: Optional[UUID] = None,
+        response_text: Optional[str] = None,
+        posted: Optional[bool] = None,
+        posted_at: Optional[datetime] = None
+    ) -> bool:
+        """
+        Record the outcome of processing a question in a single RPC.
+        
+        Updates the question status and the agent response's text and posted
+        fields together via the `finalize_question_processing` function and
+        releases the question's claim. Arguments left as None are not changed.
+        
+        Returns:
+            True if the question was updated, False otherwise
+        """
+        try:
+            result = await self._execute(self.client.rpc('finalize_question_processing', {
+                'p_question_id': str(question_id),
+                'p_status': status.value if status else None,
+                'p_response_id': str(response_id) if response_id else None,
+                'p_response_text': response_text,
+                'p_posted': posted,
+                'p_posted_at': posted_at.isoformat() if posted_at else None
+            }))
+            
+            await agent_response_cache.invalidate(str(question_id))
+            return bool(result.data)
+            
+        except Exception as e:
+            log.error(f"Error finalizing question processing: {e}")
+            return False
+    
+    async def get_all_questions(
+        self,
+        limit: int = 1000,
+        offset: int = 0,
+        cursor: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Question]:
+        """
+        Get all questions, newest first, with pagination.
+        
+        Pass the (crawled_at, id) of the last question of a page as `cursor`
+        to fetch the next one; this walks the (crawled_at, id) index instead
+        of scanning and skipping `offset` rows, so deep pages stay fast.
+        """
+        try:
+            query = self.client.table('questions').select('*')
+            if cursor:
+                crawled_at, last_id = cursor[0].isoformat(), str(cursor[1])
+                # Rows after the cursor in (crawled_at desc, id desc) order; this
+                # postgrest-py version has no or_() builder, so add the param directly
+                query.params = query.params.add(
+                    'or', f'(crawled_at.lt."{crawled_at}",and(crawled_at.eq."{crawled_at}",id.lt.{last_id}))'
+                )
+            elif offset:
+                # limit/offset params rather than range(): a Range header would
+                # be intersected with the limit param and cut the page short
+                query = query.offset(offset)
+            # Both sort keys go in one order param (renders as crawled_at.desc,id.desc)
+            result = await self._execute(query.order('crawled_at.desc,id', desc=True).limit(limit))
             
             return [Question(**q) for q in result.data]
             
@@ -115,10 +565,9 @@ class SupabaseClient:
     async def create_comment(self, comment: Comment) -> Optional[Comment]:
         """Create a new comment."""
         try:
-            data = comment.model_dump()
-            data['created_at'] = data['created_at'].isoformat()
+            data = comment.model_dump(mode='json')
             
-            result = self.client.table('comments').insert(data).execute()
+            result = await self._execute(self.client.table('comments').insert(data))
             
             if result.data:
                 return Comment(**result.data[0])
@@ -131,7 +580,7 @@ class SupabaseClient:
     async def get_comments_for_question(self, question_id: UUID) -> List[Comment]:
         """Get all comments for a question."""
         try:
-            result = self.client.table('comments').select('*').eq('question_id', str(question_id)).execute()
+            result = await self._execute(self.client.table('comments').select('*').eq('question_id', str(question_id)))
             
             return [Comment(**c) for c in result.data]
             
@@ -144,13 +593,11 @@ class SupabaseClient:
     async def create_agent_response(self, response: AgentResponse) -> Optional[AgentResponse]:
         """Create a new agent response."""
         try:
-            data = response.model_dump()
-            data['created_at'] = data['created_at'].isoformat()
-            if data.get('posted_at'):
-                data['posted_at'] = data['posted_at'].isoformat()
+            data = response.model_dump(mode='json')
             
-            result = self.client.table('agent_responses').insert(data).execute()
+            result = await self._execute(self.client.table('agent_responses').insert(data))
             
+            await agent_response_cache.invalidate(str(response.question_id))
             if result.data:
                 return AgentResponse(**result.data[0])
             return None
@@ -162,7 +609,9 @@ class SupabaseClient:
     async def get_agent_response(self, question_id: UUID) -> Optional[AgentResponse]:
         """Get agent response for a question."""
         try:
-            result = self.client.table('agent_responses').select('*').eq('question_id', str(question_id)).execute()
+            result = await self._execute(
+                self.client.table('agent_responses').select('*').eq('question_id', str(question_id))
+            )
             
             if result.data:
                 return AgentResponse(**result.data[0])
@@ -172,6 +621,23 @@ class SupabaseClient:
             log.error(f"Error getting agent response: {e}")
             return None
     
+    async def get_agent_responses_bulk(self, question_ids: List[UUID]) -> Dict[UUID, AgentResponse]:
+        """Get agent responses for several questions in one query, keyed by question ID."""
+        if not question_ids:
+            return {}
+        
+        try:
+            result = await self._execute(self.client.table('agent_responses').select('*').in_(
+                'question_id', [str(qid) for qid in question_ids]
+            ))
+            
+            responses = [AgentResponse(**r) for r in result.data]
+            return {r.question_id: r for r in responses}
+            
+        except Exception as e:
+            log.error(f"Error getting agent responses in bulk: {e}")
+            return {}
+    
     async def update_response_posted(self, response_id: UUID, posted: bool, posted_at: Optional[datetime] = None) -> bool:
         """Update response posted status."""
         try:
@@ -179,25 +645,54 @@ class SupabaseClient:
             if posted_at:
                 data['posted_at'] = posted_at.isoformat()
             
-            result = self.client.table('agent_responses').update(data).eq('id', str(response_id)).execute()
+            result = await self._execute(self._returning(
+                self.client.table('agent_responses').update(data).eq('id', str(response_id)), 'question_id'
+            ))
             
+            for row in result.data:
+                await agent_response_cache.invalidate(str(row['question_id']))
             return len(result.data) > 0
             
         except Exception as e:
             log.error(f"Error updating response posted status: {e}")
             return False
     
+    async def bulk_mark_posted(self, response_ids: List[UUID], posted_at: datetime) -> int:
+        """
+        Mark several agent responses as posted in one update.
+        
+        Args:
+            response_ids: Agent response IDs
+            posted_at: Posting time recorded for all of them
+            
+        Returns:
+            Number of responses updated
+        """
+        if not response_ids:
+            return 0
+        
+        try:
+            result = await self._execute(self._returning(self.client.table('agent_responses').update({
+                'posted': True,
+                'posted_at': posted_at.isoformat()
+            }).in_('id', [str(rid) for rid in response_ids]), 'question_id'))
+            
+            for row in result.data:
+                await agent_response_cache.invalidate(str(row['question_id']))
+            return len(result.data)
+            
+        except Exception as e:
+            log.error(f"Error marking responses posted: {e}")
+            return 0
+    
     # Crawl Log Operations
     
     async def create_crawl_log(self, log_entry: CrawlLog) -> Optional[CrawlLog]:
         """Create a crawl log entry."""
         try:
-            data = log_entry.model_dump()
-            data['started_at'] = data['started_at'].isoformat()
-            if data.get('completed_at'):
-                data['completed_at'] = data['completed_at'].isoformat()
+            data = log_entry.model_dump(mode='json')
             
-            result = self.client.table('crawl_logs').insert(data).execute()
+            result = await self._execute(self.client.table('crawl_logs').insert(data))
             
             if result.data:
                 return CrawlLog(**result.data[0])
@@ -218,7 +713,9 @@ class SupabaseClient:
             if error_message:
                 data['error_message'] = error_message
             
-            result = self.client.table('crawl_logs').update(data).eq('id', str(log_id)).execute()
+            result = await self._execute(self._returning(
+                self.client.table('crawl_logs').update(data).eq('id', str(log_id)), 'id'
+            ))
             
             return len(result.data) > 0
             
@@ -229,7 +726,9 @@ class SupabaseClient:
     async def get_recent_crawl_logs(self, limit: int = 10) -> List[CrawlLog]:
         """Get recent crawl logs."""
         try:
-            result = self.client.table('crawl_logs').select('*').order('started_at', desc=True).limit(limit).execute()
+            result = await self._execute(
+                self.client.table('crawl_logs').select('*').order('started_at', desc=True).limit(limit)
+            )
             
             return [CrawlLog(**log) for log in result.data]
             
@@ -237,19 +736,13 @@ class SupabaseClient:
             log.error(f"Error getting crawl logs: {e}")
             return []
     
-    # Analytics Operations
+    # Analytics Operations (aggregated in Postgres, see scripts/schema.sql)
     
     async def get_question_count_by_status(self) -> dict:
         """Get count of questions by status."""
         try:
-            result = self.client.table('questions').select('status').execute()
-            
-            counts = {}
-            for row in result.data:
-                status = row['status']
-                counts[status] = counts.get(status, 0) + 1
-            
-            return counts
+            result = await self._execute(self.client.rpc('count_questions_by_status', {}))
+            return {row['status']: row['count'] for row in result.data}
             
         except Exception as e:
             log.error(f"Error getting question counts: {e}")
@@ -258,33 +751,36 @@ class SupabaseClient:
     async def get_question_count_by_platform(self) -> dict:
         """Get count of questions by platform."""
         try:
-            result = self.client.table('questions').select('platform').execute()
-            
-            counts = {}
-            for row in result.data:
-                platform = row['platform']
-                counts[platform] = counts.get(platform, 0) + 1
-            
-            return counts
+            result = await self._execute(self.client.rpc('count_questions_by_platform', {}))
+            return {row['platform']: row['count'] for row in result.data}
             
         except Exception as e:
             log.error(f"Error getting platform counts: {e}")
             return {}
     
+    async def get_question_count_by_market(self) -> dict:
+        """Get count of questions by market."""
+        try:
+            result = await self._execute(self.client.rpc('count_questions_by_market', {}))
+            return {row['market']: row['count'] for row in result.data}
+            
+        except Exception as e:
+            log.error(f"Error getting market counts: {e}")
+            return {}
+    
     async def get_response_stats(self) -> dict:
         """Get response statistics."""
         try:
-            result = self.client.table('agent_responses').select('*').execute()
+            row = (await self._execute(self.client.rpc('get_response_stats', {}))).data[0]
             
-            total = len(result.data)
-            posted = sum(1 for r in result.data if r.get('posted'))
-            avg_confidence = sum(r.get('confidence_score', 0) for r in result.data) / total if total > 0 else 0
+            total = row['total']
+            posted = row['posted']
             
             return {
                 'total': total,
                 'posted': posted,
                 'success_rate': posted / total if total > 0 else 0,
-                'avg_confidence': avg_confidence
+                'avg_confidence': row['avg_confidence']
             }
             
         except Exception as e:
@@ -40,15 +40,15 @@ celery_app.conf.update(
 # Configure periodic tasks with per-market schedules
 beat_schedule = {}
 
-# Add scheduled crawl for each market
-markets = get_all_markets()
-for market_name in markets:
-    market_config = get_market_config(market_name)
+# Add scheduled crawl for each market (configs looked up once)
+market_configs = {name: get_market_config(name) for name in get_all_markets()}
+for market_name, market_config in market_configs.items():
     if market_config:
-        # Schedule crawl based on market-specific interval
+        # Schedule crawl based on market-specific interval (once, on the hour;
+        # crontab's minute defaults to every minute of the matching hours)
         beat_schedule[f"crawl-market-{market_name}"] = {
             "task": "backend.tasks.crawl_tasks.crawl_market_task",
-            "schedule": crontab(hour=f"*/{market_config.crawl_interval_hours}"),
+            "schedule": crontab(minute=0, hour=f"*/{market_config.crawl_interval_hours}"),
             "args": (market_name, 100)
         }
 
@@ -62,10 +62,10 @@ beat_schedule["process-pending-questions"] = {
 # Optional: Keep backwards-compatible general crawl
 beat_schedule["crawl-all-platforms-fallback"] = {
     "task": "backend.tasks.crawl_tasks.scheduled_crawl_all_markets",
-    "schedule": crontab(hour="*/12"),  # Every 12 hours as a fallback
+    "schedule": crontab(minute=0, hour="*/12"),  # Every 12 hours as a fallback
     "args": ()
 }
 
 celery_app.conf.beat_schedule = beat_schedule
 
-log.info(f"Celery application configured with {len(markets)} market schedules")
+log.info(f"Celery application configured with {len(market_configs)} market schedules")
@@ -3,9 +3,16 @@ Celery tasks for crawling social media platforms with multi-market support.
 """
 from celery import shared_task
 from backend.crawler.crawler_manager import crawler_manager
+from backend.tasks.event_loop import on_loop_shutdown, run_async
 from backend.utils.logger import log
 
 
+@on_loop_shutdown
+async def close_crawlers():
+    """Release cached crawlers, their HTTP clients and Selenium drivers when a worker process exits."""
+    await crawler_manager.aclose()
+
+
 @shared_task(name="backend.tasks.crawl_tasks.crawl_platform")
 def crawl_platform_task(platform: str, market: str = None, limit: int = 100):
     """
@@ -24,8 +31,7 @@ def crawl_platform_task(platform: str, market: str = None, limit: int = 100):
                 (f" for market '{market}'" if market else ""))
         
         # Note: Celery tasks can't be async by default, so we use sync wrapper
-        import asyncio
-        result = asyncio.run(crawler_manager.crawl_platform(platform, market, limit))
+        result = run_async(crawler_manager.crawl_platform(platform, market, limit))
         
         log.info(f"Completed crawl task for {platform}" + 
                 (f" (market: {market})" if market else "") + f": {result}")
@@ -53,8 +59,7 @@ def crawl_market_task(market: str, limit: int = 100):
     try:
         log.info(f"Starting Celery task: crawl market '{market}'")
         
-        import asyncio
-        result = asyncio.run(crawler_manager.crawl_market(market, limit))
+        result = run_async(crawler_manager.crawl_market(market, limit))
         
         log.info(f"Completed crawl task for market '{market}': {result}")
         
@@ -79,8 +84,7 @@ def scheduled_crawl_all(limit: int = 100):
     try:
         log.info("Starting scheduled crawl for all platforms")
         
-        import asyncio
-        results = asyncio.run(crawler_manager.crawl_all_platforms(limit))
+        results = run_async(crawler_manager.crawl_all_platforms(limit))
         
         log.info(f"Completed scheduled crawl for all platforms")
         
@@ -105,8 +109,7 @@ def scheduled_crawl_all_markets(limit: int = 100):
     try:
         log.info("Starting scheduled crawl for all markets")
         
-        import asyncio
-        results = asyncio.run(crawler_manager.crawl_all_markets(limit))
+        results = run_async(crawler_manager.crawl_all_markets(limit))
         
         log.info(f"Completed scheduled crawl for all markets")
         
@@ -0,0 +1,89 @@
+"""
+Worker-lifetime event loop for running async code from Celery tasks.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List, TypeVar
+from celery.signals import worker_process_init, worker_process_shutdown
+from backend.utils.logger import log
+
+T = TypeVar("T")
+
+# One loop per worker thread (prefork and solo pools use a single thread)
+_local = threading.local()
+
+# Async cleanups run on the worker loop before it is closed
+_shutdown_hooks: List[Callable[[], Awaitable[Any]]] = []
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get this thread's event loop, creating it on first use."""
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _local.loop = loop
+    return loop
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion on the worker's persistent event loop.
+    
+    Unlike asyncio.run(), the loop is kept between tasks, so loop-bound
+    clients (Redis, httpx, rate limiter locks) and their open connections
+    are reused instead of being rebuilt for every task.
+    
+    Args:
+        coro: Coroutine to run
+    
+    Returns:
+        The coroutine's result
+    """
+    return _get_loop().run_until_complete(coro)
+
+
+def on_loop_shutdown(hook: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+    """
+    Register an async cleanup to run on the worker loop when the worker process exits.
+    
+    Loop-bound clients have to be closed on the loop that opened them, so
+    cleanups that await go through here instead of their own shutdown
+    handlers, which could run after the loop is closed. Usable as a decorator.
+    
+    Args:
+        hook: Coroutine function taking no arguments
+    
+    Returns:
+        The hook, unchanged
+    """
+    _shutdown_hooks.append(hook)
+    return hook
+
+
+@worker_process_init.connect
+def open_event_loop(**kwargs):
+    """Create the event loop when a worker process starts."""
+    _get_loop()
+    log.info("Worker event loop created")
+
+
+@worker_process_shutdown.connect
+def close_event_loop(**kwargs):
+    """Run shutdown hooks, finish async generators and close the event loop when a worker process exits."""
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        if not _shutdown_hooks:
+            return
+        loop = _get_loop()
+    
+    try:
+        for hook in _shutdown_hooks:
+            try:
+                loop.run_until_complete(hook())
+            except Exception as e:
+                log.error(f"Error in worker loop shutdown hook: {e}")
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+        _local.loop = None
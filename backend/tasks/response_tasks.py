@@ -2,11 +2,13 @@
 Celery tasks for processing questions and generating responses.
 """
 from uuid import UUID
-from celery import shared_task
+from celery import chord, shared_task
+from backend.config.settings import settings
 from backend.database.models import QuestionStatus
 from backend.database.supabase_client import db_client
 from backend.agent.capability_checker import capability_checker
-from backend.agent.response_generator import response_generator
+from backend.agent.response_generator import get_response_generator
+from backend.tasks.event_loop import run_async
 from backend.utils.logger import log
 
 
@@ -24,20 +26,18 @@ def check_question_capability_task(question_id: str):
     try:
         log.info(f"Starting capability check task for question: {question_id}")
         
-        import asyncio
-        
         # Convert string to UUID
         question_uuid = UUID(question_id)
         
         # Get question
-        question = asyncio.run(db_client.get_question(question_uuid))
+        question = run_async(db_client.get_question(question_uuid))
         
         if not question:
             log.error(f"Question {question_id} not found")
             return {"error": "Question not found"}
         
         # Check capability
-        agent_response = asyncio.run(capability_checker.check_question(question))
+        agent_response = run_async(capability_checker.check_question(question))
         
         log.info(f"Capability check complete for question {question_id}: in_scope={agent_response.is_in_scope}")
         
@@ -66,13 +66,11 @@ def generate_and_post_response_task(question_id: str):
     try:
         log.info(f"Starting response generation task for question: {question_id}")
         
-        import asyncio
-        
         # Convert string to UUID
         question_uuid = UUID(question_id)
         
         # Process question (generate and optionally post)
-        success = asyncio.run(response_generator.process_question(question_uuid))
+        success = run_async(get_response_generator().process_question(question_uuid))
         
         if success:
             log.info(f"Response task complete for question {question_id}")
@@ -100,74 +98,87 @@ def process_pending_questions_task(limit: int = 10):
     try:
         log.info(f"Starting scheduled processing of pending questions (limit: {limit})")
         
-        import asyncio
-        
-        # Get pending questions
-        pending_questions = asyncio.run(
-            db_client.get_questions_by_status(QuestionStatus.PENDING, limit)
-        )
-        
-        log.info(f"Found {len(pending_questions)} pending questions")
-        
-        processed_count = 0
-        
-        for question in pending_questions:
-            try:
-                # Check if agent response exists
-                agent_response = asyncio.run(db_client.get_agent_response(question.id))
-                
-                if not agent_response:
-                    # Run capability check first
-                    log.info(f"Running capability check for question {question.id}")
-                    agent_response = asyncio.run(capability_checker.check_question(question))
-                
-                # If in scope, generate and post response
-                if agent_response and agent_response.is_in_scope:
-                    log.info(f"Processing question {question.id}")
-                    success = asyncio.run(response_generator.process_question(question.id))
-                    
-                    if success:
-                        processed_count += 1
-                else:
-                    # Mark as ignored
-                    asyncio.run(db_client.update_question_status(question.id, QuestionStatus.IGNORED))
-                    
-            except Exception as e:
-                log.error(f"Error processing question {question.id}: {e}")
-                continue
-        
-        log.info(f"Processed {processed_count} questions successfully")
-        
-        return {
-            "processed": processed_count,
-            "total_pending": len(pending_questions)
-        }
+        return run_async(_process_pending_questions(limit))
         
     except Exception as e:
         log.error(f"Error in process pending questions task: {e}")
         return {"error": str(e)}
 
 
+async def _process_pending_questions(limit: int) -> dict:
+    """
+    Triage new pending questions in batches, then generate responses for in-scope ones.
+    
+    Only pending questions without an agent response are triaged, so questions
+    already waiting for a response (or a post retry) don't take up the batch.
+    They are capability-checked concurrently and out-of-scope ones are marked
+    ignored in one update. The response generator then claims and processes
+    pending in-scope questions through its batched pipeline.
+    
+    Args:
+        limit: Maximum questions to process
+        
+    Returns:
+        Result dictionary
+    """
+    pending_questions = await db_client.get_untriaged_questions(limit)
+    
+    log.info(f"Found {len(pending_questions)} untriaged pending questions")
+    
+    responses = {}
+    if pending_questions:
+        log.info(f"Running capability checks for {len(pending_questions)} questions")
+        responses = await capability_checker.check_questions(pending_questions)
+    
+    out_of_scope = [
+        q.id for q in pending_questions
+        if not (responses.get(q.id) and responses[q.id].is_in_scope)
+    ]
+    await db_client.update_question_status_bulk(out_of_scope, QuestionStatus.IGNORED)
+    
+    processed_count = await get_response_generator().process_pending_questions(limit=limit)
+    
+    log.info(f"Processed {processed_count} questions successfully")
+    
+    return {
+        "processed": processed_count,
+        "total_pending": len(pending_questions)
+    }
+
+
 @shared_task(name="backend.tasks.response_tasks.batch_check_capabilities")
 def batch_check_capabilities_task(question_ids: list):
     """
     Task to batch check capabilities for multiple questions.
     
+    Batches larger than the chunk size are split into a chord of chunk
+    tasks so the checks run on every available worker; the chord callback
+    adds up the chunk results. Smaller batches are checked in this worker.
+    
     Args:
         question_ids: List of question UUID strings
         
     Returns:
-        Results dictionary
+        Results dictionary, or the chord's result ID for fanned-out batches
     """
     try:
-        log.info(f"Starting batch capability check for {len(question_ids)} questions")
+        chunk_size = max(settings.capability_batch_chunk_size, 1)
+        if len(question_ids) > chunk_size:
+            chunks = [question_ids[i:i + chunk_size] for i in range(0, len(question_ids), chunk_size)]
+            log.info(f"Fanning out capability check for {len(question_ids)} questions in {len(chunks)} chunks")
+            
+            result = chord(
+                batch_check_capabilities_task.s(chunk) for chunk in chunks
+            )(summarize_capability_checks.s())
+            
+            return {"total": len(question_ids), "chunks": len(chunks), "result_id": result.id}
         
-        import asyncio
+        log.info(f"Starting batch capability check for {len(question_ids)} questions")
         
         # Convert strings to UUIDs
         uuids = [UUID(qid) for qid in question_ids]
         
-        results = asyncio.run(capability_checker.batch_check_questions(uuids))
+        results = run_async(capability_checker.batch_check_questions(uuids))
         
         log.info(f"Batch capability check complete for {len(results)} questions")
         
@@ -180,3 +191,26 @@ def batch_check_capabilities_task(question_ids: list):
         log.error(f"Error in batch capability check: {e}")
         return {"error": str(e)}
 
+
+@shared_task(name="backend.tasks.response_tasks.summarize_capability_checks")
+def summarize_capability_checks(chunk_results: list):
+    """
+    Chord callback combining the results of fanned-out capability checks.
+    
+    Args:
+        chunk_results: Result dictionaries from each chunk task
+        
+    Returns:
+        Results dictionary
+    """
+    errors = [r["error"] for r in chunk_results if "error" in r]
+    summary = {
+        "total": sum(r.get("total", 0) for r in chunk_results),
+        "in_scope": sum(r.get("in_scope", 0) for r in chunk_results)
+    }
+    if errors:
+        summary["errors"] = errors
+    
+    log.info(f"Batch capability check complete for {summary['total']} questions ({summary['in_scope']} in scope)")
+    
+    return summary
@@ -2,7 +2,8 @@
 Deduplication logic to prevent processing duplicate questions.
 """
 import hashlib
-from typing import Optional
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
 from backend.utils.logger import log
 
 
@@ -20,13 +21,27 @@ class Deduplicator:
         Returns:
             SHA256 hash of normalized content
         """
-        # Normalize content: lowercase, strip whitespace
-        normalized = content.lower().strip()
-        # Remove extra whitespace
-        normalized = ' '.join(normalized.split())
+        # Normalize content: lowercase and collapse whitespace (split() also drops
+        # leading and trailing whitespace)
+        normalized = ' '.join(content.lower().split())
         
         return hashlib.sha256(normalized.encode()).hexdigest()
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def tokenize(text: str) -> Tuple[FrozenSet[str], int]:
+        """
+        Split lowercased text into a set of words, cached per text.
+        
+        Args:
+            text: Lowercased text
+            
+        Returns:
+            Tuple of (word set, number of distinct words)
+        """
+        tokens = frozenset(text.split())
+        return tokens, len(tokens)
+    
     @staticmethod
     def is_similar(text1: str, text2: str, threshold: float = 0.8) -> bool:
         """
@@ -47,24 +62,24 @@ class Deduplicator:
         if text1_lower == text2_lower:
             return True
         
-        # Calculate character overlap
-        set1 = set(text1_lower.split())
-        set2 = set(text2_lower.split())
+        # Calculate word overlap
+        set1, size1 = Deduplicator.tokenize(text1_lower)
+        set2, size2 = Deduplicator.tokenize(text2_lower)
         
-        if not set1 or not set2:
+        if not size1 or not size2:
             return False
         
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
-        
-        similarity = intersection / union if union > 0 else 0
+        # |A ∪ B| = |A| + |B| - |A ∩ B|, so the union set is never built
+        intersection = len(set1 & set2)
+        similarity = intersection / (size1 + size2 - intersection)
         
         return similarity >= threshold
     
     @staticmethod
+    @lru_cache(maxsize=16384)
     def normalize_url(url: str) -> str:
         """
-        Normalize URL for comparison.
+        Normalize URL for comparison, cached per URL.
         
         Args:
             url: URL to normalize
@@ -72,18 +87,16 @@ class Deduplicator:
         Returns:
             Normalized URL
         """
-        # Remove common URL parameters
-        url = url.split('?')[0]
-        url = url.split('#')[0]
-        # Remove trailing slash
-        url = url.rstrip('/')
+        # Remove query string and fragment, then the trailing slash
+        url = url.partition('?')[0].partition('#')[0]
         
-        return url.lower()
+        return url.rstrip('/').lower()
     
     @staticmethod
+    @lru_cache(maxsize=8192)
     def extract_platform_id(url: str, platform: str) -> Optional[str]:
         """
-        Extract post ID from platform URL.
+        Extract post ID from platform URL, cached per URL.
         
         Args:
             url: Platform URL
@@ -28,7 +28,10 @@ def setup_logger():
         rotation="500 MB",
         retention="10 days",
         level=settings.log_level,
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+        # Plain tracebacks: no frame walking or local variable dumps in log files
+        backtrace=False,
+        diagnose=False
     )
     
     return logger
@@ -0,0 +1,63 @@
+"""
+Helpers for async clients bound to the event loop that created them.
+"""
+import asyncio
+from typing import Awaitable, Callable, Optional
+import redis.asyncio as aioredis
+from backend.config.settings import settings
+from backend.utils.logger import log
+
+
+def close_on_loop(loop: Optional[asyncio.AbstractEventLoop], close: Callable[[], Awaitable]):
+    """
+    Close a replaced client on the event loop it was created on.
+    
+    Pooled connections belong to the loop that opened them, so they can't be
+    closed from the running loop. The close is scheduled on the client's own
+    loop instead: it runs right away if that loop is running in another
+    thread, or the next time the loop runs if it is idle. A closed loop can't
+    run anything, so the client is only dropped there.
+    
+    Args:
+        loop: Loop the client was created on
+        close: The client's async close method (e.g. client.aclose)
+    """
+    if loop is None or loop.is_closed():
+        return
+    
+    try:
+        asyncio.run_coroutine_threadsafe(close(), loop)
+    except RuntimeError as e:
+        # The loop was closed in the meantime
+        log.debug(f"Could not close client on its event loop: {e}")
+
+
+class LoopBoundRedis:
+    """
+    Lazily created asyncio Redis client for the running event loop.
+    
+    Connections can't be shared across loops, so the client is rebuilt when
+    the loop changes (each CLI command, each worker thread's loop) and the
+    replaced one is closed on its own loop with close_on_loop().
+    """
+    
+    def __init__(self, **options):
+        """
+        Initialize the holder.
+        
+        Args:
+            **options: Keyword arguments for redis.asyncio.from_url
+        """
+        self.options = options
+        self._client: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def get(self) -> aioredis.Redis:
+        """Get the client for the running loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                close_on_loop(self._loop, self._client.aclose)
+            self._client = aioredis.from_url(settings.redis_url, **self.options)
+            self._loop = loop
+        return self._client
@@ -0,0 +1,85 @@
+"""
+Event loop lag monitor for catching blocking calls inside async code.
+"""
+import asyncio
+import time
+from typing import Optional, Set
+from backend.utils.logger import log
+
+
+class EventLoopMonitor:
+    """
+    Detect event loop stalls with a heartbeat task.
+    
+    A background task sleeps for a fixed interval and measures how late it
+    wakes up. Any delay beyond the threshold means something ran on the loop
+    without yielding (time.sleep, sync HTTP, sync database calls). The
+    warning lists the requests in flight at the time so the culprit can be
+    traced back to a route.
+    """
+    
+    def __init__(self, threshold: float = 0.05, interval: float = 0.1):
+        """
+        Initialize monitor.
+        
+        Args:
+            threshold: Seconds of lag that count as a blocked loop
+            interval: Seconds between heartbeats
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.active_requests: Set[str] = set()
+        self.stall_count = 0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+    
+    async def _run(self):
+        """Heartbeat loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - expected
+            if lag > self.threshold:
+                self.stall_count += 1
+                self.max_lag = max(self.max_lag, lag)
+                in_flight = ', '.join(sorted(self.active_requests)) or 'none'
+                log.warning(f"Event loop blocked for {lag * 1000:.0f}ms (requests in flight: {in_flight})")
+    
+    def start(self):
+        """Start the heartbeat task on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            log.info(f"Event loop monitor started (threshold {self.threshold * 1000:.0f}ms)")
+    
+    async def stop(self):
+        """Stop the heartbeat task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def track(self, label: str) -> str:
+        """
+        Mark a request as in flight.
+        
+        Args:
+            label: Request description, e.g. "GET /api/analytics/"
+        
+        Returns:
+            Unique key to pass to untrack()
+        """
+        key = f"{label}#{time.monotonic_ns()}"
+        self.active_requests.add(key)
+        return key
+    
+    def untrack(self, key: str):
+        """Mark a request as finished."""
+        self.active_requests.discard(key)
+
+
+# Global monitor instance
+loop_monitor = EventLoopMonitor()
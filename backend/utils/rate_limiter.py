@@ -1,75 +1,177 @@
 """
 Rate limiting implementation to respect platform API limits.
 """
+import asyncio
+import threading
 import time
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict
+from collections import defaultdict, deque
+from typing import Dict, Optional, Tuple
+from uuid import uuid4
 import redis
+import redis.asyncio as aioredis
 from backend.config.settings import settings
 from backend.utils.logger import log
+from backend.utils.loop_clients import close_on_loop
 
 
 class RateLimiter:
-    """Rate limiter using Redis for distributed rate limiting."""
+    """
+    Rate limiter using Redis for distributed rate limiting.
+    
+    Requests are kept in a per-identifier sorted set scored by time, so the
+    limit applies to any rolling 60 second window rather than to calendar
+    minutes (which let 2x the limit through around a minute boundary).
+    """
+    
+    # Milliseconds covered by the rolling window
+    WINDOW_MS = 60_000
+    
+    # Drop expired requests, record this one if the window has room, and
+    # return {allowed, remaining, milliseconds until a slot frees up}
+    ROLLING_WINDOW_SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    local limit = tonumber(ARGV[3])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+    local count = redis.call('ZCARD', KEYS[1])
+    if count >= limit then
+        local freeing = redis.call('ZRANGE', KEYS[1], count - limit, count - limit, 'WITHSCORES')
+        local retry_after = window
+        if freeing[2] then
+            retry_after = tonumber(freeing[2]) + window - now
+        end
+        return {0, 0, retry_after}
+    end
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, limit - count - 1, 0}
+    """
     
     def __init__(self):
         self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
         self.max_requests = settings.max_requests_per_minute
+        # Sent with EVALSHA; redis-py loads it on first use
+        self._record_request = self.redis_client.register_script(self.ROLLING_WINDOW_SCRIPT)
+        # asyncio client and script for acquire(), bound to the loop that created them
+        self._async_client: Optional[aioredis.Redis] = None
+        self._async_record_request = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
         
     def _get_key(self, identifier: str) -> str:
         """Generate Redis key for rate limiting."""
-        minute = datetime.now().strftime("%Y-%m-%d-%H-%M")
-        return f"rate_limit:{identifier}:{minute}"
+        return f"rate_limit:{identifier}"
     
-    def is_allowed(self, identifier: str) -> bool:
+    def _get_async_script(self):
         """
-        Check if request is allowed based on rate limits.
+        Get the rolling-window script on an asyncio Redis client for the running loop.
+        
+        The client is rebuilt when the loop changes; the replaced one is
+        closed on its own loop so its connections aren't left open.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_record_request is None or self._async_loop is not loop:
+            if self._async_client is not None:
+                close_on_loop(self._async_loop, self._async_client.aclose)
+            self._async_client = aioredis.from_url(settings.redis_url, decode_responses=True)
+            self._async_record_request = self._async_client.register_script(self.ROLLING_WINDOW_SCRIPT)
+            self._async_loop = loop
+        return self._async_record_request
+    
+    def _script_args(self) -> list:
+        """Build the rolling-window script arguments for one request."""
+        return [int(time.time() * 1000), self.WINDOW_MS, self.max_requests, uuid4().hex]
+    
+    def _parse_reply(self, identifier: str, reply: list) -> Tuple[bool, int, float]:
+        """Convert the script's {allowed, remaining, retry_after_ms} reply."""
+        allowed, remaining, retry_after_ms = reply
+        
+        if not int(allowed):
+            log.warning(f"Rate limit exceeded for {identifier}")
+            return False, 0, int(retry_after_ms) / 1000
+        
+        return True, int(remaining), 0.0
+    
+    def check(self, identifier: str) -> Tuple[bool, int, float]:
+        """
+        Record a request if the rate limit allows it.
         
         Args:
             identifier: Unique identifier for rate limiting (e.g., 'reddit', 'quora')
             
         Returns:
-            True if request is allowed, False otherwise
+            Tuple of (allowed, requests remaining in the window, seconds until
+            a request would be allowed again)
         """
-        key = self._get_key(identifier)
-        
         try:
-            current_count = self.redis_client.get(key)
-            
-            if current_count is None:
-                # First request in this minute
-                self.redis_client.setex(key, 60, 1)
-                return True
+            # Trim, count and record in one atomic server-side script, so concurrent
+            # crawlers and processes can't all see room in the window and go over the limit
+            reply = self._record_request(keys=[self._get_key(identifier)], args=self._script_args())
+            return self._parse_reply(identifier, reply)
             
-            if int(current_count) >= self.max_requests:
-                log.warning(f"Rate limit exceeded for {identifier}")
-                return False
+        except Exception as e:
+            log.error(f"Rate limiter error: {e}")
+            # Allow request if rate limiter fails
+            return True, self.max_requests, 0.0
+    
+    async def check_async(self, identifier: str) -> Tuple[bool, int, float]:
+        """
+        Record a request if the rate limit allows it, without blocking the event loop.
+        
+        Args:
+            identifier: Unique identifier for rate limiting (e.g., 'reddit', 'quora')
             
-            # Increment counter
-            self.redis_client.incr(key)
-            return True
+        Returns:
+            Tuple of (allowed, requests remaining in the window, seconds until
+            a request would be allowed again)
+        """
+        try:
+            script = self._get_async_script()
+            reply = await script(keys=[self._get_key(identifier)], args=self._script_args())
+            return self._parse_reply(identifier, reply)
             
         except Exception as e:
             log.error(f"Rate limiter error: {e}")
             # Allow request if rate limiter fails
-            return True
+            return True, self.max_requests, 0.0
+    
+    def is_allowed(self, identifier: str) -> bool:
+        """
+        Check if request is allowed based on rate limits.
+        
+        Args:
+            identifier: Unique identifier for rate limiting (e.g., 'reddit', 'quora')
+            
+        Returns:
+            True if request is allowed, False otherwise
+        """
+        return self.check(identifier)[0]
     
     def wait_if_needed(self, identifier: str):
-        """Block until rate limit allows request."""
-        while not self.is_allowed(identifier):
-            log.info(f"Rate limit reached for {identifier}, waiting...")
-            time.sleep(1)
+        """Block until rate limit allows request, sleeping until a slot frees up."""
+        while True:
+            allowed, _, retry_after = self.check(identifier)
+            if allowed:
+                return
+            log.info(f"Rate limit reached for {identifier}, waiting {retry_after:.1f}s...")
+            time.sleep(max(retry_after, 0.05))
+    
+    async def acquire(self, identifier: str):
+        """Wait on the event loop until rate limit allows request."""
+        while True:
+            allowed, _, retry_after = await self.check_async(identifier)
+            if allowed:
+                return
+            log.info(f"Rate limit reached for {identifier}, waiting {retry_after:.1f}s...")
+            await asyncio.sleep(max(retry_after, 0.05))
     
     def get_remaining(self, identifier: str) -> int:
-        """Get remaining requests for current minute."""
+        """Get remaining requests in the current rolling window."""
         key = self._get_key(identifier)
         
         try:
-            current_count = self.redis_client.get(key)
-            if current_count is None:
-                return self.max_requests
-            return max(0, self.max_requests - int(current_count))
+            window_start = int(time.time() * 1000) - self.WINDOW_MS
+            current_count = self.redis_client.zcount(key, f"({window_start}", "+inf")
+            return max(0, self.max_requests - current_count)
         except Exception as e:
             log.error(f"Error getting remaining requests: {e}")
             return self.max_requests
@@ -79,30 +181,136 @@ class SimpleRateLimiter:
     """In-memory rate limiter for local development."""
     
     def __init__(self):
-        self.requests: Dict[str, list] = defaultdict(list)
+        # identifier -> monotonic request times within the last minute, oldest first
+        self.requests: Dict[str, deque] = defaultdict(deque)
         self.max_requests = settings.max_requests_per_minute
+        # Crawlers check the limit from several worker threads at once
+        self._lock = threading.Lock()
+    
+    def check(self, identifier: str) -> Tuple[bool, int, float]:
+        """
+        Record a request if the rate limit allows it.
+        
+        Args:
+            identifier: Unique identifier for rate limiting (e.g., 'reddit', 'quora')
+            
+        Returns:
+            Tuple of (allowed, requests remaining in the window, seconds until
+            a request would be allowed again)
+        """
+        now = time.monotonic()
+        minute_ago = now - 60
+        
+        with self._lock:
+            # Clean old requests from the front of the window
+            window = self.requests[identifier]
+            while window and window[0] <= minute_ago:
+                window.popleft()
+            
+            if len(window) >= self.max_requests:
+                freeing = window[len(window) - self.max_requests] if self.max_requests > 0 else now
+                return False, 0, freeing - minute_ago
+            
+            window.append(now)
+            return True, self.max_requests - len(window), 0.0
     
     def is_allowed(self, identifier: str) -> bool:
         """Check if request is allowed based on rate limits."""
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
+        return self.check(identifier)[0]
+    
+    def wait_if_needed(self, identifier: str):
+        """Block until rate limit allows request, sleeping until a slot frees up."""
+        while True:
+            allowed, _, retry_after = self.check(identifier)
+            if allowed:
+                return
+            time.sleep(max(retry_after, 0.05))
+    
+    async def acquire(self, identifier: str):
+        """Wait on the event loop until rate limit allows request."""
+        while True:
+            allowed, _, retry_after = self.check(identifier)
+            if allowed:
+                return
+            await asyncio.sleep(max(retry_after, 0.05))
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket that paces async callers locally instead of letting them hit remote rate limits.
+    
+    Callers await acquire() before each request; tokens refill continuously at
+    `rate` per second up to `capacity`. penalize() drains the bucket and blocks
+    all callers for a period, e.g. after an HTTP 429 with Retry-After.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
         
-        # Clean old requests
-        self.requests[identifier] = [
-            req_time for req_time in self.requests[identifier]
-            if req_time > minute_ago
-        ]
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to one second of tokens)
+            
+        Raises:
+            ValueError: If rate is not positive
+        """
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}")
         
-        if len(self.requests[identifier]) >= self.max_requests:
-            return False
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_lock(self) -> asyncio.Lock:
+        """Get the waiter lock for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+    
+    def _refill(self, now: float):
+        """Add tokens accrued since the last update."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+    
+    async def acquire(self, cost: float = 1.0):
+        """
+        Wait until `cost` tokens are available and consume them.
         
-        self.requests[identifier].append(now)
-        return True
+        Args:
+            cost: Number of tokens to consume
+        """
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                
+                self._refill(now)
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                
+                await asyncio.sleep((cost - self._tokens) / self.rate)
     
-    def wait_if_needed(self, identifier: str):
-        """Block until rate limit allows request."""
-        while not self.is_allowed(identifier):
-            time.sleep(1)
+    def penalize(self, seconds: float):
+        """
+        Drain the bucket and block callers for a period.
+        
+        Args:
+            seconds: How long to block new acquisitions
+        """
+        now = time.monotonic()
+        self._tokens = 0.0
+        self._updated_at = now
+        self._blocked_until = max(self._blocked_until, now + seconds)
 
 
 # Factory function
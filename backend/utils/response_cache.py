@@ -0,0 +1,134 @@
+"""
+Short-lived cache for serialized API responses, shared through Redis when available.
+"""
+import time
+from typing import Dict, Optional, Tuple
+import redis.asyncio as aioredis
+from backend.config.settings import settings
+from backend.utils.logger import log
+from backend.utils.loop_clients import LoopBoundRedis
+
+
+class ResponseCache:
+    """
+    Cache serialized responses by key with a TTL and explicit invalidation.
+    
+    Entries are written to Redis so every API and worker process sees the
+    same invalidations. If Redis is unreachable nothing is cached until it
+    comes back, since an in-process copy would miss invalidations made by
+    other processes. With `use_redis` off, entries live in an in-process
+    dictionary (for single-process use).
+    """
+    
+    # Seconds to stop trying Redis after an error
+    REDIS_RETRY_AFTER = 60.0
+    
+    def __init__(self, namespace: str, ttl_seconds: Optional[int] = None, use_redis: bool = True):
+        """
+        Initialize the cache.
+        
+        Args:
+            namespace: Key prefix separating this cache from others
+            ttl_seconds: Seconds before an entry expires (0 disables caching)
+            use_redis: Share entries through Redis instead of only in process
+        """
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.response_cache_ttl_seconds
+        self.use_redis = use_redis
+        self._redis = LoopBoundRedis(socket_connect_timeout=0.5, socket_timeout=0.5)
+        self._redis_disabled_until = 0.0
+        # key -> (payload, stored_at)
+        self._local: Dict[str, Tuple[bytes, float]] = {}
+    
+    def _key(self, key: str) -> str:
+        """Build the namespaced key."""
+        return f"response_cache:{self.namespace}:{key}"
+    
+    def _get_redis(self) -> Optional[aioredis.Redis]:
+        """Get the Redis client for the running loop, or None if disabled or backing off."""
+        if not self.use_redis or time.monotonic() < self._redis_disabled_until:
+            return None
+        return self._redis.get()
+    
+    def _redis_failed(self, error: Exception):
+        """Stop using Redis for a while after an error."""
+        log.warning(f"Response cache '{self.namespace}' Redis unavailable, caching paused: {error}")
+        self._redis_disabled_until = time.monotonic() + self.REDIS_RETRY_AFTER
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a cached payload.
+        
+        Args:
+            key: Cache key within the namespace
+        
+        Returns:
+            Cached payload or None
+        """
+        if self.ttl_seconds <= 0:
+            return None
+        
+        if self.use_redis:
+            redis_client = self._get_redis()
+            if redis_client is None:
+                return None
+            try:
+                return await redis_client.get(self._key(key))
+            except Exception as e:
+                self._redis_failed(e)
+                return None
+        
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[1] > self.ttl_seconds:
+            del self._local[key]
+            return None
+        return entry[0]
+    
+    async def set(self, key: str, payload: bytes):
+        """
+        Store a payload.
+        
+        Args:
+            key: Cache key within the namespace
+            payload: Serialized response
+        """
+        if self.ttl_seconds <= 0:
+            return
+        
+        if self.use_redis:
+            redis_client = self._get_redis()
+            if redis_client is None:
+                return
+            try:
+                await redis_client.set(self._key(key), payload, ex=self.ttl_seconds)
+            except Exception as e:
+                self._redis_failed(e)
+            return
+        
+        self._local[key] = (payload, time.monotonic())
+    
+    async def invalidate(self, key: str):
+        """
+        Remove a cached payload.
+        
+        Args:
+            key: Cache key within the namespace
+        """
+        self._local.pop(key, None)
+        
+        redis_client = self._get_redis()
+        if redis_client is not None:
+            try:
+                await redis_client.delete(self._key(key))
+            except Exception as e:
+                self._redis_failed(e)
+    
+    def clear(self):
+        """Remove all in-process entries."""
+        self._local.clear()
+
+
+# Global cache for GET /responses/{question_id}, keyed by question ID
+agent_response_cache = ResponseCache("agent_response")
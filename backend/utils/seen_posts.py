@@ -0,0 +1,127 @@
+"""
+Bloom filter of stored post IDs and content hashes, kept in a Redis bitmap so it survives restarts.
+"""
+import hashlib
+import math
+import time
+from typing import Iterable, List, Optional, Set
+import redis
+from backend.config.settings import settings
+from backend.utils.logger import log
+
+
+class SeenPostFilter:
+    """
+    Remember which post IDs have been stored so crawlers can skip them early.
+    
+    Each platform (and CONTENT_HASHES, for deduplication by content) gets one
+    Redis bitmap sized for the configured capacity and
+    false-positive rate (about 14 bits per post at 0.1%), far smaller than a
+    set of ID strings. Uses plain SETBIT/GETBIT, so no Redis module is needed.
+    A false positive skips a new post; a miss (or Redis being unavailable)
+    only means the database duplicate check handles the post instead.
+    """
+    
+    KEY_PREFIX = "seen_posts:"
+    # Namespace for content hashes of stored questions, shared by all platforms
+    CONTENT_HASHES = "content_hash"
+    # Seconds to stop trying Redis after an error
+    REDIS_RETRY_AFTER = 60.0
+    
+    def __init__(self, capacity: Optional[int] = None, error_rate: Optional[float] = None):
+        """
+        Initialize the filter.
+        
+        Args:
+            capacity: Expected number of posts per platform
+            error_rate: Acceptable false-positive rate (0-1)
+        """
+        capacity = capacity if capacity is not None else settings.seen_posts_capacity
+        error_rate = error_rate if error_rate is not None else settings.seen_posts_error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._redis: Optional[redis.Redis] = None
+        self._redis_disabled_until = 0.0
+    
+    def _get_redis(self) -> Optional[redis.Redis]:
+        """Get the Redis client, or None while backing off after an error."""
+        if time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            self._redis = redis.from_url(
+                settings.redis_url,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5
+            )
+        return self._redis
+    
+    def _redis_failed(self, error: Exception):
+        """Stop using Redis for a while after an error."""
+        log.warning(f"Seen-posts filter Redis unavailable, relying on database dedup: {error}")
+        self._redis_disabled_until = time.monotonic() + self.REDIS_RETRY_AFTER
+    
+    def _offsets(self, post_id: str) -> List[int]:
+        """Bit offsets for a post ID (double hashing over one digest)."""
+        digest = hashlib.blake2b(post_id.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+    
+    def seen(self, platform: str, post_ids: Iterable[str]) -> Set[str]:
+        """
+        Find which post IDs are (probably) already stored.
+        
+        Args:
+            platform: Platform name (or CONTENT_HASHES)
+            post_ids: Post IDs (or content hashes) to check
+            
+        Returns:
+            Set of post IDs found in the filter
+        """
+        post_ids = list(dict.fromkeys(post_ids))
+        redis_client = self._get_redis()
+        if redis_client is None or not post_ids:
+            return set()
+        
+        key = self.KEY_PREFIX + platform
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for post_id in post_ids:
+                for offset in self._offsets(post_id):
+                    pipe.getbit(key, offset)
+            bits = pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+            return set()
+        
+        k = self.hash_count
+        return {
+            post_id for i, post_id in enumerate(post_ids)
+            if all(bits[i * k:(i + 1) * k])
+        }
+    
+    def add(self, platform: str, post_ids: Iterable[str]):
+        """
+        Record post IDs as stored.
+        
+        Args:
+            platform: Platform name (or CONTENT_HASHES)
+            post_ids: Post IDs (or content hashes) to record
+        """
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return
+        
+        key = self.KEY_PREFIX + platform
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for post_id in dict.fromkeys(post_ids):
+                for offset in self._offsets(post_id):
+                    pipe.setbit(key, offset, 1)
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+
+
+# Global filter instance
+seen_post_filter = SeenPostFilter()
@@ -39,6 +39,23 @@ BEGIN
     END IF;
 END $$;
 
+-- Add claim columns if they don't exist (for existing tables)
+DO $$ 
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns 
+        WHERE table_name = 'questions' AND column_name = 'claimed_at'
+    ) THEN
+        ALTER TABLE questions ADD COLUMN claimed_at TIMESTAMP WITH TIME ZONE;
+    END IF;
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns 
+        WHERE table_name = 'questions' AND column_name = 'attempts'
+    ) THEN
+        ALTER TABLE questions ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0;
+    END IF;
+END $$;
+
 -- Create comments table
 CREATE TABLE IF NOT EXISTS comments (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -95,7 +112,9 @@ CREATE INDEX IF NOT EXISTS idx_questions_platform ON questions(platform);
 CREATE INDEX IF NOT EXISTS idx_questions_market ON questions(market);
 CREATE INDEX IF NOT EXISTS idx_questions_status ON questions(status);
 CREATE INDEX IF NOT EXISTS idx_questions_market_status ON questions(market, status);
-CREATE INDEX IF NOT EXISTS idx_questions_crawled_at ON questions(crawled_at DESC);
+-- (crawled_at, id) keyset for get_all_questions; replaces the crawled_at-only index
+DROP INDEX IF EXISTS idx_questions_crawled_at;
+CREATE INDEX IF NOT EXISTS idx_questions_crawled_at_id ON questions(crawled_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_questions_content_hash ON questions(content_hash);
 CREATE INDEX IF NOT EXISTS idx_comments_question_id ON comments(question_id);
 CREATE INDEX IF NOT EXISTS idx_agent_responses_question_id ON agent_responses(question_id);
@@ -104,6 +123,129 @@ CREATE INDEX IF NOT EXISTS idx_crawl_logs_platform ON crawl_logs(platform);
 CREATE INDEX IF NOT EXISTS idx_crawl_logs_market ON crawl_logs(market);
 CREATE INDEX IF NOT EXISTS idx_crawl_logs_started_at ON crawl_logs(started_at DESC);
 
+-- Record the outcome of processing a question in one round trip
+-- NULL arguments leave the corresponding column unchanged
+CREATE OR REPLACE FUNCTION finalize_question_processing(
+    p_question_id UUID,
+    p_status VARCHAR DEFAULT NULL,
+    p_response_id UUID DEFAULT NULL,
+    p_response_text TEXT DEFAULT NULL,
+    p_posted BOOLEAN DEFAULT NULL,
+    p_posted_at TIMESTAMP WITH TIME ZONE DEFAULT NULL
+) RETURNS BOOLEAN AS $$
+DECLARE
+    v_found BOOLEAN;
+BEGIN
+    -- Also releases the claim taken by claim_pending_questions
+    UPDATE questions SET
+        status = COALESCE(p_status, status),
+        claimed_at = NULL
+    WHERE id = p_question_id;
+    v_found := FOUND;
+
+    IF p_response_id IS NOT NULL THEN
+        UPDATE agent_responses SET
+            response_text = COALESCE(p_response_text, response_text),
+            posted = COALESCE(p_posted, posted),
+            posted_at = COALESCE(p_posted_at, posted_at)
+        WHERE id = p_response_id;
+    END IF;
+
+    RETURN v_found;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Claim pending questions with an in-scope response for generation and posting.
+-- Claimed rows are skipped by overlapping runs until they are finalized or the
+-- claim times out. Each claim counts as an attempt; rows that run out of
+-- attempts without being finalized are marked as errors.
+CREATE OR REPLACE FUNCTION claim_pending_questions(
+    p_limit INTEGER,
+    p_market VARCHAR DEFAULT NULL,
+    p_claim_timeout_seconds INTEGER DEFAULT 1800,
+    p_max_attempts INTEGER DEFAULT 3
+) RETURNS TABLE(question JSONB, agent_response JSONB) AS $$
+    WITH exhausted AS (
+        UPDATE questions q SET status = 'error', claimed_at = NULL
+        WHERE q.status = 'pending'
+          AND q.attempts >= p_max_attempts
+          AND (q.claimed_at IS NULL OR q.claimed_at < NOW() - make_interval(secs => p_claim_timeout_seconds))
+    ), candidates AS (
+        SELECT q.id FROM questions q
+        WHERE q.status = 'pending'
+          AND q.attempts < p_max_attempts
+          AND (p_market IS NULL OR q.market = p_market)
+          AND (q.claimed_at IS NULL OR q.claimed_at < NOW() - make_interval(secs => p_claim_timeout_seconds))
+          AND EXISTS (
+              SELECT 1 FROM agent_responses r WHERE r.question_id = q.id AND r.is_in_scope
+          )
+        ORDER BY q.id
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    ), claimed AS (
+        UPDATE questions q SET claimed_at = NOW(), attempts = q.attempts + 1
+        FROM candidates c
+        WHERE q.id = c.id
+        RETURNING q.*
+    )
+    SELECT to_jsonb(c), to_jsonb(r)
+    FROM claimed c
+    JOIN agent_responses r ON r.question_id = c.id AND r.is_in_scope
+    ORDER BY c.id;
+$$ LANGUAGE sql;
+
+-- Pending questions that have not been capability-checked yet, so questions
+-- already waiting for a response don't take up triage batches
+CREATE OR REPLACE FUNCTION get_untriaged_questions(p_limit INTEGER)
+RETURNS SETOF questions AS $$
+    SELECT q.* FROM questions q
+    WHERE q.status = 'pending'
+      AND NOT EXISTS (SELECT 1 FROM agent_responses r WHERE r.question_id = q.id)
+    ORDER BY q.id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- Question counts for the analytics summary, grouped in the database so
+-- the API receives one row per value instead of one per question
+CREATE OR REPLACE FUNCTION count_questions_by_status()
+RETURNS TABLE(status VARCHAR, count BIGINT) AS $$
+    SELECT q.status, COUNT(*) FROM questions q GROUP BY q.status;
+$$ LANGUAGE sql STABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION count_questions_by_platform()
+RETURNS TABLE(platform VARCHAR, count BIGINT) AS $$
+    SELECT q.platform, COUNT(*) FROM questions q GROUP BY q.platform;
+$$ LANGUAGE sql STABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION count_questions_by_market()
+RETURNS TABLE(market VARCHAR, count BIGINT) AS $$
+    SELECT q.market, COUNT(*) FROM questions q GROUP BY q.market;
+$$ LANGUAGE sql STABLE PARALLEL SAFE;
+
+-- Response totals for the analytics summary as a single row
+CREATE OR REPLACE FUNCTION get_response_stats()
+RETURNS TABLE(total BIGINT, posted BIGINT, avg_confidence DOUBLE PRECISION) AS $$
+    SELECT
+        COUNT(*),
+        COUNT(*) FILTER (WHERE r.posted),
+        COALESCE(AVG(r.confidence_score), 0)
+    FROM agent_responses r;
+$$ LANGUAGE sql STABLE PARALLEL SAFE;
+
+-- Questions with their confidence score for lead listings (0 when not yet analyzed)
+CREATE OR REPLACE VIEW questions_with_scores AS
+SELECT
+    q.id,
+    q.market,
+    q.status,
+    q.platform,
+    q.title,
+    q.upvotes,
+    q.created_at,
+    COALESCE(r.confidence_score, 0) AS confidence_score
+FROM questions q
+LEFT JOIN agent_responses r ON r.question_id = q.id;
+
 -- Add comments for documentation
 COMMENT ON TABLE questions IS 'Stores questions crawled from social media platforms';
 COMMENT ON TABLE comments IS 'Stores comments on questions';
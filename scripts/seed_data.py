@@ -4,12 +4,12 @@ Seed test data for development and testing.
 import asyncio
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend.database.models import QuestionCreate, PlatformEnum
+from backend.database.models import QuestionCreate, PlatformEnum, utc_now
 from backend.database.supabase_client import db_client
 from backend.utils.deduplicator import Deduplicator
 
@@ -29,7 +29,7 @@ async def seed_test_questions():
             url="https://reddit.com/r/test/comments/test_reddit_1",
             tags=["ai", "video", "automation"],
             upvotes=42,
-            created_at=datetime.utcnow() - timedelta(hours=2)
+            created_at=utc_now() - timedelta(hours=2)
         ),
         QuestionCreate(
             platform=PlatformEnum.REDDIT,
@@ -40,7 +40,7 @@ async def seed_test_questions():
             url="https://reddit.com/r/test/comments/test_reddit_2",
             tags=["ai", "video", "tools"],
             upvotes=28,
-            created_at=datetime.utcnow() - timedelta(hours=5)
+            created_at=utc_now() - timedelta(hours=5)
         ),
         QuestionCreate(
             platform=PlatformEnum.QUORA,
@@ -51,7 +51,7 @@ async def seed_test_questions():
             url="https://quora.com/test_quora_1",
             tags=["ai", "marketing", "video"],
             upvotes=15,
-            created_at=datetime.utcnow() - timedelta(hours=8)
+            created_at=utc_now() - timedelta(hours=8)
         ),
         QuestionCreate(
             platform=PlatformEnum.REDDIT,
@@ -62,7 +62,7 @@ async def seed_test_questions():
             url="https://reddit.com/r/test/comments/test_reddit_3",
             tags=["machine learning", "video editing"],
             upvotes=67,
-            created_at=datetime.utcnow() - timedelta(hours=12)
+            created_at=utc_now() - timedelta(hours=12)
         ),
         QuestionCreate(
             platform=PlatformEnum.REDDIT,
@@ -73,32 +73,39 @@ async def seed_test_questions():
             url="https://reddit.com/r/test/comments/test_reddit_4",
             tags=["automation", "video", "workflow"],
             upvotes=33,
-            created_at=datetime.utcnow() - timedelta(hours=24)
+            created_at=utc_now() - timedelta(hours=24)
         ),
     ]
     
     print("Seeding test questions...")
     
-    created_count = 0
-    
-    for question in test_questions:
-        try:
-            # Check if exists
-            exists = await db_client.check_question_exists(
-                question.platform.value,
-                question.post_id
+    try:
+        # One existence query per platform, then one bulk insert for the rest
+        platforms = {q.platform.value for q in test_questions}
+        existing = {}
+        for platform in platforms:
+            existing[platform] = await db_client.get_existing_post_ids(
+                platform,
+                [q.post_id for q in test_questions if q.platform.value == platform]
             )
-            
-            if not exists:
-                result = await db_client.create_question(question)
-                if result:
-                    created_count += 1
-                    print(f"✅ Created: {question.title[:50]}...")
-            else:
+        
+        new_questions = []
+        for question in test_questions:
+            if question.post_id in existing[question.platform.value]:
                 print(f"⏭️  Skipped (exists): {question.title[:50]}...")
-                
-        except Exception as e:
-            print(f"❌ Error creating question: {e}")
+            else:
+                new_questions.append(question)
+        
+        created_count = await db_client.create_questions(
+            new_questions,
+            [deduplicator.generate_content_hash(q.content) for q in new_questions]
+        )
+        if created_count < len(new_questions):
+            print(f"⚠️  {len(new_questions) - created_count} new questions were not inserted")
+        
+    except Exception as e:
+        print(f"❌ Error creating questions: {e}")
+        created_count = 0
     
     print(f"\n✅ Seeding complete! Created {created_count} questions.")
 
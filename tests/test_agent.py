@@ -1,8 +1,34 @@
 """
 Tests for Mulan Agent integration.
 """
+import asyncio
+import threading
+import httpx
 import pytest
+import respx
+from backend.agent.capability_checker import CapabilityChecker
 from backend.agent.mulan_client import MulanClient
+from backend.agent import response_generator as response_generator_module
+from backend.agent.response_generator import ResponseGenerator
+from backend.agent.semantic_cache import SemanticCache
+from backend.config.markets import DEFAULT_DISCLOSURE, get_market_config, get_workflow_link_for_context
+from backend.config.settings import settings
+from backend.database.models import AgentResponse, Question, PlatformEnum, QuestionStatus, utc_now
+from backend.tasks import event_loop, response_tasks
+
+
+def make_question(title: str, content: str, market: str = "indie_authors") -> Question:
+    """Build an in-memory question for tests."""
+    return Question(
+        platform=PlatformEnum.REDDIT,
+        post_id="abc123",
+        title=title,
+        content=content,
+        author="user123",
+        url="https://reddit.com/r/selfpublish/comments/abc123",
+        market=market,
+        created_at=utc_now()
+    )
 
 
 @pytest.mark.asyncio
@@ -13,6 +39,295 @@ async def test_mulan_client_init():
     assert client.api_key is not None
 
 
+@pytest.mark.asyncio
+async def test_mulan_client_reuses_http_client():
+    """Test that the Mulan client reuses one pooled HTTP client."""
+    client = MulanClient()
+    first = await client._get_client()
+    second = await client._get_client()
+    assert first is second
+    
+    await client.aclose()
+    assert first.is_closed
+
+
+@pytest.mark.asyncio
+async def test_mulan_client_closes_client_of_previous_loop():
+    """Test that a client replaced after a loop change is closed on its own loop."""
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+    client = MulanClient()
+    try:
+        stale = asyncio.run_coroutine_threadsafe(client._get_client(), other_loop).result()
+        current = await client._get_client()
+        
+        for _ in range(50):
+            if stale.is_closed:
+                break
+            await asyncio.sleep(0.01)
+        
+        assert current is not stale
+        assert stale.is_closed
+    finally:
+        await client.aclose()
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_mulan_client_retries_after_rate_limit():
+    """Test that a 429 from Mulan is retried after Retry-After."""
+    client = MulanClient()
+    route = respx.post(f"{client.base_url}/api/analyze").mock(side_effect=[
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"is_in_scope": True, "confidence_score": 0.9}),
+    ])
+    
+    result = await client.analyze_question("How do I make a book trailer?", "Book trailer")
+    
+    assert route.call_count == 2
+    assert result["is_in_scope"] is True
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_mulan_health_check_falls_back_to_get():
+    """Test that the health check retries with GET when HEAD is not allowed."""
+    client = MulanClient()
+    respx.head(f"{client.base_url}/health").mock(return_value=httpx.Response(405))
+    respx.get(f"{client.base_url}/health").mock(return_value=httpx.Response(200))
+    
+    assert await client.health_check() is True
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_hits():
+    """Test exact and near-duplicate lookups in the Mulan response cache."""
+    cache = SemanticCache(ttl_seconds=60, max_entries=10, similarity_threshold=0.8, redis_ttl_seconds=0)
+    result = {"is_in_scope": True, "confidence_score": 0.9}
+    await cache.put("analyze_capability", "indie_authors", "How do I make a book trailer video?", result)
+    
+    assert await cache.get("analyze_capability", "indie_authors", "how do i make a  book trailer video?") == result
+    assert await cache.get("analyze_capability", "indie_authors", "How do I make a book trailer video quickly?") == result
+    assert await cache.get("analyze_capability", "nonprofits", "How do I make a book trailer video?") is None
+    assert await cache.get("unknown_task", "indie_authors", "How do I make a book trailer video?") is None
+    
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["similar_hits"] == 1
+    assert stats["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_generate_response_is_exact_only():
+    """Test that generated responses are not reused for a near-duplicate question."""
+    cache = SemanticCache(ttl_seconds=60, max_entries=10, similarity_threshold=0.8, redis_ttl_seconds=0)
+    result = {"response_text": "Upload your photos and pick a template."}
+    await cache.put("generate_response", "indie_authors", "\nHow do I make a video from my photos?", result)
+    
+    assert await cache.get("generate_response", "indie_authors", "\nhow do i make a video from my photos?") == result
+    assert await cache.get("generate_response", "indie_authors", "\nHow do I make a video without my photos?") is None
+    assert cache.stats()["similar_hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_skips_errors():
+    """Test that error results are never cached."""
+    cache = SemanticCache(ttl_seconds=60, max_entries=10, similarity_threshold=0.8, redis_ttl_seconds=0)
+    await cache.put("analyze_capability", None, "question", {"error": "timeout"})
+    assert await cache.get("analyze_capability", None, "question") is None
+
+
+
+def test_format_response_templates():
+    """Test that formatted responses include the link and disclosure."""
+    generator = ResponseGenerator()
+    
+    with_link = generator._format_response("Try this {tip}", "https://app.mulan.ai/x", "indie_authors")
+    assert with_link == f"Try this {{tip}}\n\nYou might find this helpful: https://app.mulan.ai/x\n\n{DEFAULT_DISCLOSURE}"
+    
+    without_link = generator._format_response("Try this", None, "unknown_market")
+    assert without_link == f"Try this\n\n{DEFAULT_DISCLOSURE}"
+
+
+
+def test_workflow_link_for_context():
+    """Test workflow selection by phrase, falling back to the market default."""
+    assert get_workflow_link_for_context("indie_authors", "Tips for an Author Intro video?").endswith("/author-intro")
+    assert get_workflow_link_for_context("indie_authors", "Anything else").endswith("/book-trailer")
+    assert get_workflow_link_for_context("unknown_market", "Anything") == "https://app.mulan.ai"
+
+
+def test_platform_config_has_keyword():
+    """Test case-insensitive keyword lookups on a frozen platform config."""
+    reddit = get_market_config("indie_authors").reddit
+    assert reddit.has_keyword("Book Trailer")
+    assert not reddit.has_keyword("tax return")
+
+
+def test_capability_prefilter_score():
+    """Test the lexical prefilter against a market's scope vocabulary."""
+    checker = CapabilityChecker()
+    
+    relevant = make_question("Book trailers?", "How do I promote my book with a trailer video?")
+    unrelated = make_question("Tax question", "Where do I file quarterly taxes?")
+    unknown_market = make_question("Anything", "Anything at all", market="unknown_market")
+    
+    assert checker.prefilter_score(relevant) >= checker.prefilter_floor
+    assert checker.prefilter_score(unrelated) == 0.0
+    assert checker.prefilter_score(unknown_market) is None
+
+
+
+@pytest.mark.asyncio
+async def test_post_responses_batches_per_platform(monkeypatch):
+    """Test that responses are posted in one crawler batch per platform."""
+    calls = []
+    
+    async def fake_post_responses(platform, items):
+        calls.append((platform, items))
+        return [True] * len(items)
+    
+    monkeypatch.setattr(response_generator_module.crawler_manager, "post_responses", fake_post_responses)
+    
+    reddit_a = make_question("A", "first")
+    reddit_b = make_question("B", "second")
+    quora = make_question("C", "third").model_copy(update={"platform": PlatformEnum.QUORA})
+    
+    generator = ResponseGenerator()
+    results = await generator.post_responses([(reddit_a, "one"), (quora, "two"), (reddit_b, "three")])
+    
+    assert results == [True, True, True]
+    assert [platform for platform, _ in calls] == ["reddit", "quora"]
+    assert [text for _, text in calls[0][1]] == ["one", "three"]
+
+
+
+@pytest.mark.asyncio
+async def test_prepare_question_reuses_stored_response(monkeypatch):
+    """Test that a stored response skips generation on retry."""
+    async def fail_generate(*args, **kwargs):
+        raise AssertionError("generate_response should not be called")
+    
+    question = make_question("Trailer", "How do I make a book trailer?")
+    agent_response = AgentResponse(
+        question_id=question.id,
+        is_in_scope=True,
+        confidence_score=0.95,
+        response_text="Stored answer"
+    )
+    
+    generator = ResponseGenerator()
+    monkeypatch.setattr(generator, "generate_response", fail_generate)
+    prepared = await generator._prepare_question(question.id, question, agent_response)
+    
+    assert prepared == (question, agent_response, "Stored answer")
+
+
+
+@pytest.mark.asyncio
+async def test_process_pending_questions_triages_in_batches(monkeypatch):
+    """Test that untriaged questions are checked and bulk-ignored before generation."""
+    in_scope, out_of_scope = (make_question("How do I make a trailer?", "Help") for _ in range(2))
+    
+    class FakeDB:
+        async def get_untriaged_questions(self, limit):
+            return [in_scope, out_of_scope]
+        
+        async def update_question_status_bulk(self, question_ids, status):
+            ignored.extend(question_ids)
+            return len(question_ids)
+    
+    class FakeChecker:
+        async def check_questions(self, questions):
+            return {
+                in_scope.id: AgentResponse(question_id=in_scope.id, is_in_scope=True, confidence_score=0.9),
+                out_of_scope.id: AgentResponse(question_id=out_of_scope.id, is_in_scope=False, confidence_score=0.1)
+            }
+    
+    class FakeGenerator:
+        async def process_pending_questions(self, limit):
+            generated.append(limit)
+            return 1
+    
+    ignored, generated = [], []
+    monkeypatch.setattr(response_tasks, "db_client", FakeDB())
+    monkeypatch.setattr(response_tasks, "capability_checker", FakeChecker())
+    monkeypatch.setattr(response_tasks, "get_response_generator", lambda: FakeGenerator())
+    
+    result = await response_tasks._process_pending_questions(10)
+    
+    assert result == {"processed": 1, "total_pending": 2}
+    assert ignored == [out_of_scope.id]
+    assert generated == [10]
+
+
+@pytest.mark.asyncio
+async def test_finalize_question_caps_retries_and_never_reposts(monkeypatch):
+    """Test that failed posts run out of attempts and posted questions leave the pending state."""
+    question = make_question("Trailer", "How do I make a book trailer?")
+    agent_response = AgentResponse(question_id=question.id, is_in_scope=True, confidence_score=0.9)
+    
+    class FakeDB:
+        async def finalize_processing(self, question_id, status=None, **kwargs):
+            finalized.append(status)
+            return finalize_result
+        
+        async def update_question_status(self, question_id, status):
+            fallback.append(status)
+            return True
+    
+    finalized, fallback = [], []
+    monkeypatch.setattr(response_generator_module, "db_client", FakeDB())
+    generator = ResponseGenerator()
+    
+    finalize_result = True
+    question.attempts = 1
+    await generator._finalize_question(question, agent_response, "Answer", posted=False)
+    question.attempts = settings.max_post_attempts
+    await generator._finalize_question(question, agent_response, "Answer", posted=False)
+    assert finalized == [None, QuestionStatus.ERROR]
+    
+    finalize_result = False
+    assert await generator._finalize_question(question, agent_response, "Answer", posted=True)
+    assert fallback == [QuestionStatus.ANSWERED]
+
+
+def test_run_async_reuses_worker_loop():
+    """Test that Celery tasks share one event loop per worker thread."""
+    async def current_loop():
+        return asyncio.get_running_loop()
+    
+    loops = []
+    
+    def worker():
+        loops.append(event_loop.run_async(current_loop()))
+        loops.append(event_loop.run_async(current_loop()))
+        event_loop.close_event_loop()
+    
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    
+    assert loops[0] is loops[1]
+    assert loops[0].is_closed()
+
+
+def test_summarize_capability_checks_adds_up_chunks():
+    """Test that the capability chord callback combines chunk results."""
+    summary = response_tasks.summarize_capability_checks([
+        {"total": 25, "in_scope": 4},
+        {"total": 10, "in_scope": 1},
+        {"error": "Mulan unavailable"}
+    ])
+    
+    assert summary == {"total": 35, "in_scope": 5, "errors": ["Mulan unavailable"]}
+
 # Add more tests as needed
 # Note: These tests should mock the Mulan Agent API
-
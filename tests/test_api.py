@@ -1,9 +1,19 @@
 """
 Tests for FastAPI endpoints.
 """
+import asyncio
+import time
+from datetime import datetime, timezone
+from uuid import UUID
 import pytest
 from fastapi.testclient import TestClient
 from backend.api.main import app
+from backend.api.routes.analytics import clear_analytics_cache
+from backend.api.routes.questions import MARKET_DETAILS
+from backend.database.models import AgentResponse
+from backend.database.supabase_client import db_client
+from backend.utils.loop_monitor import EventLoopMonitor
+from backend.utils.response_cache import ResponseCache, agent_response_cache
 
 
 client = TestClient(app)
@@ -23,5 +33,234 @@ def test_health_check():
     assert response.json()["status"] == "healthy"
 
 
+
+class FakeAnalyticsDB:
+    """In-memory stand-in for the analytics queries."""
+    
+    def __init__(self):
+        self.status_calls = 0
+    
+    async def get_question_count_by_status(self):
+        self.status_calls += 1
+        return {"pending": 3, "answered": 1}
+    
+    async def get_question_count_by_platform(self):
+        return {"reddit": 4}
+    
+    async def get_question_count_by_market(self):
+        return {"indie_authors": 4}
+    
+    async def get_response_stats(self):
+        return {"total": 2, "posted": 1, "success_rate": 0.5, "avg_confidence": 0.8}
+
+
+def test_analytics_endpoint():
+    """Test analytics aggregation and short-lived caching."""
+    fake_db = FakeAnalyticsDB()
+    clear_analytics_cache()
+    try:
+        with TestClient(app) as test_client:
+            # Route dependencies read shared services from app.state
+            app.state.db_client = fake_db
+            response = test_client.get("/api/analytics/")
+            test_client.get("/api/analytics/")
+    finally:
+        clear_analytics_cache()
+    
+    assert fake_db.status_calls == 1
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_questions"] == 4
+    assert data["questions_by_market"] == {"indie_authors": 4}
+    assert data["response_success_rate"] == 0.5
+
+
+
+class FakeQuestionsDB:
+    """In-memory stand-in for the question list query."""
+    
+    def __init__(self):
+        self.kwargs = None
+    
+    async def get_question_rows(self, **kwargs):
+        self.kwargs = kwargs
+        return [{"id": "00000000-0000-0000-0000-000000000001", "title": "How do I make a trailer?"}]
+
+
+def test_list_questions_returns_rows():
+    """Test that listed questions are returned as stored rows."""
+    fake_db = FakeQuestionsDB()
+    with TestClient(app) as test_client:
+        app.state.db_client = fake_db
+        response = test_client.get("/api/questions/?market=indie_authors&limit=5")
+    
+    assert response.status_code == 200
+    assert response.json()[0]["title"] == "How do I make a trailer?"
+    assert fake_db.kwargs["market"] == "indie_authors"
+    assert fake_db.kwargs["limit"] == 5
+    assert fake_db.kwargs["columns"] == "*"
+
+
+class FakeResponsesDB:
+    """In-memory stand-in for agent response lookups."""
+    
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+    
+    async def get_agent_response(self, question_id):
+        self.calls += 1
+        return self.response
+
+
+def test_get_response_is_cached(monkeypatch):
+    """Test that agent responses are served from cache until invalidated."""
+    monkeypatch.setattr(agent_response_cache, "use_redis", False)
+    agent_response = AgentResponse(
+        question_id="00000000-0000-0000-0000-000000000002",
+        is_in_scope=True,
+        confidence_score=0.9
+    )
+    fake_db = FakeResponsesDB(agent_response)
+    url = f"/api/responses/{agent_response.question_id}"
+    
+    try:
+        with TestClient(app) as test_client:
+            app.state.db_client = fake_db
+            first = test_client.get(url)
+            second = test_client.get(url)
+    finally:
+        agent_response_cache.clear()
+    
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert first.json()["confidence_score"] == 0.9
+    assert fake_db.calls == 1
+
+
+def test_get_response_not_modified(monkeypatch):
+    """Test that a matching If-None-Match returns 304 without a body."""
+    monkeypatch.setattr(agent_response_cache, "use_redis", False)
+    agent_response = AgentResponse(
+        question_id="00000000-0000-0000-0000-000000000003",
+        is_in_scope=True,
+        confidence_score=0.8
+    )
+    url = f"/api/responses/{agent_response.question_id}"
+    
+    try:
+        with TestClient(app) as test_client:
+            app.state.db_client = FakeResponsesDB(agent_response)
+            first = test_client.get(url)
+            second = test_client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    finally:
+        agent_response_cache.clear()
+    
+    assert first.status_code == 200
+    assert "max-age" in first.headers["cache-control"]
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+@pytest.mark.asyncio
+async def test_response_cache_pauses_while_redis_is_down():
+    """Test that nothing is cached in process while Redis is backing off."""
+    cache = ResponseCache("test", ttl_seconds=60)
+    cache._redis_failed(ConnectionError("down"))
+    
+    await cache.set("key", b"payload")
+    
+    assert await cache.get("key") is None
+
+
+def test_list_markets():
+    """Test the precomputed market list."""
+    response = client.get("/api/questions/markets/list")
+    assert response.status_code == 200
+    assert response.json() == MARKET_DETAILS
+    assert any(market["name"] == "indie_authors" for market in MARKET_DETAILS)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_detects_blocking_call():
+    """Test that a blocking call on the event loop is reported."""
+    monitor = EventLoopMonitor(threshold=0.05, interval=0.01)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+    
+    assert monitor.stall_count >= 1
+    assert monitor.max_lag >= 0.05
+
+
+
+@pytest.mark.asyncio
+async def test_database_queries_do_not_block_the_loop():
+    """Test that sync PostgREST queries run off the event loop and overlap."""
+    class SlowQuery:
+        def execute(self):
+            time.sleep(0.1)
+            return "done"
+    
+    monitor = EventLoopMonitor(threshold=0.05, interval=0.01)
+    monitor.start()
+    started = time.monotonic()
+    results = await asyncio.gather(db_client._execute(SlowQuery()), db_client._execute(SlowQuery()))
+    elapsed = time.monotonic() - started
+    await monitor.stop()
+    
+    assert results == ["done", "done"]
+    assert elapsed < 0.19
+    assert monitor.stall_count == 0
+
+
+@pytest.mark.asyncio
+async def test_get_all_questions_pages_with_limit_and_offset(monkeypatch):
+    """Test that offset pages are requested with limit/offset params and no Range header."""
+    queries = []
+    
+    async def capture(query):
+        queries.append(query)
+        return type("Result", (), {"data": []})()
+    
+    monkeypatch.setattr(db_client, "_execute", capture)
+    
+    await db_client.get_all_questions(limit=50, offset=100)
+    
+    query = queries[0]
+    assert query.params.get("limit") == "50"
+    assert query.params.get("offset") == "100"
+    assert query.params.get("order") == "crawled_at.desc,id.desc"
+    assert "Range" not in query.headers
+
+
+@pytest.mark.asyncio
+async def test_get_all_questions_pages_with_cursor(monkeypatch):
+    """Test that cursor pages render the keyset filter and the two-key order param."""
+    queries = []
+    
+    async def capture(query):
+        queries.append(query)
+        return type("Result", (), {"data": []})()
+    
+    monkeypatch.setattr(db_client, "_execute", capture)
+    crawled_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    last_id = UUID("00000000-0000-0000-0000-000000000009")
+    
+    await db_client.get_all_questions(limit=50, cursor=(crawled_at, last_id))
+    
+    query = queries[0]
+    assert query.params.get("or") == (
+        '(crawled_at.lt."2026-01-02T03:04:05+00:00",'
+        'and(crawled_at.eq."2026-01-02T03:04:05+00:00",id.lt.00000000-0000-0000-0000-000000000009))'
+    )
+    assert query.params.get_list("order") == ["crawled_at.desc,id.desc"]
+    assert query.params.get("limit") == "50"
+    assert "offset" not in query.params
+    assert "Range" not in query.headers
+
 # Add more API tests as needed
 
@@ -1,11 +1,21 @@
 """
 Tests for crawler implementations.
 """
+import asyncio
+import threading
+import time
+import httpx
 import pytest
+import respx
 from datetime import datetime
+from types import SimpleNamespace
+from backend.crawler import reddit_crawler as reddit_crawler_module
 from backend.crawler.reddit_crawler import RedditCrawler
 from backend.crawler.quora_crawler import QuoraCrawler
+from backend.crawler import crawler_manager as crawler_manager_module
+from backend.crawler.crawler_manager import CrawlerManager
 from backend.database.models import QuestionCreate
+from backend.utils.rate_limiter import SimpleRateLimiter
 
 
 @pytest.mark.asyncio
@@ -23,6 +33,264 @@ async def test_quora_crawler_init():
     assert crawler.platform_name == "quora"
 
 
+def test_quora_relevance_matches_whole_words():
+    """Test that the relevance filter ignores keywords buried inside other words."""
+    crawler = QuoraCrawler()
+    assert crawler._is_relevant_question("What is the best AI video tool?")
+    assert not crawler._is_relevant_question("Can someone explain this tax rule?")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_quora_fetch_questions_parses_topic_pages():
+    """Test that topic pages are fetched over HTTP and parsed without a browser."""
+    respx.get("https://www.quora.com/topic/AI-Video").mock(return_value=httpx.Response(
+        200,
+        text='<a href="/How-do-I-make-an-AI-video">How do I make an AI video?</a><a href="/about">About</a>'
+    ))
+    crawler = QuoraCrawler()
+    crawler.topics = ["AI Video"]
+    crawler.topic_paths = ["/topic/AI-Video"]
+    
+    questions = await crawler.fetch_questions(limit=10)
+    
+    assert [q.url for q in questions] == ["https://www.quora.com/How-do-I-make-an-AI-video"]
+    assert crawler.driver is None
+
+
+
+@pytest.mark.asyncio
+async def test_crawler_manager_aclose_closes_quora_http_client():
+    """Test that closing the manager closes the Quora topic-page client on its loop."""
+    manager = CrawlerManager()
+    crawler = manager.get_crawler("quora", "indie_authors")
+    client = await crawler._get_http_client()
+    
+    await manager.aclose()
+    
+    assert client.is_closed
+    assert manager._crawlers == {}
+
+
+@pytest.mark.asyncio
+async def test_crawl_all_platforms_runs_concurrently(monkeypatch):
+    """Test that platform crawls overlap and failures stay per platform."""
+    manager = CrawlerManager()
+    in_flight = 0
+    max_in_flight = 0
+    
+    async def fake_crawl_platform(platform, market=None, limit=100):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if platform == "quora":
+            raise RuntimeError("driver unavailable")
+        return {"platform": platform, "items_found": 1, "items_stored": 1}
+    
+    monkeypatch.setattr(manager, "crawl_platform", fake_crawl_platform)
+    results = await manager.crawl_all_platforms(limit=5)
+    
+    assert max_in_flight == 2
+    assert results[0]["items_stored"] == 1
+    assert results[1]["error"] == "driver unavailable"
+
+
+
+class FakeCrawlDB:
+    """In-memory stand-in for crawl storage."""
+    
+    def __init__(self, existing_post_ids, fail_inserts=False):
+        self.existing_post_ids = existing_post_ids
+        self.fail_inserts = fail_inserts
+        self.inserted = []
+        self.hash_lookups = []
+    
+    async def get_existing_post_ids(self, platform, post_ids):
+        return self.existing_post_ids & set(post_ids)
+    
+    async def get_existing_content_hashes(self, content_hashes):
+        self.hash_lookups.append(content_hashes)
+        return set()
+    
+    async def create_questions(self, questions, content_hashes):
+        self.inserted.append(questions)
+        return 0 if self.fail_inserts else len(questions)
+    
+    async def create_crawl_log(self, log_entry):
+        return log_entry
+
+
+@pytest.mark.asyncio
+async def test_crawl_platform_deduplicates_streamed_batches(monkeypatch):
+    """Test that stored and repeated questions are skipped as each batch is stored."""
+    def make(post_id, content):
+        return QuestionCreate(
+            platform="reddit", post_id=post_id, title=content, content=content,
+            author="someone", url=f"https://reddit.com/{post_id}", market="indie_authors",
+            created_at=datetime(2026, 1, 1)
+        )
+    
+    class FakeCrawler:
+        async def iter_question_batches(self, limit):
+            yield [make("a", "stored already"), make("b", "new post")]
+            yield [make("c", "new post"), make("d", "other")]
+    
+    fake_db = FakeCrawlDB(existing_post_ids={"a"})
+    monkeypatch.setattr(crawler_manager_module, "db_client", fake_db)
+    recorded = {}
+    monkeypatch.setattr(
+        crawler_manager_module.seen_post_filter, "seen",
+        lambda namespace, ids: set(ids) & recorded.get(namespace, set())
+    )
+    monkeypatch.setattr(
+        crawler_manager_module.seen_post_filter, "add",
+        lambda namespace, ids: recorded.setdefault(namespace, set()).update(ids)
+    )
+    manager = CrawlerManager()
+    monkeypatch.setattr(manager, "get_crawler", lambda platform, market=None: FakeCrawler())
+    
+    result = await manager.crawl_platform("reddit", "indie_authors")
+    
+    assert result["items_stored"] == 2
+    assert result["duplicates"] == 2
+    assert [[q.post_id for q in batch] for batch in fake_db.inserted] == [["b"], ["d"]]
+    # "c" repeats content stored from the first batch, so its hash is not looked up
+    assert len(fake_db.hash_lookups[1]) == 1
+    # Stored and duplicate posts are recorded so later crawls skip the database lookup
+    assert recorded["reddit"] == {"a", "b", "c", "d"}
+
+
+@pytest.mark.asyncio
+async def test_store_questions_skips_seen_filter_when_insert_fails(monkeypatch):
+    """Test that posts from a failed insert are not recorded as seen."""
+    questions = [
+        QuestionCreate(
+            platform="reddit", post_id=post_id, title=post_id, content=f"content {post_id}",
+            author="someone", url=f"https://reddit.com/{post_id}", market="indie_authors",
+            created_at=datetime(2026, 1, 1)
+        )
+        for post_id in ("a", "b")
+    ]
+    
+    monkeypatch.setattr(crawler_manager_module, "db_client", FakeCrawlDB(existing_post_ids={"a"}, fail_inserts=True))
+    recorded = {}
+    monkeypatch.setattr(crawler_manager_module.seen_post_filter, "seen", lambda namespace, ids: set())
+    monkeypatch.setattr(
+        crawler_manager_module.seen_post_filter, "add",
+        lambda namespace, ids: recorded.setdefault(namespace, set()).update(ids)
+    )
+    
+    stored, duplicates = await CrawlerManager()._store_questions("reddit", questions)
+    
+    assert (stored, duplicates) == (0, 1)
+    # Only the post already in the database is recorded, so "b" is retried next crawl
+    assert recorded["reddit"] == {"a"}
+    assert not recorded[crawler_manager_module.seen_post_filter.CONTENT_HASHES]
+
+
+@pytest.mark.asyncio
+async def test_reddit_fetches_subreddits_concurrently(monkeypatch):
+    """Test that every subreddit is fetched and yielded as its own batch."""
+    crawler = RedditCrawler()
+    crawler.subreddits = ["one", "two", "three"]
+    monkeypatch.setattr(crawler.rate_limiter, "wait_if_needed", lambda identifier: None)
+    monkeypatch.setattr(
+        crawler, "_fetch_one_subreddit",
+        lambda name, posts: [name] if name != "two" else []
+    )
+    
+    batches = [batch async for batch in crawler.iter_question_batches(limit=30)]
+    
+    assert sorted(batches) == [["one"], ["three"]]
+
+
+def test_reddit_client_is_per_thread():
+    """Test that each thread gets its own PRAW client, reused across crawlers."""
+    clients = []
+    
+    def worker():
+        clients.append(RedditCrawler().reddit)
+        clients.append(RedditCrawler("indie_authors").reddit)
+    
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    
+    assert clients[0] is clients[1]
+    assert clients[0] is not RedditCrawler().reddit
+
+
+def test_reddit_stops_searching_once_quota_is_filled(monkeypatch):
+    """Test that duplicate posts are skipped and searches stop at the per-subreddit quota."""
+    searched = []
+    
+    class FakeSubreddit:
+        display_name = "test"
+        
+        def new(self, limit):
+            return [SimpleNamespace(id=post_id) for post_id in ("a", "b", "a")]
+        
+        def search(self, query, **kwargs):
+            searched.append(query)
+            return [SimpleNamespace(id=f"{query}-1"), SimpleNamespace(id=f"{query}-2")]
+    
+    crawler = RedditCrawler()
+    crawler.search_queries = ["first", "second"]
+    monkeypatch.setattr(crawler.rate_limiter, "wait_if_needed", lambda identifier: None)
+    monkeypatch.setattr(crawler.reddit, "subreddit", lambda name: FakeSubreddit())
+    monkeypatch.setattr(reddit_crawler_module.seen_post_filter, "seen", lambda platform, ids: set())
+    monkeypatch.setattr(crawler, "_is_relevant", lambda submission, age_cutoff: True)
+    monkeypatch.setattr(crawler, "_submission_to_question", lambda submission: submission.id)
+    
+    assert crawler._fetch_one_subreddit("test", 3) == ["a", "b", "first-1"]
+    assert searched == ["first"]
+
+
+def test_reddit_relevance_age_cutoff():
+    """Test that posts are kept until they are eight whole days old."""
+    crawler = RedditCrawler()
+    crawler.keywords = frozenset()
+    now = time.time()
+    
+    def post(age_days):
+        return SimpleNamespace(created_utc=now - age_days * 86400, score=5, title="Help", selftext="")
+    
+    assert crawler._is_relevant(post(7.9))
+    assert not crawler._is_relevant(post(8.1))
+
+
+@pytest.mark.asyncio
+async def test_fetch_comments_batch_keeps_order(monkeypatch):
+    """Test that batched comment fetches return results in URL order and isolate failures."""
+    crawler = RedditCrawler()
+    
+    async def fake_fetch_comments(question_url):
+        if question_url == "bad":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.01 if question_url == "slow" else 0)
+        return [question_url]
+    
+    monkeypatch.setattr(crawler, "fetch_comments", fake_fetch_comments)
+    
+    result = await crawler.fetch_comments_batch(["slow", "bad", "fast"], concurrency=2)
+    
+    assert result == [["slow"], [], ["fast"]]
+
+
+def test_simple_rate_limiter_reports_remaining_and_retry_after():
+    """Test that the in-memory limiter returns how long a refused caller should wait."""
+    limiter = SimpleRateLimiter()
+    limiter.max_requests = 2
+    
+    assert limiter.check("reddit")[:2] == (True, 1)
+    assert limiter.check("reddit")[:2] == (True, 0)
+    
+    allowed, remaining, retry_after = limiter.check("reddit")
+    assert not allowed and remaining == 0
+    assert 59 < retry_after <= 60
+
 # Add more tests as needed
 # Note: These tests may require mocking external API calls
 